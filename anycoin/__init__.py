@@ -1,4 +1,33 @@
 # ruff: noqa: F401
+from typing import TYPE_CHECKING
+
 from ._enums import CoinSymbols, QuoteSymbols
-from ._interfaces.async_ import AsyncAnyCoin
-from ._interfaces.sync import AnyCoin
+
+if TYPE_CHECKING:
+    from ._interfaces.async_ import AsyncAnyCoin
+    from ._interfaces.sync import AnyCoin
+
+# The interfaces pull in httpx, pydantic and anyio, they are imported on-
+# first use to keep ``import anycoin`` fast
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    'AsyncAnyCoin': '._interfaces.async_',
+    'AnyCoin': '._interfaces.sync',
+}
+
+__all__ = ['AnyCoin', 'AsyncAnyCoin', 'CoinSymbols', 'QuoteSymbols']
+
+
+def __getattr__(name: str):
+    module_name: str | None = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    import importlib  # noqa: PLC0415
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Next accesses skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
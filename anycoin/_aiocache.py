@@ -0,0 +1,22 @@
+from aiocache import Cache as _Cache
+
+
+class Cache(_Cache):
+    """
+    This class is just a wrapper around the aiocache.Cache class
+
+    You can instantiate a cache type using the ``cache_type`` attribute like-
+    this:
+
+    >>> from anycoin.cache import Cache
+    >>> Cache(Cache.REDIS)
+    RedisCache (127.0.0.1:6379)
+
+    OR
+    >>> from anycoin.cache import Cache
+    >>> Cache(Cache.MEMCACHED)
+    MemcachedCache (127.0.0.1:6379)
+
+    ``Cache.MEMORY`` is also available for use. See the aiocache documentation-
+    to see which types are actually supported: https://aiocache.aio-libs.org/en/latest/
+    """
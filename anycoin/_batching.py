@@ -0,0 +1,195 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from . import _deadline
+from ._enums import CoinSymbols, QuoteSymbols
+from .cache import _is_unsupported_error
+from .response_models import CoinQuotes, CoinRow
+
+_FetchCoinQuotes = Callable[
+    [list[CoinSymbols], list[QuoteSymbols]], Awaitable[CoinQuotes]
+]
+_SliceRawData = Callable[[dict, list[CoinSymbols]], dict | None]
+
+
+class _PendingRequest:
+    __slots__ = ('coins', 'quotes_in', 'future')
+
+    def __init__(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        future: asyncio.Future,
+    ) -> None:
+        self.coins = coins
+        self.quotes_in = quotes_in
+        self.future = future
+
+
+class _QuoteBatcher:
+    """
+    Coalesce concurrent quote requests into one upstream call
+
+    Requests are collected for ``window`` seconds (or until ``max_size``-
+    coins are pending), then a single call is made with the union of the-
+    coins and quotes and each caller receives the slice it asked for-
+    (``slice_raw_data`` cuts the raw response of the batch, without it-
+    the results have no ``raw_data``).
+
+    The batch runs without the deadline of the caller that opened it,-
+    each caller only waits for it until its own deadline.
+
+    A batcher belongs to the event loop it was created in.
+    """
+
+    def __init__(
+        self,
+        fetch: _FetchCoinQuotes,
+        window: float,
+        max_size: int,
+        slice_raw_data: _SliceRawData | None = None,
+    ) -> None:
+        self._fetch = fetch
+        self._window = window
+        self._max_size = max_size
+        self._slice_raw_data = slice_raw_data
+
+        self._pending: list[_PendingRequest] = []
+        self._pending_coins: dict[CoinSymbols, None] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get_coin_quotes(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        future: asyncio.Future[CoinQuotes] = loop.create_future()
+
+        self._pending.append(_PendingRequest(coins, quotes_in, future))
+        self._pending_coins.update(dict.fromkeys(coins))
+
+        if len(self._pending_coins) >= self._max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch: list[_PendingRequest] = self._pending
+        self._pending = []
+        self._pending_coins = {}
+        if not batch:
+            return
+
+        # The task would inherit the deadline of the caller that opened-
+        # the window (or filled the batch) and apply it to every request
+        with _deadline.detach():
+            task: asyncio.Task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[_PendingRequest]) -> None:
+        if len(batch) == 1:
+            request: _PendingRequest = batch[0]
+            await self._resolve(
+                request, self._fetch(request.coins, request.quotes_in)
+            )
+            return
+
+        coins: list[CoinSymbols] = list(
+            dict.fromkeys(coin for request in batch for coin in request.coins)
+        )
+        quotes_in: list[QuoteSymbols] = list(
+            dict.fromkeys(
+                quote for request in batch for quote in request.quotes_in
+            )
+        )
+        try:
+            result: CoinQuotes = await self._fetch(coins, quotes_in)
+        except Exception as expt:
+            if not _is_unsupported_error(expt):
+                # Transient or API errors fail every request alike, split-
+                # them would only multiply the upstream calls.
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(expt)
+                return
+
+            # A single invalid request (an unsupported coin or quote) must-
+            # not fail the others, so they are retried one by one.
+            await asyncio.gather(
+                *(
+                    self._resolve(
+                        request, self._fetch(request.coins, request.quotes_in)
+                    )
+                    for request in batch
+                )
+            )
+            return
+
+        for request in batch:
+            if not request.future.done():
+                request.future.set_result(
+                    _slice_coin_quotes(
+                        result,
+                        coins=request.coins,
+                        quotes_in=request.quotes_in,
+                        slice_raw_data=self._slice_raw_data,
+                    )
+                )
+
+    @staticmethod
+    async def _resolve(
+        request: _PendingRequest, coro: Awaitable[CoinQuotes]
+    ) -> None:
+        try:
+            result: CoinQuotes = await coro
+        except Exception as expt:
+            if not request.future.done():
+                request.future.set_exception(expt)
+            return
+
+        if not request.future.done():
+            request.future.set_result(result)
+
+
+def _slice_coin_quotes(
+    coin_quotes: CoinQuotes,
+    coins: list[CoinSymbols],
+    quotes_in: list[QuoteSymbols],
+    slice_raw_data: _SliceRawData | None = None,
+) -> CoinQuotes:
+    """
+    Part of ``coin_quotes`` with only the requested coins and quotes, the-
+    raw data is kept only if ``slice_raw_data`` can cut it
+    """
+    coins_data: dict[CoinSymbols, CoinRow] = {}
+    for coin in coins:
+        coin_row: CoinRow | None = coin_quotes.coins.get(coin)
+        if coin_row is None:
+            continue
+
+        coins_data[coin] = CoinRow(
+            quotes={
+                quote: coin_row.quotes[quote]
+                for quote in quotes_in
+                if quote in coin_row.quotes
+            }
+        )
+
+    raw_data: dict | None = None
+    if slice_raw_data is not None and coin_quotes.raw_data is not None:
+        raw_data = slice_raw_data(coin_quotes.raw_data, coins)
+
+    return CoinQuotes(
+        coins=coins_data,
+        api_service=coin_quotes.api_service,
+        raw_data=raw_data,
+    )
@@ -0,0 +1,42 @@
+"""
+Whether the current service call was answered by the cache
+
+``AsyncAnyCoin`` measures the latency of the services to route and hedge-
+the calls, the calls answered by the cache of a service would only-
+measure the cache. The flag is kept in a context variable, like the-
+deadline, so that the cache sets it without it being passed through-
+every signature.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class CallInfo:
+    __slots__ = ('cache_hit',)
+
+    def __init__(self) -> None:
+        self.cache_hit: bool = False
+
+
+_call_info: ContextVar[CallInfo | None] = ContextVar(
+    'anycoin_call_info', default=None
+)
+
+
+@contextmanager
+def track_call() -> Iterator[CallInfo]:
+    """Track the cache hits of the code inside the block"""
+    call_info = CallInfo()
+    token = _call_info.set(call_info)
+    try:
+        yield call_info
+    finally:
+        _call_info.reset(token)
+
+
+def record_cache_hit() -> None:
+    call_info: CallInfo | None = _call_info.get()
+    if call_info is not None:
+        call_info.cache_hit = True
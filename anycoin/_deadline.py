@@ -0,0 +1,62 @@
+"""
+Deadline of the current ``get_coin_quotes`` call
+
+The deadline is kept in a context variable so that it is shared by the-
+cache lookup, every service attempt and the retries without being passed-
+through every signature. Tasks created while it is set inherit it.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+_deadline: ContextVar[float | None] = ContextVar(
+    'anycoin_deadline', default=None
+)
+
+
+@contextmanager
+def deadline_scope(timeout: float | None) -> Iterator[None]:
+    """Limit the code inside the block to ``timeout`` seconds"""
+    if timeout is None:
+        yield
+        return
+
+    deadline: float = time.monotonic() + timeout
+    current: float | None = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)  # Never extend an outer deadline
+
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def detach() -> Iterator[None]:
+    """
+    Run the code inside the block without the deadline of the caller-
+    (e.g. background tasks that outlive it)
+    """
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_remaining() -> float | None:
+    """Seconds left before the deadline, None if there is no deadline"""
+    deadline: float | None = _deadline.get()
+    if deadline is None:
+        return None
+
+    return max(0.0, deadline - time.monotonic())
+
+
+def is_expired() -> bool:
+    remaining: float | None = get_remaining()
+    return remaining is not None and remaining <= 0
@@ -39,6 +39,16 @@ class CoinSymbols(Enum):
     def name(self):
         return self._name
 
+    @property
+    def asset_id(self):
+        """Compact handle of the symbol, see ``anycoin.assets.AssetId``"""
+        from .assets import AssetId  # noqa: PLC0415
+
+        return AssetId(self._value_)
+
+    def __hash__(self):
+        return hash(self._value_)  # Same hash as AssetId
+
 
 class QuoteSymbols(Enum):
     usd = CoinItem('usd', 'United States Dollar')
@@ -56,3 +66,13 @@ class QuoteSymbols(Enum):
     @property
     def name(self):
         return self._name
+
+    @property
+    def asset_id(self):
+        """Compact handle of the symbol, see ``anycoin.assets.AssetId``"""
+        from .assets import AssetId  # noqa: PLC0415
+
+        return AssetId(self._value_)
+
+    def __hash__(self):
+        return hash(self._value_)  # Same hash as AssetId
@@ -1,33 +1,238 @@
+import asyncio
+import time
 import traceback
+from collections import deque
 from decimal import Decimal
 from typing import Any, Generator
 
+from .. import _cache_hits, _deadline
 from .._enums import CoinSymbols, QuoteSymbols
 from ..abc import APIService
+from ..assets import AssetId, to_symbol
+from ..circuit_breaker import CircuitBreaker, CircuitBreakerPolicy
+from ..exeptions import (
+    CoinNotSupportedCGK,
+    CoinNotSupportedCMC,
+    DeadlineExceeded,
+    QuoteCoinNotSupportedCGK,
+    QuoteCoinNotSupportedCMC,
+    RateLimitExceeded,
+)
 from ..exeptions import ConvertCoin as ConvertCoinException
+from ..exeptions import DeadlineExceeded as DeadlineExceededException
 from ..exeptions import GetCoinQuotes as GetCoinQuotesException
+from ..polling import QuotePoller, QuoteSubscription
 from ..response_models import CoinQuotes
+from ..routing import LatencyRouter
+
+# Errors caused by the request itself or raised locally, they say nothing-
+# about the health of the service.
+_NOT_SERVICE_FAILURES = (
+    CoinNotSupportedCGK,
+    CoinNotSupportedCMC,
+    DeadlineExceeded,
+    QuoteCoinNotSupportedCGK,
+    QuoteCoinNotSupportedCMC,
+    RateLimitExceeded,
+)
+
+
+def _is_service_failure(expt: GetCoinQuotesException) -> bool:
+    return not isinstance(expt, _NOT_SERVICE_FAILURES) and not isinstance(
+        expt.__cause__, _NOT_SERVICE_FAILURES
+    )
+
+
+class _LatencyWindow:
+    """Latencies of the last successful calls to a service"""
+
+    MIN_SAMPLES = 20
+
+    def __init__(self, size: int = 100) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def quantile(self, q: float) -> float | None:
+        if len(self._samples) < self.MIN_SAMPLES:
+            return None
+
+        samples: list[float] = sorted(self._samples)
+        return samples[round(q * (len(samples) - 1))]
 
 
 class AsyncAnyCoin:
     def __init__(
         self,
         api_services: list[APIService],
+        hedge_delay: float | None = None,
+        hedge_quantile: float | None = None,
+        circuit_breaker: CircuitBreakerPolicy | None = None,
+        router: LatencyRouter | None = None,
     ) -> None:
+        """
+        Services are tried one after another until one returns the-
+        quotes. With ``hedge_delay`` the next service is also called if-
+        the previous one has not answered after ``hedge_delay`` seconds,-
+        the first valid answer wins and the other calls are cancelled.
+
+        ``hedge_quantile`` (e.g. 0.95) replaces the fixed delay with that-
+        quantile of the recent latencies of the service once enough-
+        samples were collected.
+
+        With ``circuit_breaker`` a failing service is skipped until a-
+        background probe finds it healthy again, see-
+        ``CircuitBreakerPolicy``.
+
+        With ``router`` the services are reordered dynamically by their-
+        measured latency and error rate, see ``LatencyRouter``.
+        """
         self._api_services: list[APIService] = api_services
 
         if not self._api_services:
             raise RuntimeError('At least one service is required')
 
+        self._hedge_delay = hedge_delay
+        self._hedge_quantile = hedge_quantile
+        self._latencies: dict[APIService, _LatencyWindow] = {
+            service: _LatencyWindow() for service in self._api_services
+        }
+
+        self._circuit_breaker_policy = circuit_breaker
+        self._circuit_breakers: dict[APIService, CircuitBreaker] = {}
+        if circuit_breaker is not None:
+            self._circuit_breakers = {
+                service: CircuitBreaker(circuit_breaker)
+                for service in self._api_services
+            }
+        self._probe_tasks: dict[APIService, asyncio.Task] = {}
+
+        self._router = router
+        self._background_tasks: set[asyncio.Task] = set()
+        self._poller: QuotePoller | None = None
+
     async def get_coin_quotes(
         self,
         coins: list[CoinSymbols],
         quotes_in: list[QuoteSymbols],
+        timeout: float | None = None,
     ) -> CoinQuotes:
-        for service in self._get_services():
+        """
+        ``timeout`` is the total budget in seconds of the call, shared by-
+        the cache lookup, every service attempt and the retries.-
+        ``DeadlineExceeded`` is raised when it runs out.
+
+        ``coins`` and ``quotes_in`` may also be ``AssetId`` handles.
+
+        Requests covered by a fresh snapshot of the poller (see-
+        ``start_polling``) are answered from memory.
+        """
+        if self._poller is not None:
+            polled: CoinQuotes | None = self._poller.get_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+            if polled is not None:
+                return polled
+
+        if timeout is None:
+            return await self._get_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+
+        with _deadline.deadline_scope(timeout):
             try:
-                return await service.get_coin_quotes(
+                return await asyncio.wait_for(
+                    self._get_coin_quotes(coins=coins, quotes_in=quotes_in),
+                    timeout=_deadline.get_remaining(),
+                )
+            except asyncio.TimeoutError:
+                raise DeadlineExceededException(
+                    f'Unable to get quote within {timeout} seconds'
+                ) from None
+            except GetCoinQuotesException as expt:
+                if _deadline.is_expired():
+                    raise DeadlineExceededException(
+                        f'Unable to get quote within {timeout} seconds'
+                    ) from expt
+                raise
+
+    async def start_polling(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        interval: float = 5.0,
+        max_interval: float | None = None,
+        max_age: float | None = None,
+    ) -> QuotePoller:
+        """
+        Keep the quotes of ``coins`` in ``quotes_in`` refreshed in-
+        background, see ``QuotePoller``
+
+        The poller is shared: later calls add their symbols to its-
+        watchlist (release them with ``poller.unwatch``) and ignore the-
+        interval parameters. It is stopped by ``aclose``.
+        """
+        poller: QuotePoller = self._get_poller(
+            interval=interval, max_interval=max_interval, max_age=max_age
+        )
+        poller.watch(coins=coins, quotes_in=quotes_in)
+        await poller.start()
+        return poller
+
+    def subscribe(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        interval: float = 5.0,
+        threshold: Decimal | float = 0,
+    ) -> QuoteSubscription:
+        """
+        Async iterator over the changes of the quotes, see-
+        ``QuoteSubscription``
+
+        All the subscriptions share the poller of ``start_polling`` (and-
+        its interval, set by the first caller).
+        """
+        return self._get_poller(interval=interval).subscribe(
+            coins=coins, quotes_in=quotes_in, threshold=threshold
+        )
+
+    def _get_poller(
+        self,
+        interval: float = 5.0,
+        max_interval: float | None = None,
+        max_age: float | None = None,
+    ) -> QuotePoller:
+        if self._poller is None:
+            self._poller = QuotePoller(
+                coro_func=lambda coins, quotes_in: self._get_coin_quotes(
                     coins=coins, quotes_in=quotes_in
+                ),
+                interval=interval,
+                max_interval=max_interval,
+                max_age=max_age,
+            )
+
+        return self._poller
+
+    async def _get_coin_quotes(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        if self._router is not None:
+            self._start_shadow_request(coins=coins, quotes_in=quotes_in)
+
+        if self._hedge_delay is not None:
+            return await self._get_coin_quotes_hedged(
+                coins=coins, quotes_in=quotes_in
+            )
+
+        for service in self._get_services():
+            try:
+                return await self._call_service(
+                    service, coins=coins, quotes_in=quotes_in
                 )
             except GetCoinQuotesException:
                 traceback.print_exc()
@@ -35,18 +240,189 @@ class AsyncAnyCoin:
 
         raise GetCoinQuotesException('Unable to get quote through services')
 
+    async def _get_coin_quotes_hedged(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        services: Generator[APIService, Any, None] = self._get_services()
+        pending: set[asyncio.Task] = set()
+        last_service: APIService | None = None
+
+        def start_next_service() -> bool:
+            nonlocal last_service
+            service: APIService | None = next(services, None)
+            if service is None:
+                return False
+
+            last_service = service
+            pending.add(
+                asyncio.ensure_future(
+                    self._call_service(
+                        service, coins=coins, quotes_in=quotes_in
+                    )
+                )
+            )
+            return True
+
+        has_next_service: bool = start_next_service()
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=(
+                        self._get_hedge_delay(last_service)
+                        if has_next_service
+                        else None
+                    ),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    # The hedge delay elapsed, call the next service too
+                    has_next_service = start_next_service()
+                    continue
+
+                for task in done:
+                    try:
+                        return task.result()
+                    except GetCoinQuotesException:
+                        traceback.print_exc()
+                        has_next_service = start_next_service()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        raise GetCoinQuotesException('Unable to get quote through services')
+
+    async def _call_service(
+        self,
+        service: APIService,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        circuit_breaker: CircuitBreaker | None = self._circuit_breakers.get(
+            service
+        )
+
+        start_time: float = time.perf_counter()
+        try:
+            with _cache_hits.track_call() as call_info:
+                result: CoinQuotes = await service.get_coin_quotes(
+                    coins=coins, quotes_in=quotes_in
+                )
+        except GetCoinQuotesException as expt:
+            if _is_service_failure(expt):
+                # Errors replayed from the cache were already recorded
+                if self._router is not None and not call_info.cache_hit:
+                    self._router.record_failure(service)
+
+                if (
+                    circuit_breaker is not None
+                    and circuit_breaker.record_failure()
+                ):
+                    self._start_probe(service, circuit_breaker)
+            raise
+
+        # Answers of the cache of the service say nothing of its latency
+        if not call_info.cache_hit:
+            latency: float = time.perf_counter() - start_time
+            self._latencies[service].add(latency)
+            if self._router is not None:
+                self._router.record_success(service, latency)
+        if circuit_breaker is not None:
+            circuit_breaker.record_success()
+        return result
+
+    def _start_shadow_request(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> None:
+        """Sample a fallback service in the background for the router"""
+        service: APIService | None = self._router.pick_shadow_service(
+            list(self._get_services())
+        )
+        if service is None:
+            return
+
+        async def shadow_request() -> None:
+            try:
+                await self._call_service(
+                    service, coins=coins, quotes_in=quotes_in
+                )
+            except GetCoinQuotesException:
+                pass  # Already recorded by _call_service
+
+        # Not bound by the deadline of the call that started it
+        with _deadline.detach():
+            task: asyncio.Task = asyncio.ensure_future(shadow_request())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _start_probe(
+        self, service: APIService, circuit_breaker: CircuitBreaker
+    ) -> None:
+        task: asyncio.Task | None = self._probe_tasks.get(service)
+        if task is not None and not task.done():
+            return
+
+        # The probe outlives the call that opened the circuit, it must not-
+        # inherit its deadline
+        with _deadline.detach():
+            self._probe_tasks[service] = asyncio.ensure_future(
+                self._probe_service(service, circuit_breaker)
+            )
+
+    async def _probe_service(
+        self, service: APIService, circuit_breaker: CircuitBreaker
+    ) -> None:
+        """Probe an open service in the background until it recovers"""
+        policy: CircuitBreakerPolicy = self._circuit_breaker_policy
+        delay: float = policy.recovery_timeout
+
+        while True:
+            await asyncio.sleep(delay)
+
+            circuit_breaker.half_open()
+            try:
+                await service.ping()
+            except Exception:
+                circuit_breaker.open()
+                delay = min(delay * 2, policy.max_recovery_timeout)
+                continue
+
+            circuit_breaker.close()
+            return
+
+    def _get_hedge_delay(self, service: APIService) -> float:
+        if self._hedge_quantile is not None:
+            delay: float | None = self._latencies[service].quantile(
+                self._hedge_quantile
+            )
+            if delay is not None:
+                return delay
+
+        return self._hedge_delay
+
     async def convert_coin(
         self,
         amount: int | float | Decimal,
-        from_coin: CoinSymbols | QuoteSymbols,
-        to_coin: CoinSymbols | QuoteSymbols,
+        from_coin: CoinSymbols | QuoteSymbols | AssetId,
+        to_coin: CoinSymbols | QuoteSymbols | AssetId,
+        timeout: float | None = None,
     ) -> Decimal:
+        from_coin = to_symbol(from_coin)
+        to_coin = to_symbol(to_coin)
+
         if isinstance(from_coin, CoinSymbols) and isinstance(
             to_coin, QuoteSymbols
         ):
             result: CoinQuotes = await self.get_coin_quotes(
                 coins=[from_coin],
                 quotes_in=[to_coin],
+                timeout=timeout,
             )
             coin_quote: Decimal = result.coins[from_coin].quotes[to_coin].quote
             return Decimal(str(amount)) * coin_quote
@@ -59,6 +435,7 @@ class AsyncAnyCoin:
             result: CoinQuotes = await self.get_coin_quotes(
                 coins=[from_coin, to_coin],
                 quotes_in=[quote_in],
+                timeout=timeout,
             )
             from_rate: Decimal = result.coins[from_coin].quotes[quote_in].quote
             to_rate: Decimal = result.coins[to_coin].quotes[quote_in].quote
@@ -70,6 +447,7 @@ class AsyncAnyCoin:
             result: CoinQuotes = await self.get_coin_quotes(
                 coins=[to_coin],
                 quotes_in=[from_coin],
+                timeout=timeout,
             )
             to_rate: Decimal = result.coins[to_coin].quotes[from_coin].quote
             return Decimal(str(amount)) / to_rate
@@ -82,6 +460,7 @@ class AsyncAnyCoin:
             result: CoinQuotes = await self.get_coin_quotes(
                 coins=[coin_symbol_reference],
                 quotes_in=[from_coin, to_coin],
+                timeout=timeout,
             )
             rates = result.coins[coin_symbol_reference]
 
@@ -93,6 +472,44 @@ class AsyncAnyCoin:
             f'Invalid conversion from {from_coin} to {to_coin}'
         )
 
-    def _get_services(self) -> Generator[APIService, Any, None]:
+    async def aclose(self) -> None:
+        """Stop the poller and close the connection pools of all services"""
+        poller, self._poller = self._poller, None
+        if poller is not None:
+            await poller.aclose()
+
+        tasks: list[asyncio.Task] = [
+            *self._probe_tasks.values(),
+            *self._background_tasks,
+        ]
+        self._probe_tasks.clear()
+        self._background_tasks.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
         for service in self._api_services:
+            await service.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _get_services(self) -> Generator[APIService, Any, None]:
+        services: list[APIService] = self._api_services
+        if self._router is not None:
+            services = self._router.order(services)
+
+        for service in services:
+            circuit_breaker: CircuitBreaker | None = (
+                self._circuit_breakers.get(service)
+            )
+            if circuit_breaker is not None and not (
+                circuit_breaker.allow_request()
+            ):
+                continue  # Circuit open, skip the service instantly
+
             yield service
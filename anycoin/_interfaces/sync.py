@@ -8,7 +8,11 @@ from anyio.from_thread import BlockingPortal, start_blocking_portal
 
 from .._enums import CoinSymbols, QuoteSymbols
 from ..abc import APIService
+from ..assets import AssetId
+from ..circuit_breaker import CircuitBreakerPolicy
+from ..polling import QuotePoller
 from ..response_models import CoinQuotes
+from ..routing import LatencyRouter
 from .async_ import AsyncAnyCoin
 
 
@@ -16,7 +20,12 @@ class AnyCoin:
     def __init__(
         self,
         api_services: list[APIService],
+        hedge_delay: float | None = None,
+        hedge_quantile: float | None = None,
+        circuit_breaker: CircuitBreakerPolicy | None = None,
+        router: LatencyRouter | None = None,
     ) -> None:
+        """See ``AsyncAnyCoin`` for the description of the parameters"""
         self._api_services: list[APIService] = api_services
 
         if not self._api_services:
@@ -24,6 +33,10 @@ class AnyCoin:
 
         self._async_instance = AsyncAnyCoin(
             api_services=api_services,
+            hedge_delay=hedge_delay,
+            hedge_quantile=hedge_quantile,
+            circuit_breaker=circuit_breaker,
+            router=router,
         )
         self._lock = threading.Lock()
         self._exit_stack = None
@@ -33,21 +46,32 @@ class AnyCoin:
         self,
         coins: list[CoinSymbols],
         quotes_in: list[QuoteSymbols],
+        timeout: float | None = None,
     ) -> CoinQuotes:
+        poller: QuotePoller | None = self._async_instance._poller
+        if poller is not None:
+            polled: CoinQuotes | None = poller.get_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+            if polled is not None:
+                return polled  # No need to go through the portal
+
         portal: BlockingPortal = self._get_portal()
         return portal.call(
             partial(
                 self._async_instance.get_coin_quotes,
                 coins=coins,
                 quotes_in=quotes_in,
+                timeout=timeout,
             )
         )
 
     def convert_coin(
         self,
         amount: int | float | Decimal,
-        from_coin: CoinSymbols | QuoteSymbols,
-        to_coin: CoinSymbols | QuoteSymbols,
+        from_coin: CoinSymbols | QuoteSymbols | AssetId,
+        to_coin: CoinSymbols | QuoteSymbols | AssetId,
+        timeout: float | None = None,
     ) -> Decimal:
         portal: BlockingPortal = self._get_portal()
         return portal.call(
@@ -56,9 +80,50 @@ class AnyCoin:
                 amount=amount,
                 from_coin=from_coin,
                 to_coin=to_coin,
+                timeout=timeout,
             )
         )
 
+    def start_polling(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        interval: float = 5.0,
+        max_interval: float | None = None,
+        max_age: float | None = None,
+    ) -> QuotePoller:
+        """See ``AsyncAnyCoin.start_polling``"""
+        portal: BlockingPortal = self._get_portal()
+        return portal.call(
+            partial(
+                self._async_instance.start_polling,
+                coins=coins,
+                quotes_in=quotes_in,
+                interval=interval,
+                max_interval=max_interval,
+                max_age=max_age,
+            )
+        )
+
+    def close(self) -> None:
+        """Close the connection pools of all services and the portal"""
+        with self._lock:
+            portal, self._portal = self._portal, None
+            exit_stack, self._exit_stack = self._exit_stack, None
+
+        if portal is not None:
+            portal.call(self._async_instance.aclose)
+
+        if exit_stack is not None:
+            atexit.unregister(exit_stack.close)
+            exit_stack.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def _get_portal(self) -> BlockingPortal:
         """Thread portal for working with AsyncAnyCoin"""
         with self._lock:
@@ -0,0 +1,55 @@
+"""
+JSON backend of anycoin
+
+Numbers with a fraction are decoded into ``Decimal`` so that the prices-
+keep every digit returned by the APIs. msgspec is used when installed-
+(``pip install anycoin[msgspec]``), the standard library otherwise.
+"""
+
+import json
+from decimal import Decimal
+from typing import Any
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+if msgspec is not None:
+    _decoder = msgspec.json.Decoder(float_hook=Decimal)
+    _encoder = msgspec.json.Encoder(decimal_format='number')
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Decode ``data``, raises ``ValueError`` if it is not valid JSON
+    """
+    if msgspec is None:
+        return json.loads(data, parse_float=Decimal)
+
+    try:
+        return _decoder.decode(data)
+    except msgspec.DecodeError as expt:
+        raise ValueError(str(expt)) from expt
+
+
+def dumps(obj: Any) -> str:
+    """
+    Encode ``obj``, ``Decimal`` values are written as JSON numbers
+
+    Without msgspec the numbers are written through ``float``, so digits-
+    beyond its precision (17 significant digits) are rounded.
+    """
+    if msgspec is None:
+        return json.dumps(obj, default=_default, separators=(',', ':'))
+
+    return _encoder.encode(obj).decode()
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+
+    raise TypeError(
+        f'Object of type {obj.__class__.__name__} is not JSON serializable'
+    )
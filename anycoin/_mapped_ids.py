@@ -1,15 +1,97 @@
 import json
-
-import aiocache
-from anyio import Path, open_file
-
-
-@aiocache.cached(ttl=None, cache=aiocache.Cache.MEMORY)
-async def _get_json_data(file_name: str) -> dict:
-    path_resolved = await Path(__file__).resolve()
-    file_path = path_resolved.parent.joinpath('_data', file_name)
-    async with await open_file(file_path, encoding='utf-8') as file:
-        return json.loads(await file.read())
+from enum import Enum
+from pathlib import Path
+
+from ._enums import CoinSymbols, QuoteSymbols
+from .exeptions import (
+    BaseAnyCoinException,
+    CoinNotSupportedCGK,
+    CoinNotSupportedCMC,
+    QuoteCoinNotSupportedCGK,
+    QuoteCoinNotSupportedCMC,
+)
+
+_DATA_DIR = Path(__file__).resolve().parent / '_data'
+
+
+def _load_json_data(file_name: str) -> dict:
+    with open(_DATA_DIR / file_name, encoding='utf-8') as file:
+        return json.load(file)
+
+
+class IdMap:
+    """
+    Forward ({symbol: id}) and reverse ({id: Symbol}) maps of the ids of-
+    a service, both plain dictionaries built once
+
+    Lookups are synchronous dictionary accesses; unknown symbols or ids-
+    raise ``not_supported_exception``.
+    """
+
+    def __init__(
+        self,
+        mapped_ids: dict[str, str],
+        symbols_enum: type[Enum],
+        label: str,
+        not_supported_exception: type[BaseAnyCoinException],
+    ) -> None:
+        self._symbols_enum = symbols_enum
+        self._label = label
+        self._not_supported_exception = not_supported_exception
+        self.update(mapped_ids)
+
+    @property
+    def ids_by_symbol(self) -> dict[str, str]:
+        """{symbol value: id}, e.g. {'btc': '1'}"""
+        return self._ids_by_symbol
+
+    @property
+    def symbols_by_id(self) -> dict[str, Enum]:
+        """{id: Symbol}, e.g. {'1': CoinSymbols.btc}"""
+        return self._symbols_by_id
+
+    def update(self, mapped_ids: dict[str, str]) -> None:
+        """Replace the maps with ``mapped_ids`` ({symbol value: id})"""
+        ids_by_symbol: dict[str, str] = {}
+        symbols_by_id: dict[str, Enum] = {}
+        for symbol_value, symbol_id in mapped_ids.items():
+            symbol: Enum = self._symbols_enum(symbol_value)
+            ids_by_symbol[symbol_value] = str(symbol_id)
+            symbols_by_id[str(symbol_id)] = symbol
+
+        # Swap both maps at once, readers never see a half-built map
+        self._ids_by_symbol, self._symbols_by_id = ids_by_symbol, symbols_by_id
+
+    def id_for(self, symbol: Enum) -> str:
+        try:
+            return self._ids_by_symbol[symbol.value]
+        except KeyError:
+            raise self._not_supported_exception(
+                f'{self._label} {symbol} not supported'
+            ) from None
+
+    def symbol_for(self, symbol_id: str):
+        try:
+            return self._symbols_by_id[str(symbol_id)]
+        except KeyError:
+            raise self._not_supported_exception(
+                f'{self._label} with id {symbol_id} not supported'
+            ) from None
+
+    def ids_for(self, symbols: list[Enum]) -> list[str]:
+        return [self.id_for(symbol) for symbol in symbols]
+
+    def symbols_for(self, symbol_ids: list[str]) -> list:
+        return [self.symbol_for(symbol_id) for symbol_id in symbol_ids]
+
+    def __len__(self) -> int:
+        return len(self._ids_by_symbol)
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'{self._symbols_enum.__name__}, size={len(self)})'
+        )
 
 
 """
@@ -22,13 +104,26 @@ Quote Ids: https://coinmarketcap.com/api/documentation/
     v1/#operation/getV1FiatMap
 """
 
+CMC_COIN_IDS = IdMap(
+    _load_json_data('mapped_cmc_coin_ids.json'),
+    CoinSymbols,
+    'Coin',
+    CoinNotSupportedCMC,
+)
+CMC_QUOTE_IDS = IdMap(
+    _load_json_data('mapped_cmc_quote_ids.json'),
+    QuoteSymbols,
+    'Quote',
+    QuoteCoinNotSupportedCMC,
+)
+
 
 async def get_cmc_coins_ids() -> dict[str, str]:
-    return await _get_json_data('mapped_cmc_coin_ids.json')
+    return CMC_COIN_IDS.ids_by_symbol
 
 
 async def get_cmc_quotes_ids() -> dict[str, str]:
-    return await _get_json_data('mapped_cmc_quote_ids.json')
+    return CMC_QUOTE_IDS.ids_by_symbol
 
 
 """
@@ -41,10 +136,23 @@ Quote ids: https://docs.coingecko.com/reference/
     simple-supported-currencies
 """
 
+CGK_COIN_IDS = IdMap(
+    _load_json_data('mapped_cgk_coin_ids.json'),
+    CoinSymbols,
+    'Coin',
+    CoinNotSupportedCGK,
+)
+CGK_QUOTE_IDS = IdMap(
+    _load_json_data('mapped_cgk_quote_ids.json'),
+    QuoteSymbols,
+    'Quote',
+    QuoteCoinNotSupportedCGK,
+)
+
 
 async def get_cgk_coin_ids() -> dict[str, str]:
-    return await _get_json_data('mapped_cgk_coin_ids.json')
+    return CGK_COIN_IDS.ids_by_symbol
 
 
 async def get_cgk_quotes_ids() -> dict[str, str]:
-    return await _get_json_data('mapped_cgk_quote_ids.json')
+    return CGK_QUOTE_IDS.ids_by_symbol
@@ -42,5 +42,18 @@ class APIService(metaclass=ABCMeta):
     ) -> QuoteSymbols:
         """..."""
 
+    async def ping(self) -> None:
+        """
+        Check that the service is reachable, raise an error otherwise.
+
+        Used to probe services skipped by an open circuit breaker.
+        """
+        await self.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    async def aclose(self) -> None:
+        """Release the resources held by the service (e.g. connections)"""
+
 
 from anycoin.response_models import CoinQuotes  # noqa: E402
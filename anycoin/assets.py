@@ -0,0 +1,144 @@
+"""
+Compact asset identifiers for large universes
+
+An ``AssetId`` is an interned handle: one instance per symbol, holding a-
+small integer index into the symbol tables of the module (plain lists-
+indexed by that integer). Creating a handle for a known symbol is a-
+single dictionary lookup, and the handles only cost two slots each.
+
+Handles are interchangeable with the members of ``CoinSymbols`` and-
+``QuoteSymbols`` with the same value (and with the symbol string): they-
+compare equal and hash the same, so results keyed by the enumerations-
+can be indexed by either. Only those handles can be quoted by the-
+services, the others name assets (e.g. of ``anycoin.registry``) that-
+the results can not hold.
+
+>>> from anycoin.assets import AssetId
+>>> trx = AssetId('trx')
+>>> trx is AssetId('TRX')
+True
+>>> trx == CoinSymbols.trx
+True
+>>> result.coins[trx] is result.coins[CoinSymbols.trx]
+True
+"""
+
+import threading
+from enum import Enum
+
+from ._enums import CoinSymbols, QuoteSymbols
+
+# Symbol tables, indexed by the id of the handles
+_symbols: list[str] = []
+_names: list[str | None] = []
+_handles: list['AssetId'] = []
+_ids_by_symbol: dict[str, int] = {}
+_lock = threading.Lock()
+
+_ALIAS_TYPES: tuple[type[Enum], ...] = (CoinSymbols, QuoteSymbols)
+
+
+class AssetId:
+    __slots__ = ('_hash', '_id')
+
+    def __new__(cls, symbol: str, name: str | None = None) -> 'AssetId':
+        """Handle of ``symbol`` (case insensitive), interned"""
+        asset_id: int | None = _ids_by_symbol.get(symbol)
+        if asset_id is not None:
+            return _handles[asset_id]
+
+        return _intern(symbol.lower(), name)
+
+    @classmethod
+    def from_id(cls, asset_id: int) -> 'AssetId':
+        return _handles[asset_id]
+
+    @property
+    def symbol(self) -> str:
+        return _symbols[self._id]
+
+    @property
+    def value(self) -> str:
+        """Same as ``symbol``, like the value of the enumerations"""
+        return _symbols[self._id]
+
+    @property
+    def name(self) -> str | None:
+        return _names[self._id]
+
+    def __int__(self) -> int:
+        return self._id
+
+    __index__ = __int__
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, AssetId):
+            return self is other
+
+        if isinstance(other, _ALIAS_TYPES):
+            return other.value == _symbols[self._id]
+
+        if isinstance(other, str):
+            return other == _symbols[self._id]
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        return AssetId, (self.symbol, self.name)
+
+    def __str__(self) -> str:
+        return self.symbol
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}('{self.symbol}')"
+
+
+def _intern(symbol: str, name: str | None) -> AssetId:
+    with _lock:
+        asset_id: int | None = _ids_by_symbol.get(symbol)
+        if asset_id is not None:
+            return _handles[asset_id]
+
+        handle: AssetId = object.__new__(AssetId)
+        handle._id = len(_symbols)
+        handle._hash = hash(symbol)  # Same hash as the enumerations
+
+        _symbols.append(symbol)
+        _names.append(name)
+        _handles.append(handle)
+        _ids_by_symbol[symbol] = handle._id
+        return handle
+
+
+def get_asset_ids(symbols: list[str]) -> list[AssetId]:
+    return [AssetId(symbol) for symbol in symbols]
+
+
+def to_asset_id(symbol: AssetId | CoinSymbols | QuoteSymbols) -> AssetId:
+    if isinstance(symbol, AssetId):
+        return symbol
+
+    return AssetId(symbol.value, symbol.name)
+
+
+def to_symbol(
+    asset_id: AssetId | CoinSymbols | QuoteSymbols,
+) -> AssetId | CoinSymbols | QuoteSymbols:
+    """The enumeration member aliased by ``asset_id``, if there is one"""
+    if not isinstance(asset_id, AssetId):
+        return asset_id
+
+    for symbols_enum in _ALIAS_TYPES:
+        member = symbols_enum._value2member_map_.get(asset_id.symbol)
+        if member is not None:
+            return member
+
+    return asset_id
+
+
+# The members of the enumerations get the first ids
+for _member in (*CoinSymbols, *QuoteSymbols):
+    _intern(_member.value, _member.name)
@@ -1,85 +1,829 @@
 import asyncio
+import struct
+import threading
+import time
+import uuid
+import weakref
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from decimal import Decimal
+from typing import TYPE_CHECKING
 
-from aiocache import Cache as _Cache
-
+from . import _cache_hits, _deadline, _json
 from ._enums import CoinSymbols, QuoteSymbols
+from .exeptions import (
+    BaseAnyCoinException,
+    CoinNotSupportedCGK,
+    CoinNotSupportedCMC,
+    GetCoinQuotes,
+    QuoteCoinNotSupportedCGK,
+    QuoteCoinNotSupportedCMC,
+)
 from .response_models import CoinQuotes
 
+if TYPE_CHECKING:
+    from ._aiocache import Cache
+
+
+def __getattr__(name: str):
+    # aiocache imports all its backends (redis, memcached...), it is only-
+    # loaded when ``Cache`` is used
+    if name == 'Cache':
+        from ._aiocache import Cache  # noqa: PLC0415
+
+        return Cache
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+class LocalCache:
+    """
+    Bounded in-process cache of decoded quotes (L1)
+
+    Put in front of the shared ``Cache`` (L2) of a service, it serves the-
+    hot keys without a round trip to Redis/Memcached nor decoding. Entries-
+    live for ``ttl`` seconds (capped by the rest of the lifetime of the-
+    entry in the service cache) and the least recently used ones are-
+    evicted above ``max_size`` entries.
+
+    >>> from anycoin.cache import Cache, LocalCache
+    >>> CoinMarketCapService(
+    ...     api_key='<api-key>',
+    ...     cache=Cache(Cache.REDIS),
+    ...     local_cache=LocalCache(max_size=1024, ttl=1.0),
+    ... )
+
+    The cached ``CoinQuotes`` are shared by the callers, do not modify-
+    them.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 1.0) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, CoinQuotes]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CoinQuotes | None:
+        with self._lock:
+            entry: tuple[float, CoinQuotes] | None = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(
+        self, key: str, value: CoinQuotes, ttl: float | None = None
+    ) -> None:
+        """
+        :param ttl: Remaining TTL of the entry in the L2 cache, caps the-
+            TTL of the entry (None for no cap).
+        """
+        if ttl is None or ttl > self._ttl:
+            ttl = self._ttl
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'max_size={self._max_size}, ttl={self._ttl})'
+        )
 
-class Cache(_Cache):
+
+class CoinQuotesCodec(ABC):
+    """
+    Format of the quotes stored in the cache
+
+    ``decode`` returns None for entries it cannot read (e.g. written by-
+    another version of the codec), which are treated as cache misses and-
+    overwritten.
     """
-    This class is just a wrapper around the aiocache.Cache class
 
-    You can instantiate a cache type using the ``cache_type`` attribute like-
-    this:
+    # Whether ``encode`` returns bytes (the cache serializer must keep-
+    # them as is)
+    binary: bool = False
+
+    @abstractmethod
+    def encode(self, value: CoinQuotes) -> str | bytes: ...
+
+    @abstractmethod
+    def decode(self, data: str | bytes) -> CoinQuotes | None: ...
+
+
+class JSONCodec(CoinQuotesCodec):
+    """JSON text, readable by any cache serializer (default codec)"""
+
+    def encode(self, value: CoinQuotes) -> str:  # noqa: PLR6301
+        # raw_data is dumped by the JSON backend so that its prices remain-
+        # numbers (pydantic writes Decimal as strings)
+        data: dict = value.model_dump(mode='json', exclude={'raw_data'})
+        data['raw_data'] = value.raw_data
+        return _json.dumps(data)
+
+    def decode(self, data: str | bytes) -> CoinQuotes | None:  # noqa: PLR6301
+        try:
+            return CoinQuotes.model_validate(_json.loads(data))
+        except ValueError:  # Includes pydantic.ValidationError
+            return None
+
+
+_DEFAULT_CODEC = JSONCodec()
+
+
+class BinaryCodec(CoinQuotesCodec):
+    """
+    Compact binary entries: a table of the prices as text plus the raw-
+    data, if any
+
+    It reduces the size of the entries only (about 25 times smaller than-
+    JSON, so less transfer and memory in Redis/Memcached), not the CPU-
+    cost of the cache hits: decoding validates the quotes like-
+    ``JSONCodec`` and is a bit slower than it (see-
+    ``benchmarks/bench_cache_codecs.py``).
+
+    Entries start with a version tag, so entries written by another-
+    version are ignored after upgrades. Entries larger than-
+    ``compress_threshold`` bytes are compressed with zlib.
+
+    The cache must keep bytes as is, e.g.:
+
+    >>> from aiocache.serializers import NullSerializer
+    >>> from anycoin.cache import BinaryCodec, Cache
+    >>> cache = Cache(Cache.REDIS, serializer=NullSerializer(encoding=None))
+    >>> CoinGeckoService(api_key='<api-key>', cache=cache,
+    ...                  cache_codec=BinaryCodec())
+    """
+
+    binary = True
+
+    MAGIC = b'AQ'
+    VERSION = 1
+
+    _FLAG_COMPRESSED = 0x01
+    _HEADER = struct.Struct('!2sBB')  # magic, version, flags
+    _BODY_HEADER = struct.Struct('!BI')  # api service, price table size
+    _API_SERVICES = ('coinmarketcap', 'coingecko')
 
-    >>> from anycoin.cache import Cache
-    >>> Cache(Cache.REDIS)
-    RedisCache (127.0.0.1:6379)
+    def __init__(
+        self,
+        compress_threshold: int | None = 1024,
+        compress_level: int = 6,
+    ) -> None:
+        """
+        :param compress_threshold: Compress the entries larger than this-
+            many bytes, None to never compress.
+        """
+        self._compress_threshold = compress_threshold
+        self._compress_level = compress_level
 
-    OR
-    >>> from anycoin.cache import Cache
-    >>> Cache(Cache.MEMCACHED)
-    MemcachedCache (127.0.0.1:6379)
+    def encode(self, value: CoinQuotes) -> bytes:
+        # One row per coin: "coin quote:price quote:price"
+        table: bytes = '\n'.join(
+            ' '.join([
+                coin.value,
+                *(
+                    f'{quote.value}:{quote_row.quote}'
+                    for quote, quote_row in coin_row.quotes.items()
+                ),
+            ])
+            for coin, coin_row in value.coins.items()
+        ).encode()
+        raw_data: bytes = (
+            b''
+            if value.raw_data is None
+            else _json.dumps(value.raw_data).encode()
+        )
 
-    ``Cache.MEMORY`` is also available for use. See the aiocache documentation-
-    to see which types are actually supported: https://aiocache.aio-libs.org/en/latest/
+        body: bytes = (
+            self._BODY_HEADER.pack(
+                self._API_SERVICES.index(value.api_service), len(table)
+            )
+            + table
+            + raw_data
+        )
+
+        flags: int = 0
+        if (
+            self._compress_threshold is not None
+            and len(body) > self._compress_threshold
+        ):
+            body = zlib.compress(body, self._compress_level)
+            flags |= self._FLAG_COMPRESSED
+
+        return self._HEADER.pack(self.MAGIC, self.VERSION, flags) + body
+
+    def decode(self, data: str | bytes) -> CoinQuotes | None:
+        if not isinstance(data, bytes):
+            return None
+
+        try:
+            magic, version, flags = self._HEADER.unpack_from(data)
+            if magic != self.MAGIC or version != self.VERSION:
+                return None
+
+            body: bytes = data[self._HEADER.size :]
+            if flags & self._FLAG_COMPRESSED:
+                body = zlib.decompress(body)
+
+            return self._decode_body(body)
+        except (struct.error, zlib.error, ValueError, IndexError, KeyError):
+            return None
+
+    def _decode_body(self, body: bytes) -> CoinQuotes:
+        api_service_index, table_size = self._BODY_HEADER.unpack_from(body)
+        offset: int = self._BODY_HEADER.size
+        table: str = body[offset : offset + table_size].decode()
+        raw_data: bytes = body[offset + table_size :]
+
+        coins: dict[CoinSymbols, dict] = {}
+        for row in table.split('\n') if table else ():
+            coin, *quotes = row.split(' ')
+            coins[_COIN_SYMBOLS[coin]] = {
+                'quotes': {
+                    _QUOTE_SYMBOLS[quote]: {'quote': price}
+                    for quote, price in (item.split(':') for item in quotes)
+                }
+            }
+
+        # Validated at once by pydantic, faster than building each row-
+        # (``model_construct``), but as costly as the validation of JSON-
+        # entries
+        return CoinQuotes.model_validate({
+            'coins': coins,
+            'api_service': self._API_SERVICES[api_service_index],
+            'raw_data': _json.loads(raw_data) if raw_data else None,
+        })
+
+
+_COIN_SYMBOLS: dict[str, CoinSymbols] = {
+    coin.value: coin for coin in CoinSymbols
+}
+_QUOTE_SYMBOLS: dict[str, QuoteSymbols] = {
+    quote.value: quote for quote in QuoteSymbols
+}
+
+
+def _check_cache_codec(cache: 'Cache', codec: CoinQuotesCodec) -> None:
+    """Raises ValueError if ``cache`` would corrupt the entries of codec"""
+    if not codec.binary:
+        return
+
+    serializer = cache.serializer
+    probe: bytes = b'\x00\xff'
+    if (
+        serializer.encoding is not None
+        or serializer.loads(serializer.dumps(probe)) != probe
+    ):
+        raise ValueError(
+            f'{codec.__class__.__name__} requires a cache serializer that '
+            'keeps bytes, e.g. NullSerializer(encoding=None)'
+        )
+
+
+class _SingleFlightRegistry:
     """
+    Fetches in flight for the keys of a cache, in an event loop
+
+    Only the running fetches are kept, so the memory is bounded by the-
+    concurrent requests.
+    """
+
+    __slots__ = ('futures', 'locks', 'tasks')
+
+    def __init__(self) -> None:
+        self.futures: dict[str, asyncio.Future[CoinQuotes]] = {}
+        self.locks: dict[str, asyncio.Lock] = {}
+        self.tasks: set[asyncio.Task] = set()  # Background refreshes
+
+
+# Registries by cache and event loop, dropped with them. The asyncio-
+# objects they hold are bound to their loop, and the caches with the-
+# same keys must not contend.
+_registries: weakref.WeakKeyDictionary[
+    'Cache',
+    weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, _SingleFlightRegistry
+    ],
+] = weakref.WeakKeyDictionary()
+_registries_lock = threading.Lock()
 
 
-_cached_coin_quotes_futures = {}
-_locks: dict[str, asyncio.Lock] = {}
+def _get_single_flight_registry(cache: 'Cache') -> _SingleFlightRegistry:
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    loops_registries = _registries.get(cache)
+    if loops_registries is not None:
+        registry: _SingleFlightRegistry | None = loops_registries.get(loop)
+        if registry is not None:
+            return registry
+
+    # Slow path, loops of other threads may be creating theirs
+    with _registries_lock:
+        loops_registries = _registries.get(cache)
+        if loops_registries is None:
+            loops_registries = weakref.WeakKeyDictionary()
+            _registries[cache] = loops_registries
+
+        return loops_registries.setdefault(loop, _SingleFlightRegistry())
 
 
 async def _get_or_set_coin_quotes_cache(
-    cache: Cache, key, coro_func, ttl=None
+    cache: 'Cache',
+    key,
+    coro_func,
+    ttl=None,
+    codec: CoinQuotesCodec | None = None,
+    local_cache: LocalCache | None = None,
+    stale_ttl: float | None = None,
+    lease_ttl: int | None = None,
+    owner: str | None = None,
 ) -> CoinQuotes:
+    """
+    :param stale_ttl: Serve the entries up to this many seconds after-
+        ``ttl`` while a background task refreshes them-
+        (stale-while-revalidate).
+    :param lease_ttl: Deduplicate the fetches across processes: the-
+        process that takes a lease of ``lease_ttl`` seconds in the cache-
+        fetches while the others poll the cache for the value, until the-
+        lease is released or expires (e.g. its holder died).
+    :param owner: Name of the service fetching, see ``_get_flight_key``.
+    """
+    if codec is None:
+        codec = _DEFAULT_CODEC
+    registry: _SingleFlightRegistry = _get_single_flight_registry(cache)
+    flight_key: str = _get_flight_key(owner, key)
+
+    async def _read_value_cached() -> tuple[CoinQuotes | None, bool]:
+        """The cached value and whether it is stale"""
+        if local_cache is not None and (value := local_cache.get(key)):
+            _cache_hits.record_cache_hit()
+            return value, False
+
+        data = await cache.get(key)
+        if data is None:
+            return None, False
+
+        fresh_until, data = _unwrap_stale_entry(data)
+        value: CoinQuotes | None = codec.decode(data)
+        if value is None:
+            return None, False
+
+        _cache_hits.record_cache_hit()
+        local_ttl: float | None = ttl
+        if fresh_until is not None:
+            local_ttl = fresh_until - time.time()
+            if local_ttl <= 0:
+                return value, True
+
+        if local_cache is not None:
+            local_cache.set(key, value, ttl=local_ttl)
+        return value, False
+
     async def _get_value_cached() -> CoinQuotes | None:
-        value = await cache.get(key)
+        value, is_stale = await _read_value_cached()
+        if is_stale:
+            _start_refresh(registry, flight_key, _fetch_and_set_value)
+        return value
+
+    async def _get_fresh_value_cached() -> CoinQuotes | None:
+        value, is_stale = await _read_value_cached()
+        return None if is_stale else value
 
-        if value is not None:
-            return CoinQuotes.model_validate_json(value)
+    async def _set_value_cached(value: CoinQuotes) -> None:
+        data = codec.encode(value)
+        if ttl is None or (stale_ttl is None and local_cache is None):
+            # Plain entries, readable by every version of anycoin
+            await cache.set(key, data, ttl=ttl)
+        else:
+            # The entries carry their fresh time, so that readers keep them-
+            # in their local cache only for the rest of their lifetime
+            await cache.set(
+                key,
+                _wrap_stale_entry(data, fresh_until=time.time() + ttl),
+                ttl=ttl + (stale_ttl or 0),
+            )
+
+        if local_cache is not None:
+            local_cache.set(key, value, ttl=ttl)
+
+    async def _fetch_and_set_value() -> CoinQuotes:
+        if lease_ttl is None:
+            return await _fetch_and_set_value_unleased()
+
+        return await _fetch_with_lease(
+            cache,
+            lease_key=f'{flight_key};lease',
+            lease_ttl=lease_ttl,
+            get_value_cached=_get_fresh_value_cached,
+            coro_func=_fetch_and_set_value_unleased,
+        )
+
+    async def _fetch_and_set_value_unleased() -> CoinQuotes:
+        value = await coro_func()
+        assert isinstance(value, CoinQuotes)
+
+        await _set_value_cached(value)
+        return value
 
     if value := await _get_value_cached():
         return value
 
     # Lock by key to avoid creating two Futures at the same time
-    lock: asyncio.Lock = _locks.setdefault(key, asyncio.Lock())
+    lock: asyncio.Lock = registry.locks.setdefault(flight_key, asyncio.Lock())
 
     async with lock:
         # Check again inside the lock (double-checked locking)
         if value := await _get_value_cached():
             return value
 
-        if key in _cached_coin_quotes_futures:
-            return await _cached_coin_quotes_futures[key]
+        try:
+            return await _single_flight(
+                registry, flight_key, _fetch_and_set_value
+            )
+        finally:
+            registry.locks.pop(flight_key, None)
 
-        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
-        future: asyncio.Future[CoinQuotes] = loop.create_future()
-        _cached_coin_quotes_futures[key] = future
 
-        try:
-            value = await coro_func()
-            assert isinstance(value, CoinQuotes)
+# Seconds between the reads of the processes waiting for a lease holder
+_LEASE_POLL_INTERVAL = 0.05
+
+
+async def _fetch_with_lease(
+    cache: 'Cache',
+    lease_key: str,
+    lease_ttl: int,
+    get_value_cached,
+    coro_func,
+) -> CoinQuotes:
+    """
+    Run ``coro_func`` once the lease is taken, unless the value is cached-
+    (``get_value_cached``) by the holder of the lease meanwhile
+    """
+    token: str = uuid.uuid4().hex
+    while not await _acquire_lease(cache, lease_key, token, ttl=lease_ttl):
+        await asyncio.sleep(_LEASE_POLL_INTERVAL)
+        if value := await get_value_cached():
+            return value
 
-            await cache.set(key, value.model_dump_json(), ttl=ttl)
-            future.set_result(value)
+    try:
+        # The previous holder may have set the value right before-
+        # releasing the lease, after the last poll
+        if value := await get_value_cached():
             return value
-        except Exception as e:
-            future.set_exception(e)
-            raise
-        finally:
-            _cached_coin_quotes_futures.pop(key, None)
-            _locks.pop(key, None)
+
+        return await coro_func()
+    finally:
+        await _release_lease(cache, lease_key, token)
+
+
+async def _acquire_lease(
+    cache: 'Cache', key: str, token: str, ttl: int
+) -> bool:
+    """
+    Take the lease ``key`` for ``ttl`` seconds, ``token`` identifies the-
+    holder. Stored without the serializer, like the locks of aiocache-
+    (``aiocache.lock.RedLock``), so that it can be compared on release.
+    """
+    try:
+        # Atomic (SET NX, ADD)
+        await cache._add(cache.build_key(key), token, ttl=ttl)
+    except ValueError:  # Held by another process
+        return False
+    return True
+
+
+async def _release_lease(cache: 'Cache', key: str, token: str) -> None:
+    """
+    Delete the lease ``key`` only if ``token`` still holds it, a holder-
+    that outlived its lease must not delete the lease of the next one.
+    Atomic with Redis and in memory; Memcached can not compare and-
+    deletes it anyway.
+    """
+    await cache._redlock_release(cache.build_key(key), token)
+
+
+def _start_refresh(
+    registry: _SingleFlightRegistry, key: str, coro_func
+) -> None:
+    """Refresh a stale entry in the background, once at a time per key"""
+    if key in registry.futures:
+        return
+
+    async def refresh() -> None:
+        with _deadline.detach():
+            try:
+                await _single_flight(registry, key, coro_func)
+            except Exception:
+                # The stale value is served until it expires
+                pass
+
+    task: asyncio.Task = asyncio.ensure_future(refresh())
+    registry.tasks.add(task)
+    task.add_done_callback(registry.tasks.discard)
+
+
+_STALE_ENTRY_PREFIX = 'swr:'
+
+
+def _wrap_stale_entry(data: str | bytes, fresh_until: float) -> str | bytes:
+    """
+    Entry with the time until which it is fresh (served without refresh,-
+    the time it expires without ``stale_ttl``), e.g.:
+        "swr:1737280827.010;<data>"
+    """
+    header: str = f'{_STALE_ENTRY_PREFIX}{fresh_until:.3f};'
+    if isinstance(data, bytes):
+        return header.encode() + data
+    return header + data
+
+
+def _unwrap_stale_entry(
+    data: str | bytes,
+) -> tuple[float | None, str | bytes]:
+    """
+    Returns the time until which the entry is fresh (None for entries-
+    without it) and its data
+    """
+    prefix: str | bytes = _STALE_ENTRY_PREFIX
+    separator: str | bytes = ';'
+    if isinstance(data, bytes):
+        prefix, separator = prefix.encode(), separator.encode()
+
+    if not data.startswith(prefix):
+        return None, data
+
+    header, _, data = data.partition(separator)
+    try:
+        return float(header[len(prefix) :]), data
+    except ValueError:
+        return None, data
+
+
+async def _get_or_set_coin_quotes_pairs_cache(
+    cache: 'Cache',
+    coins: list[CoinSymbols],
+    quotes_in: list[QuoteSymbols],
+    coro_func,
+    ttl=None,
+    local_cache: LocalCache | None = None,
+    owner: str | None = None,
+) -> CoinQuotes:
+    """
+    Variant of ``_get_or_set_coin_quotes_cache`` with an entry per pair-
+    (coin, quote), so that the hits do not depend on how the coins are-
+    grouped in the requests.
+
+    All the pairs are read with a single ``multi_get`` and only the coins-
+    and quotes of the missing pairs are fetched, with-
+    ``coro_func(coins, quotes_in)``. The results have no ``raw_data``.
+    """
+    # The local cache keeps whole results, as they are cheap to serve
+    cache_key: str = _get_cache_key_for_get_coin_quotes_method_params(
+        coins=coins, quotes_in=quotes_in, keep_raw_data=False
+    )
+    if local_cache is not None and (coin_quotes := local_cache.get(cache_key)):
+        _cache_hits.record_cache_hit()
+        return coin_quotes
+
+    keys: list[str] = [
+        _get_cache_key_for_pair(coin, quote)
+        for coin in coins
+        for quote in quotes_in
+    ]
+    values: list = await cache.multi_get(keys)
+
+    api_service: str | None = None
+    prices: dict[tuple[CoinSymbols, QuoteSymbols], str | Decimal] = {}
+    missing_coins: dict[CoinSymbols, None] = {}
+    missing_quotes: dict[QuoteSymbols, None] = {}
+    pairs = ((coin, quote) for coin in coins for quote in quotes_in)
+    for (coin, quote), value in zip(pairs, values):
+        if value is None:
+            missing_coins[coin] = None
+            missing_quotes[quote] = None
+            continue
+
+        # "<api service>:<price>"
+        pair_api_service, prices[coin, quote] = (
+            value.decode() if isinstance(value, bytes) else value
+        ).split(':', 1)
+        api_service = api_service or pair_api_service
+
+    if not missing_coins:
+        _cache_hits.record_cache_hit()
+    else:
+        fetched: CoinQuotes = await _fetch_pairs(
+            cache,
+            coins=list(missing_coins),
+            quotes_in=list(missing_quotes),
+            coro_func=coro_func,
+            ttl=ttl,
+            owner=owner,
+        )
+        api_service = fetched.api_service
+        for coin, coin_row in fetched.coins.items():
+            for quote, quote_row in coin_row.quotes.items():
+                prices[coin, quote] = quote_row.quote
+
+    coins_data: dict[CoinSymbols, dict] = {}
+    for coin in coins:
+        quotes: dict[QuoteSymbols, dict] = {
+            quote: {'quote': prices[coin, quote]}
+            for quote in quotes_in
+            if (coin, quote) in prices
+        }
+        if quotes:
+            coins_data[coin] = {'quotes': quotes}
+
+    coin_quotes: CoinQuotes = CoinQuotes.model_validate({
+        'coins': coins_data,
+        'api_service': api_service,
+        'raw_data': None,
+    })
+    if local_cache is not None:
+        local_cache.set(cache_key, coin_quotes, ttl=ttl)
+    return coin_quotes
+
+
+async def _fetch_pairs(
+    cache: 'Cache',
+    coins: list[CoinSymbols],
+    quotes_in: list[QuoteSymbols],
+    coro_func,
+    ttl=None,
+    owner: str | None = None,
+) -> CoinQuotes:
+    """Fetch the quotes and cache each pair"""
+    value: CoinQuotes = await _single_flight(
+        _get_single_flight_registry(cache),
+        _get_flight_key(
+            owner,
+            _get_cache_key_for_get_coin_quotes_method_params(
+                coins=coins, quotes_in=quotes_in
+            ),
+        ),
+        lambda: coro_func(coins, quotes_in),
+    )
+
+    await cache.multi_set(
+        [
+            (
+                _get_cache_key_for_pair(coin, quote),
+                f'{value.api_service}:{quote_row.quote}',
+            )
+            for coin, coin_row in value.coins.items()
+            for quote, quote_row in coin_row.quotes.items()
+        ],
+        ttl=ttl,
+    )
+    return value
+
+
+async def _single_flight(
+    registry: _SingleFlightRegistry, key: str, coro_func
+) -> CoinQuotes:
+    """
+    Share the result of ``coro_func`` with the concurrent calls
+
+    If the call that runs ``coro_func`` is cancelled (e.g. by its-
+    deadline), a waiting call takes over and runs it again.
+    """
+    while (future := registry.futures.get(key)) is not None:
+        try:
+            # Shielded, cancelling a waiter must not cancel the others
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # This call was cancelled, not the shared one
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    future: asyncio.Future[CoinQuotes] = loop.create_future()
+    registry.futures[key] = future
+
+    try:
+        value: CoinQuotes = await coro_func()
+        future.set_result(value)
+        return value
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # Retrieved by the waiters, if any
+        raise
+    finally:
+        registry.futures.pop(key, None)
+
+
+def _get_flight_key(owner: str | None, key: str) -> str:
+    """
+    Key of the fetches in flight and of the leases of a service, e.g.:
+        "CoinGeckoService;coins:btc;quotes_in:usd"
+
+    Services sharing a cache have the same cache keys but must not wait-
+    for the fetches of each other, a hedged call would be answered by the-
+    slow call it hedges.
+    """
+    if owner is None:
+        return key
+    return f'{owner};{key}'
+
+
+def _get_cache_key_for_pair(coin: CoinSymbols, quote: QuoteSymbols) -> str:
+    """
+    Example result:
+        "coin:btc;quote_in:usd"
+    """
+    return f'coin:{coin.value};quote_in:{quote.value}'
+
+
+# Causes of ``GetCoinQuotes`` errors kept in the cache
+_UNSUPPORTED_ERRORS: tuple[type[BaseAnyCoinException], ...] = (
+    CoinNotSupportedCGK,
+    CoinNotSupportedCMC,
+    QuoteCoinNotSupportedCGK,
+    QuoteCoinNotSupportedCMC,
+)
+
+
+def _is_unsupported_error(expt: GetCoinQuotes) -> bool:
+    return isinstance(expt.__cause__, _UNSUPPORTED_ERRORS)
+
+
+def _dump_cached_error(expt: GetCoinQuotes) -> str:
+    """
+    Example results:
+        "GetCoinQuotes:Error retrieving coin quotes"
+        "CoinNotSupportedCMC:Coin with id 1 not supported"
+    """
+    if _is_unsupported_error(expt):
+        return f'{expt.__cause__.__class__.__name__}:{expt}'
+
+    return f'{GetCoinQuotes.__name__}:{expt}'
+
+
+def _load_cached_error(data: str | bytes) -> GetCoinQuotes:
+    """
+    Rebuild the error dumped by ``_dump_cached_error``, chained to its-
+    cause like the error raised by the services
+    """
+    if isinstance(data, bytes):
+        data = data.decode()
+
+    class_name, _, message = data.partition(':')
+    expt: GetCoinQuotes = GetCoinQuotes(message)
+    for cause_class in _UNSUPPORTED_ERRORS:
+        if cause_class.__name__ == class_name:
+            expt.__cause__ = cause_class(message)
+            break
+
+    return expt
+
+
+def _get_cache_key_for_error(service_name: str, key: str) -> str:
+    """
+    Example result:
+        "error:CoinGeckoService;coins:btc;quotes_in:usd"
+    """
+    return f'error:{service_name};{key}'
 
 
 def _get_cache_key_for_get_coin_quotes_method_params(
     coins: list[CoinSymbols],
     quotes_in: list[QuoteSymbols],
+    keep_raw_data: bool = True,
 ) -> str:
     """
     Example result:
         "coins:btc,ltc;quotes_in:usd,eur"
+
+    Results without raw data get their own key:
+        "coins:btc,ltc;quotes_in:usd,eur;raw_data:no"
     """
 
     assert coins
@@ -90,4 +834,7 @@ def _get_cache_key_for_get_coin_quotes_method_params(
     cache_key += 'coins:' + ','.join(coin.value for coin in coins)
 
     cache_key += ';quotes_in:' + ','.join(quote.value for quote in quotes_in)
+
+    if not keep_raw_data:
+        cache_key += ';raw_data:no'
     return cache_key
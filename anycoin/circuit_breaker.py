@@ -0,0 +1,99 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+
+
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    """
+    Circuit breaker settings for the services of ``AsyncAnyCoin``
+
+    The circuit of a service opens after ``failure_threshold`` consecutive-
+    failures, or when at least ``failure_rate_threshold`` of the last-
+    ``window`` seconds calls failed (with ``min_calls`` calls or more).
+    While open the service is skipped and probed in the background, first-
+    after ``recovery_timeout`` seconds then with exponential backoff up to-
+    ``max_recovery_timeout``. A successful probe closes the circuit.
+
+    >>> from anycoin.circuit_breaker import CircuitBreakerPolicy
+    >>> AsyncAnyCoin(api_services, circuit_breaker=CircuitBreakerPolicy())
+    """
+
+    failure_threshold: int = 5
+    failure_rate_threshold: float = 0.5
+    window: float = 60.0
+    min_calls: int = 10
+    recovery_timeout: float = 30.0
+    max_recovery_timeout: float = 300.0
+
+
+class CircuitState(Enum):
+    closed = 'closed'
+    open = 'open'
+    half_open = 'half_open'
+
+
+class CircuitBreaker:
+    """Circuit breaker state of a single service"""
+
+    def __init__(self, policy: CircuitBreakerPolicy) -> None:
+        self._policy = policy
+        self._state = CircuitState.closed
+        self._consecutive_failures = 0
+        self._calls: deque[tuple[float, bool]] = deque()
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def allow_request(self) -> bool:
+        return self._state is CircuitState.closed
+
+    def record_success(self) -> None:
+        self._consecutive_failures = 0
+        self._add_call(success=True)
+
+    def record_failure(self) -> bool:
+        """Returns True if the failure opened the circuit"""
+        self._consecutive_failures += 1
+        self._add_call(success=False)
+
+        if self._state is not CircuitState.closed:
+            return False
+
+        if self._consecutive_failures >= self._policy.failure_threshold or (
+            self._get_failure_rate() >= self._policy.failure_rate_threshold
+        ):
+            self.open()
+            return True
+
+        return False
+
+    def open(self) -> None:
+        self._state = CircuitState.open
+
+    def half_open(self) -> None:
+        self._state = CircuitState.half_open
+
+    def close(self) -> None:
+        self._state = CircuitState.closed
+        self._consecutive_failures = 0
+        self._calls.clear()
+
+    def _add_call(self, success: bool) -> None:
+        now: float = time.monotonic()
+        self._calls.append((now, success))
+
+        while self._calls and self._calls[0][0] < now - self._policy.window:
+            self._calls.popleft()
+
+    def _get_failure_rate(self) -> float:
+        if len(self._calls) < self._policy.min_calls:
+            return 0.0
+
+        failures: int = sum(1 for _, success in self._calls if not success)
+        return failures / len(self._calls)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(state={self._state.value})'
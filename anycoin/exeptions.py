@@ -17,3 +17,9 @@ class QuoteCoinNotSupportedCGK(BaseAnyCoinException): ...
 
 
 class ConvertCoin(BaseAnyCoinException): ...
+
+
+class RateLimitExceeded(GetCoinQuotes): ...
+
+
+class DeadlineExceeded(GetCoinQuotes): ...
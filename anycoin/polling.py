@@ -0,0 +1,380 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from decimal import Decimal
+from typing import Awaitable, Callable, NamedTuple
+
+from ._enums import CoinSymbols, QuoteSymbols
+from .exeptions import GetCoinQuotes as GetCoinQuotesException
+from .response_models import CoinQuotes
+
+_logger: logging.Logger = logging.getLogger(__name__)
+
+
+class _Snapshot(NamedTuple):
+    coin_quotes: CoinQuotes
+    updated_at: float  # time.monotonic() of the refresh
+
+
+class QuotePoller:
+    """
+    Background refresh of the quotes of a watchlist
+
+    Every tick the watched coins are fetched in all the watched quotes-
+    with a single call, and the result replaces the snapshot in one-
+    assignment. Requests covered by a fresh snapshot are answered from-
+    memory without any I/O.
+
+    Coins and quotes are reference counted: every ``watch`` must be-
+    paired with an ``unwatch`` with the same symbols, a symbol leaves the-
+    watchlist when its last user unwatches it.
+
+    With ``max_interval`` the interval is adaptive: it doubles (up to-
+    ``max_interval``) while the quotes do not change or the refresh-
+    fails, and goes back to ``interval`` as soon as they change. The-
+    snapshot is served for at most ``max_age`` seconds after its refresh-
+    (twice the longest interval by default).
+
+    >>> poller = await anycoin.start_polling(
+    ...     coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd], interval=5
+    ... )
+    >>> await anycoin.get_coin_quotes(
+    ...     coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    ... )  # No I/O
+    """
+
+    def __init__(
+        self,
+        coro_func: Callable[
+            [list[CoinSymbols], list[QuoteSymbols]], Awaitable[CoinQuotes]
+        ],
+        interval: float = 5.0,
+        max_interval: float | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        self._coro_func = coro_func
+        self._interval = interval
+        self._max_interval = max_interval or interval
+        self._max_age = (
+            max_age if max_age is not None else 2 * self._max_interval
+        )
+
+        self._coins: Counter[CoinSymbols] = Counter()
+        self._quotes: Counter[QuoteSymbols] = Counter()
+        self._lock = threading.Lock()  # watch/unwatch may run in any thread
+
+        self._snapshot: _Snapshot | None = None
+        self._current_interval = interval
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._refreshed: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._subscriptions: set[QuoteSubscription] = set()
+
+    @property
+    def watchlist(self) -> tuple[list[CoinSymbols], list[QuoteSymbols]]:
+        with self._lock:
+            return list(self._coins), list(self._quotes)
+
+    def watch(
+        self, coins: list[CoinSymbols], quotes_in: list[QuoteSymbols]
+    ) -> None:
+        """Add symbols to the watchlist, new ones are fetched right away"""
+        with self._lock:
+            is_new: bool = any(
+                coin not in self._coins for coin in coins
+            ) or any(quote not in self._quotes for quote in quotes_in)
+            self._coins.update(coins)
+            self._quotes.update(quotes_in)
+
+        if is_new:
+            self._wake_up()
+
+    def unwatch(
+        self, coins: list[CoinSymbols], quotes_in: list[QuoteSymbols]
+    ) -> None:
+        with self._lock:
+            self._coins.subtract(coins)
+            self._quotes.subtract(quotes_in)
+            # Drop the symbols without users (and unbalanced unwatches)
+            self._coins = +self._coins
+            self._quotes = +self._quotes
+
+    def get_coin_quotes(
+        self, coins: list[CoinSymbols], quotes_in: list[QuoteSymbols]
+    ) -> CoinQuotes | None:
+        """
+        Quotes from the snapshot, None if it does not cover every-
+        requested pair or is older than ``max_age``
+        """
+        snapshot: _Snapshot | None = self._snapshot
+        if snapshot is None or (
+            time.monotonic() - snapshot.updated_at > self._max_age
+        ):
+            return None
+
+        coins_data: dict = {}
+        snapshot_coins = snapshot.coin_quotes.coins
+        for coin in coins:
+            coin_row = snapshot_coins.get(coin)
+            if coin_row is None:
+                return None
+
+            quotes: dict = {}
+            for quote in quotes_in:
+                quote_row = coin_row.quotes.get(quote)
+                if quote_row is None:
+                    return None
+                quotes[quote] = quote_row
+
+            coins_data[coin] = {'quotes': quotes}
+
+        return CoinQuotes.model_validate({
+            'coins': coins_data,
+            'api_service': snapshot.coin_quotes.api_service,
+        })
+
+    async def start(self) -> None:
+        """
+        Refresh the snapshot once, then keep it fresh in background
+
+        If the poller is running already, waits for the next refresh when-
+        the snapshot does not cover the watchlist yet.
+        """
+        if self._task is None or self._task.done():
+            # Set before any await, concurrent starts share the task
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._refreshed = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+        if self.get_coin_quotes(*self.watchlist) is None:
+            await self._refreshed.wait()
+
+    async def refresh(self) -> None:
+        """Fetch the watchlist and swap the snapshot"""
+        coins, quotes_in = self.watchlist
+        if not coins or not quotes_in:
+            return
+
+        try:
+            coin_quotes: CoinQuotes = await self._coro_func(coins, quotes_in)
+        except GetCoinQuotesException:
+            # Keep the previous snapshot until it is too old
+            self._current_interval = self._get_backoff_interval()
+            return
+
+        previous: _Snapshot | None = self._snapshot
+        self._snapshot = _Snapshot(coin_quotes, time.monotonic())
+        for subscription in list(self._subscriptions):
+            subscription._on_coin_quotes(coin_quotes)
+
+        if previous is not None and (
+            previous.coin_quotes.coins == coin_quotes.coins
+        ):
+            self._current_interval = self._get_backoff_interval()
+        else:
+            self._current_interval = self._interval
+
+    def subscribe(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        threshold: Decimal | float = 0,
+    ) -> 'QuoteSubscription':
+        """Stream of the changes of the quotes, see ``QuoteSubscription``"""
+        return QuoteSubscription(
+            poller=self, coins=coins, quotes_in=quotes_in, threshold=threshold
+        )
+
+    async def aclose(self) -> None:
+        """Stop the polling and end the subscriptions"""
+        for subscription in list(self._subscriptions):
+            subscription._close()
+
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        # Release the starts waiting for a refresh that will never come
+        if self._refreshed is not None:
+            self._refreshed.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                # An unexpected error (e.g. a malformed response) must not-
+                # stop the polling
+                _logger.exception('Error refreshing the quotes')
+                self._current_interval = self._get_backoff_interval()
+
+            refreshed, self._refreshed = self._refreshed, asyncio.Event()
+            refreshed.set()
+
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(), timeout=self._current_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+            self._wake.clear()
+
+    def _wake_up(self) -> None:
+        if self._loop is None or self._loop.is_closed():
+            return
+
+        self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _get_backoff_interval(self) -> float:
+        return min(self._current_interval * 2, self._max_interval)
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'interval={self._interval}, max_interval={self._max_interval})'
+        )
+
+
+class QuoteSubscription:
+    """
+    Async iterator over the changes of the quotes of ``coins`` in-
+    ``quotes_in``, fed by a ``QuotePoller``
+
+    Every update is a ``CoinQuotes`` with only the pairs whose quote-
+    moved by more than ``threshold`` (relative, e.g. 0.001 for 0.1%)-
+    since the consumer last saw it. The first update has every pair.
+
+    Updates are never queued: while the consumer is busy the changes are-
+    merged into a single pending update (the latest quote of each pair-
+    wins), so a slow consumer holds at most one quote per pair and never-
+    slows the poller down.
+
+    >>> async with anycoin.subscribe(
+    ...     coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    ... ) as updates:
+    ...     async for coin_quotes in updates:
+    ...         print(coin_quotes.coins)
+    """
+
+    def __init__(
+        self,
+        poller: QuotePoller,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        threshold: Decimal | float = 0,
+    ) -> None:
+        self._poller = poller
+        self._coins = list(coins)
+        self._quotes_in = list(quotes_in)
+        self._threshold = Decimal(str(threshold))
+
+        self._started = False
+        self._closed = False
+        self._last_sent: dict[tuple[CoinSymbols, QuoteSymbols], Decimal] = {}
+        self._pending: dict[tuple[CoinSymbols, QuoteSymbols], Decimal] = {}
+        self._api_service: str | None = None
+        self._changed = asyncio.Event()
+
+    async def start(self) -> None:
+        """Subscribe to the poller, done by the first iteration"""
+        if self._started:
+            return
+
+        self._started = True
+        self._poller._subscriptions.add(self)
+        self._poller.watch(coins=self._coins, quotes_in=self._quotes_in)
+        await self._poller.start()
+
+        snapshot: _Snapshot | None = self._poller._snapshot
+        if snapshot is not None:
+            self._on_coin_quotes(snapshot.coin_quotes)
+
+    async def aclose(self) -> None:
+        self._close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> CoinQuotes:
+        await self.start()
+
+        while not self._pending:
+            if self._closed:
+                raise StopAsyncIteration
+
+            self._changed.clear()
+            await self._changed.wait()
+
+        pending, self._pending = self._pending, {}
+        self._last_sent.update(pending)
+
+        coins_data: dict = {}
+        for (coin, quote), price in pending.items():
+            coins_data.setdefault(coin, {'quotes': {}})['quotes'][quote] = {
+                'quote': price
+            }
+
+        return CoinQuotes.model_validate({
+            'coins': coins_data,
+            'api_service': self._api_service,
+        })
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _on_coin_quotes(self, coin_quotes: CoinQuotes) -> None:
+        self._api_service = coin_quotes.api_service
+        for coin in self._coins:
+            coin_row = coin_quotes.coins.get(coin)
+            if coin_row is None:
+                continue
+
+            for quote in self._quotes_in:
+                quote_row = coin_row.quotes.get(quote)
+                if quote_row is None:
+                    continue
+
+                pair: tuple[CoinSymbols, QuoteSymbols] = (coin, quote)
+                if self._has_changed(pair, quote_row.quote):
+                    self._pending[pair] = quote_row.quote
+                else:
+                    # Moved back close to the quote the consumer has
+                    self._pending.pop(pair, None)
+
+        if self._pending:
+            self._changed.set()
+
+    def _has_changed(
+        self, pair: tuple[CoinSymbols, QuoteSymbols], price: Decimal
+    ) -> bool:
+        last_price: Decimal | None = self._last_sent.get(pair)
+        if last_price is None:
+            return True
+
+        return abs(price - last_price) > abs(last_price) * self._threshold
+
+    def _close(self) -> None:
+        if self._closed:
+            return
+
+        self._closed = True
+        self._changed.set()
+        if self._started:
+            self._poller._subscriptions.discard(self)
+            self._poller.unwatch(coins=self._coins, quotes_in=self._quotes_in)
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'coins={self._coins}, quotes_in={self._quotes_in})'
+        )
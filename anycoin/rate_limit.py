@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import time
+
+from .exeptions import RateLimitExceeded as RateLimitExceededException
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate  # Tokens per second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take ``amount`` tokens (the balance may become negative) and-
+        return how many seconds the caller has to wait for them.
+        """
+        self.refill(now)
+        self._tokens -= amount
+        if self._tokens >= 0:
+            return 0.0
+
+        return -self._tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    def drain(self, now: float) -> None:
+        self.refill(now)
+        self._tokens = min(self._tokens, 0.0)
+
+
+class RateLimiter:
+    """
+    Client-side token bucket rate limiter for the requests of an API key
+
+    Requests wait locally until the plan allows them instead of being-
+    sent and rejected by the API. Share the same instance between the-
+    services that use the same API key.
+
+    >>> from anycoin.rate_limit import RateLimiter
+    >>> limiter = RateLimiter(requests_per_minute=30, credits_per_minute=30)
+    >>> CoinMarketCapService(api_key='<api-key>', rate_limiter=limiter)
+
+    The limiter adapts itself to the API responses: when a request is-
+    rejected for exceeding a rate limit the allowed rate is halved and no-
+    request is sent until the limit resets, then the rate is restored-
+    gradually with each successful request.
+
+    If a request would have to wait more than ``max_wait`` seconds,-
+    ``RateLimitExceeded`` is raised right away so that the next service-
+    can be tried. Whatever ``max_wait``, requests are not held for more-
+    than ``max_blocked_wait`` seconds by a rejection of the API (e.g. a-
+    daily limit, that resets at midnight).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        credits_per_minute: float | None = None,
+        burst: float | None = None,
+        max_wait: float | None = None,
+        min_rate_ratio: float = 0.1,
+        recovery_step: float = 0.05,
+        max_blocked_wait: float | None = 60,
+    ) -> None:
+        self._requests_per_minute = requests_per_minute
+        self._credits_per_minute = credits_per_minute
+        self._max_wait = max_wait
+        self._max_blocked_wait = max_blocked_wait
+        self._min_rate_ratio = min_rate_ratio
+        self._recovery_step = recovery_step
+
+        self._rate_ratio = 1.0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        self._requests_bucket = _TokenBucket(
+            rate=requests_per_minute / 60,
+            capacity=burst or requests_per_minute,
+        )
+        self._credits_bucket: _TokenBucket | None = None
+        if credits_per_minute is not None:
+            self._credits_bucket = _TokenBucket(
+                rate=credits_per_minute / 60,
+                capacity=credits_per_minute,
+            )
+
+    @property
+    def rate_ratio(self) -> float:
+        """Fraction of the configured rate currently allowed"""
+        return self._rate_ratio
+
+    async def acquire(
+        self, credits: float = 1, max_wait: float | None = None
+    ) -> None:
+        """
+        Wait until a request costing ``credits`` can be sent
+
+        ``max_wait`` further limits the wait of this call (e.g. to the-
+        remaining deadline of the request).
+        """
+        if max_wait is None:
+            max_wait = self._max_wait
+        elif self._max_wait is not None:
+            max_wait = min(max_wait, self._max_wait)
+
+        with self._lock:
+            now: float = time.monotonic()
+            blocked: float = self._blocked_until - now
+            if (
+                self._max_blocked_wait is not None
+                and blocked > self._max_blocked_wait
+            ):
+                raise RateLimitExceededException(
+                    f'Rate limit exceeded, retry in {blocked:.2f} seconds'
+                )
+
+            wait: float = max(self._requests_bucket.reserve(1, now), blocked)
+            if self._credits_bucket is not None:
+                wait = max(wait, self._credits_bucket.reserve(credits, now))
+
+            if max_wait is not None and wait > max_wait:
+                self._requests_bucket.refund(1)
+                if self._credits_bucket is not None:
+                    self._credits_bucket.refund(credits)
+
+                raise RateLimitExceededException(
+                    f'Rate limit exceeded, retry in {wait:.2f} seconds'
+                )
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record_credits(self, reserved: float, used: float) -> None:
+        """
+        Reconcile the credits reserved for a request with the credits-
+        the API reports as actually used.
+        """
+        if self._credits_bucket is None or used == reserved:
+            return
+
+        with self._lock:
+            now: float = time.monotonic()
+            if used > reserved:
+                self._credits_bucket.reserve(used - reserved, now)
+            else:
+                self._credits_bucket.refund(reserved - used)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._rate_ratio < 1.0:
+                self._set_rate_ratio(self._rate_ratio + self._recovery_step)
+
+    def record_rate_limited(self, retry_after: float | None = None) -> None:
+        """
+        Tighten the limiter after a request was rejected by the API.
+
+        No request is allowed for ``retry_after`` seconds (until the next-
+        minute when unknown).
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            if retry_after is None:
+                retry_after = 60 - (time.time() % 60)
+
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._set_rate_ratio(self._rate_ratio / 2)
+
+            self._requests_bucket.drain(now)
+            if self._credits_bucket is not None:
+                self._credits_bucket.drain(now)
+
+    def _set_rate_ratio(self, ratio: float) -> None:
+        now: float = time.monotonic()
+        self._rate_ratio = min(1.0, max(self._min_rate_ratio, ratio))
+
+        self._requests_bucket.refill(now)
+        self._requests_bucket.rate = (
+            self._requests_per_minute / 60 * self._rate_ratio
+        )
+        if self._credits_bucket is not None:
+            self._credits_bucket.refill(now)
+            self._credits_bucket.rate = (
+                self._credits_per_minute / 60 * self._rate_ratio
+            )
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'requests_per_minute={self._requests_per_minute}, '
+            f'credits_per_minute={self._credits_per_minute})'
+        )
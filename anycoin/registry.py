@@ -0,0 +1,259 @@
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import anyio.to_thread
+
+from .assets import AssetId
+from .services.base import BaseAPIService
+
+_FILE_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Asset:
+    symbol: str
+    name: str
+    cmc_id: str | None = None
+    cgk_id: str | None = None
+
+    @property
+    def asset_id(self) -> AssetId:
+        return AssetId(self.symbol, self.name)
+
+
+class AssetRegistry:
+    """
+    Universe of assets and of their ids at CoinMarketCap and CoinGecko
+
+    The maps are pulled in bulk from the map endpoints of the services-
+    (``/cryptocurrency/map`` and ``/coins/list``) by ``refresh`` and-
+    persisted to ``path``. A new registry loads the persisted maps, so-
+    the startup never hits the network; ``refresh_if_stale`` pulls them-
+    again once they are older than ``refresh_interval`` seconds.
+
+    Many coins share a symbol. For each symbol the registry keeps the-
+    coin with the best CoinMarketCap rank, then picks the CoinGecko coin-
+    with the same slug or name. A symbol whose CoinGecko coins can not be-
+    matched that way gets no CoinGecko id rather than the id of the wrong-
+    coin (as does a symbol listed several times by CoinGecko only).
+
+    The registry only resolves symbols and ids: ``get_coin_quotes`` still-
+    quotes the members of ``CoinSymbols`` only, as the results are keyed-
+    by the symbol enumerations. Quoting the other assets of the registry-
+    is out of scope.
+
+    >>> from anycoin.registry import AssetRegistry
+    >>> registry = AssetRegistry('~/.cache/anycoin/assets.json')
+    >>> await registry.refresh_if_stale(cmc_service, cgk_service)
+    >>> registry.get('arb')
+    Asset(symbol='arb', name='Arbitrum', cmc_id='11841', cgk_id='arbitrum')
+    """
+
+    def __init__(
+        self, path: str | os.PathLike, refresh_interval: float = 86400
+    ) -> None:
+        self._path = Path(path).expanduser()
+        self._refresh_interval = refresh_interval
+        self._updated_at: float | None = None
+        self._set_assets([])
+        self.load()
+
+    @property
+    def updated_at(self) -> float | None:
+        """Timestamp of the last refresh, None if never refreshed"""
+        return self._updated_at
+
+    @property
+    def is_stale(self) -> bool:
+        return self._updated_at is None or (
+            time.time() - self._updated_at > self._refresh_interval
+        )
+
+    def get(self, symbol: str) -> Asset | None:
+        return self._assets_by_symbol.get(symbol.lower())
+
+    def get_by_cmc_id(self, cmc_id: str) -> Asset | None:
+        return self._assets_by_cmc_id.get(str(cmc_id))
+
+    def get_by_cgk_id(self, cgk_id: str) -> Asset | None:
+        return self._assets_by_cgk_id.get(cgk_id)
+
+    def load(self) -> bool:
+        """
+        Load the persisted maps, returns False if there are none (or-
+        they can not be read)
+        """
+        try:
+            with open(self._path, encoding='utf-8') as file:
+                data: dict = json.load(file)
+        except (OSError, ValueError):
+            return False
+
+        try:
+            if data.get('version') != _FILE_VERSION:
+                return False
+
+            assets: list[Asset] = [Asset(*row) for row in data['assets']]
+            updated_at: float = float(data['updated_at'])
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return False  # Malformed file
+
+        self._set_assets(assets)
+        self._updated_at = updated_at
+        return True
+
+    async def refresh(
+        self,
+        cmc_service: BaseAPIService | None = None,
+        cgk_service: BaseAPIService | None = None,
+    ) -> None:
+        """
+        Pull the maps of the given services, reconcile and persist them
+
+        The assets only get the ids of the given services, the services-
+        without a map endpoint are ignored. The current maps are kept if-
+        a request fails.
+        """
+        cmc_coins, cgk_coins = await asyncio.gather(
+            _get_coins_map(cmc_service), _get_coins_map(cgk_service)
+        )
+        assets: list[Asset] = _reconcile(cmc_coins, cgk_coins)
+        updated_at: float = time.time()
+
+        await anyio.to_thread.run_sync(self._save, assets, updated_at)
+        self._set_assets(assets)
+        self._updated_at = updated_at
+
+    async def refresh_if_stale(
+        self,
+        cmc_service: BaseAPIService | None = None,
+        cgk_service: BaseAPIService | None = None,
+    ) -> bool:
+        """Returns True if the maps were refreshed"""
+        if not self.is_stale:
+            return False
+
+        await self.refresh(cmc_service=cmc_service, cgk_service=cgk_service)
+        return True
+
+    def _set_assets(self, assets: list[Asset]) -> None:
+        self._assets_by_symbol: dict[str, Asset] = {
+            asset.symbol: asset for asset in assets
+        }
+        self._assets_by_cmc_id: dict[str, Asset] = {
+            asset.cmc_id: asset for asset in assets if asset.cmc_id
+        }
+        self._assets_by_cgk_id: dict[str, Asset] = {
+            asset.cgk_id: asset for asset in assets if asset.cgk_id
+        }
+
+    def _save(self, assets: list[Asset], updated_at: float) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write then rename, readers never see a partial file
+        tmp_path: Path = self._path.with_name(f'{self._path.name}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'version': _FILE_VERSION,
+                    'updated_at': updated_at,
+                    'assets': [
+                        [asset.symbol, asset.name, asset.cmc_id, asset.cgk_id]
+                        for asset in assets
+                    ],
+                },
+                file,
+                separators=(',', ':'),
+            )
+        os.replace(tmp_path, self._path)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.lower() in self._assets_by_symbol
+
+    def __len__(self) -> int:
+        return len(self._assets_by_symbol)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(path='{self._path}', size={len(self)})"
+        )
+
+
+async def _get_coins_map(service: BaseAPIService | None) -> list[dict]:
+    """
+    Every coin listed by the service, fetched from its map endpoint by its-
+    ``get_coins_map`` method:
+        [{'id': '1', 'symbol': 'btc', 'name': 'Bitcoin',
+          'slug': 'bitcoin', 'rank': 1}, ...]
+
+    ``rank`` is None when the service does not rank its coins. Services-
+    without a map endpoint (no ``get_coins_map``) list no coin.
+    """
+    get_coins_map: Callable[[], Awaitable[list[dict]]] | None = getattr(
+        service, 'get_coins_map', None
+    )
+    if get_coins_map is None:
+        return []
+
+    return await get_coins_map()
+
+
+def _get_rank(coin: dict) -> float:
+    rank: int | None = coin['rank']
+    return float('inf') if rank is None else rank
+
+
+def _reconcile(cmc_coins: list[dict], cgk_coins: list[dict]) -> list[Asset]:
+    cmc_by_symbol: dict[str, dict] = {}
+    for coin in cmc_coins:
+        best: dict | None = cmc_by_symbol.get(coin['symbol'])
+        if best is None or _get_rank(coin) < _get_rank(best):
+            cmc_by_symbol[coin['symbol']] = coin
+
+    cgk_by_symbol: defaultdict[str, list[dict]] = defaultdict(list)
+    for coin in cgk_coins:
+        cgk_by_symbol[coin['symbol']].append(coin)
+
+    assets: list[Asset] = []
+    for symbol in cmc_by_symbol.keys() | cgk_by_symbol.keys():
+        cmc_coin: dict | None = cmc_by_symbol.get(symbol)
+        cgk_coin: dict | None = _match_cgk_coin(
+            cgk_by_symbol.get(symbol, []), cmc_coin
+        )
+        if cmc_coin is None and cgk_coin is None:
+            continue  # Ambiguous symbol only listed by CoinGecko
+
+        assets.append(
+            Asset(
+                symbol=symbol,
+                name=(cmc_coin or cgk_coin)['name'],
+                cmc_id=cmc_coin['id'] if cmc_coin else None,
+                cgk_id=cgk_coin['id'] if cgk_coin else None,
+            )
+        )
+
+    return sorted(assets, key=lambda asset: asset.symbol)
+
+
+def _match_cgk_coin(
+    candidates: list[dict], cmc_coin: dict | None
+) -> dict | None:
+    if cmc_coin is None:
+        # Listed by CoinGecko only, unambiguous if listed once
+        return candidates[0] if len(candidates) == 1 else None
+
+    for coin in candidates:
+        if coin['slug'] == cmc_coin['slug']:
+            return coin
+
+    for coin in candidates:
+        if coin['name'].lower() == cmc_coin['name'].lower():
+            return coin
+
+    return None
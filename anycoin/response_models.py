@@ -15,89 +15,107 @@ class CoinRow(BaseModel):
 
 
 class CoinQuotes(BaseModel):
+    """
+    Quotes of coins
+
+    ``from_cmc_raw_data`` and ``from_cgk_raw_data`` build plain data and-
+    validate it with a single ``model_validate`` call, which is much-
+    cheaper than instantiating (or even ``model_construct``-ing) every-
+    row from Python.
+    """
+
     coins: dict[CoinSymbols, CoinRow]
     api_service: Literal['coinmarketcap', 'coingecko'] = Field(
         description='API Service Name'
     )
-    raw_data: dict = Field(description='Raw API response data')
+    raw_data: dict | None = Field(
+        default=None,
+        description='Raw API response data (None when not kept)',
+    )
 
     @staticmethod
     async def from_cmc_raw_data(raw_data: dict) -> 'CoinQuotes':
-        from anycoin.services.coinmarketcap import (  # noqa: PLC0415
-            CoinMarketCapService,
+        from anycoin._mapped_ids import (  # noqa: PLC0415
+            CMC_COIN_IDS,
+            CMC_QUOTE_IDS,
+        )
+        from anycoin.exeptions import (  # noqa: PLC0415
+            CoinNotSupportedCMC,
+            QuoteCoinNotSupportedCMC,
         )
 
-        async def get_coin_quotes(coin_id) -> dict[CoinSymbols, QuoteRow]:
-            quotes: dict[CoinSymbols, QuoteRow] = {}
-            for quote_coin_id, quote_data in raw_data['data'][coin_id][
-                'quote'
-            ].items():
-                quote_coin_symbol: QuoteSymbols = (
-                    await CoinMarketCapService.get_quote_symbol_by_id(
-                        quote_id=str(quote_coin_id)
-                    )
+        coin_symbols: dict[str, CoinSymbols] = CMC_COIN_IDS.symbols_by_id
+        quote_symbols: dict[str, QuoteSymbols] = CMC_QUOTE_IDS.symbols_by_id
+
+        coins_data: dict[CoinSymbols, dict] = {}
+        for coin_id, coin_data in raw_data['data'].items():
+            coin_symbol: CoinSymbols | None = coin_symbols.get(str(coin_id))
+            if coin_symbol is None:
+                raise CoinNotSupportedCMC(
+                    f'Coin with id {coin_id} not supported'
                 )
-                quotes[quote_coin_symbol] = QuoteRow(
-                    quote=Decimal(str(quote_data['price'])),
+
+            quotes: dict[QuoteSymbols, dict] = {}
+            for quote_id, quote_data in coin_data['quote'].items():
+                quote_symbol: QuoteSymbols | None = quote_symbols.get(
+                    str(quote_id)
                 )
+                if quote_symbol is None:
+                    raise QuoteCoinNotSupportedCMC(
+                        f'Quote with id {quote_id} not supported'
+                    )
 
-            return quotes
+                quotes[quote_symbol] = {'quote': quote_data['price']}
 
-        coins_data: dict[CoinSymbols, CoinRow] = {}
-        for coin_id, coin_data in raw_data['data'].items():
-            coin_symbol: CoinSymbols = (
-                await CoinMarketCapService.get_coin_symbol_by_id(
-                    coin_id=str(coin_id)
-                )
-            )
-            quotes: dict[CoinSymbols, QuoteRow] = await get_coin_quotes(
-                coin_id
-            )
-            coins_data[coin_symbol] = CoinRow(quotes=quotes)
-
-        return CoinQuotes(
-            coins=coins_data,
-            api_service='coinmarketcap',
-            raw_data=raw_data,
-        )
+            coins_data[coin_symbol] = {'quotes': quotes}
+
+        return CoinQuotes.model_validate({
+            'coins': coins_data,
+            'api_service': 'coinmarketcap',
+            'raw_data': raw_data,
+        })
 
     @staticmethod
     async def from_cgk_raw_data(raw_data: dict) -> 'CoinQuotes':
-        from anycoin.services.coingecko import (  # noqa: PLC0415
-            CoinGeckoService,
+        from anycoin._mapped_ids import (  # noqa: PLC0415
+            CGK_COIN_IDS,
+            CGK_QUOTE_IDS,
+        )
+        from anycoin.exeptions import (  # noqa: PLC0415
+            CoinNotSupportedCGK,
+            QuoteCoinNotSupportedCGK,
         )
 
-        async def get_coin_quotes(coin_id) -> dict[CoinSymbols, QuoteRow]:
-            quotes: dict[CoinSymbols, QuoteRow] = {}
-            for quote_coin_id, quote_value in raw_data[coin_id].items():
-                quote_coin_symbol: QuoteSymbols = (
-                    await CoinGeckoService.get_quote_symbol_by_id(
-                        quote_id=str(quote_coin_id)
-                    )
+        coin_symbols: dict[str, CoinSymbols] = CGK_COIN_IDS.symbols_by_id
+        quote_symbols: dict[str, QuoteSymbols] = CGK_QUOTE_IDS.symbols_by_id
+
+        coins_data: dict[CoinSymbols, dict] = {}
+        for coin_id, coin_data in raw_data.items():
+            coin_symbol: CoinSymbols | None = coin_symbols.get(str(coin_id))
+            if coin_symbol is None:
+                raise CoinNotSupportedCGK(
+                    f'Coin with id {coin_id} not supported'
                 )
-                quotes[quote_coin_symbol] = QuoteRow(
-                    quote=Decimal(str(quote_value)),
+
+            quotes: dict[QuoteSymbols, dict] = {}
+            for quote_id, quote_value in coin_data.items():
+                quote_symbol: QuoteSymbols | None = quote_symbols.get(
+                    str(quote_id)
                 )
+                if quote_symbol is None:
+                    raise QuoteCoinNotSupportedCGK(
+                        f'Quote with id {quote_id} not supported'
+                    )
 
-            return quotes
+                quotes[quote_symbol] = {'quote': quote_value}
 
-        coins_data: dict[CoinSymbols, CoinRow] = {}
-        for coin_id, coin_data in raw_data.items():
-            coin_symbol: CoinSymbols = (
-                await CoinGeckoService.get_coin_symbol_by_id(
-                    coin_id=str(coin_id)
-                )
-            )
-            quotes: dict[CoinSymbols, QuoteRow] = await get_coin_quotes(
-                coin_id
-            )
-            coins_data[coin_symbol] = CoinRow(quotes=quotes)
-
-        return CoinQuotes(
-            coins=coins_data,
-            api_service='coingecko',
-            raw_data=raw_data,
-        )
+            coins_data[coin_symbol] = {'quotes': quotes}
+
+        return CoinQuotes.model_validate({
+            'coins': coins_data,
+            'api_service': 'coingecko',
+            'raw_data': raw_data,
+        })
 
     def __str__(self) -> str:
         return self.__repr__()
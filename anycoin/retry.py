@@ -0,0 +1,117 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry policy for the upstream requests of a service
+
+    Failed attempts are retried with exponential backoff and full jitter.
+    ``Retry-After`` headers sent by the API take precedence over the-
+    backoff, unless they ask to wait longer than ``max_retry_after``-
+    seconds, in which case the error is raised so that the next service-
+    can be tried instead.
+
+    Retries are limited by a budget: every request deposits-
+    ``budget_ratio`` tokens (up to ``budget_max_tokens``) and every retry-
+    withdraws one, so a struggling API never receives more than ~20%-
+    extra traffic with the defaults.
+
+    >>> from anycoin.retry import RetryPolicy
+    >>> CoinGeckoService(api_key='<api-key>', retry_policy=RetryPolicy())
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.05
+    max_delay: float = 1.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    retry_on_status: frozenset[int] = field(
+        default_factory=lambda: frozenset({
+            HTTPStatus.TOO_MANY_REQUESTS,
+            HTTPStatus.INTERNAL_SERVER_ERROR,
+            HTTPStatus.BAD_GATEWAY,
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            HTTPStatus.GATEWAY_TIMEOUT,
+        })
+    )
+    retry_on_request_error: bool = True
+    max_retry_after: float = 5.0
+    budget_ratio: float = 0.2
+    budget_max_tokens: float = 10.0
+
+    def is_retryable(self, status_code: int | None) -> bool:
+        """
+        ``status_code`` is None when the request failed before a response-
+        was received (connection errors, timeouts...)
+        """
+        if status_code is None:
+            return self.retry_on_request_error
+
+        return status_code in self.retry_on_status
+
+    def get_delay(
+        self, attempt: int, retry_after: float | None = None
+    ) -> float | None:
+        """
+        Seconds to wait before retrying after the ``attempt`` (0-based)-
+        failed, or None if it should not be retried.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after
+
+        delay = min(self.max_delay, self.base_delay * self.multiplier**attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+
+class _RetryBudget:
+    def __init__(self, ratio: float, max_tokens: float) -> None:
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    def deposit(self) -> None:
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        return True
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a ``Retry-After`` header (delay-seconds or HTTP-date)
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at: datetime = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
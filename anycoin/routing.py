@@ -0,0 +1,114 @@
+import random
+from dataclasses import dataclass
+
+from .abc import APIService
+
+
+@dataclass
+class ServiceStats:
+    latency: float | None = None  # EWMA of the latency in seconds
+    error_rate: float = 0.0  # EWMA of the failures (0.0 to 1.0)
+    calls: int = 0
+
+    @property
+    def score(self) -> float:
+        """Expected cost of calling the service, lower is better"""
+        latency: float = self.latency or 0.0
+        return latency + self.error_rate * LatencyRouter.ERROR_COST
+
+
+class LatencyRouter:
+    """
+    Latency-aware ordering of the services of ``AsyncAnyCoin``
+
+    Keeps an EWMA of the latency and of the error rate of every service-
+    and tries the services with the lowest expected cost first. Services-
+    without samples yet keep the front so that they get measured.
+
+    A fraction ``shadow_rate`` of the calls also sends a background-
+    request to another service, whose result is discarded, to keep the-
+    estimates of the fallback services fresh.
+
+    >>> from anycoin.routing import LatencyRouter
+    >>> router = LatencyRouter()
+    >>> anycoin = AsyncAnyCoin(api_services, router=router)
+    >>> router.stats()
+    {CoinMarketCapService(api_key='***'): ServiceStats(latency=0.21...), ...}
+    """
+
+    # Seconds added to the score of a service that always fails
+    ERROR_COST = 10.0
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        shadow_rate: float = 0.01,
+    ) -> None:
+        self._alpha = alpha
+        self._shadow_rate = shadow_rate
+        self._stats: dict[APIService, ServiceStats] = {}
+
+    def record_success(self, service: APIService, latency: float) -> None:
+        stats: ServiceStats = self._get_stats(service)
+        stats.calls += 1
+        stats.latency = (
+            latency
+            if stats.latency is None
+            else self._ewma(stats.latency, latency)
+        )
+        stats.error_rate = self._ewma(stats.error_rate, 0.0)
+
+    def record_failure(self, service: APIService) -> None:
+        stats: ServiceStats = self._get_stats(service)
+        stats.calls += 1
+        stats.error_rate = self._ewma(stats.error_rate, 1.0)
+
+    def order(self, services: list[APIService]) -> list[APIService]:
+        """
+        Services sorted by expected cost, ties keep the configured order
+        """
+        return sorted(services, key=self._get_score)
+
+    def pick_shadow_service(
+        self, services: list[APIService]
+    ) -> APIService | None:
+        """
+        Returns a fallback service to sample in the background, if any
+        """
+        if len(services) < 2:  # noqa: PLR2004
+            return None
+
+        if random.random() >= self._shadow_rate:
+            return None
+
+        return random.choice(services[1:])
+
+    def stats(self) -> dict[APIService, ServiceStats]:
+        """Snapshot of the statistics of each service"""
+        return {
+            service: ServiceStats(
+                latency=stats.latency,
+                error_rate=stats.error_rate,
+                calls=stats.calls,
+            )
+            for service, stats in self._stats.items()
+        }
+
+    def _get_stats(self, service: APIService) -> ServiceStats:
+        return self._stats.setdefault(service, ServiceStats())
+
+    def _get_score(self, service: APIService) -> float:
+        stats: ServiceStats | None = self._stats.get(service)
+        if stats is None:
+            return 0.0
+
+        return stats.score
+
+    def _ewma(self, current: float, value: float) -> float:
+        return self._alpha * value + (1 - self._alpha) * current
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'alpha={self._alpha}, shadow_rate={self._shadow_rate})'
+        )
@@ -1,17 +1,275 @@
+import asyncio
+import weakref
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import httpx
+
+from .. import _cache_hits, _deadline, _json
+from .._batching import _QuoteBatcher
 from .._enums import CoinSymbols, QuoteSymbols
 from ..abc import APIService
+from ..cache import (
+    CoinQuotesCodec,
+    JSONCodec,
+    LocalCache,
+    _check_cache_codec,
+    _dump_cached_error,
+    _get_cache_key_for_error,
+    _get_cache_key_for_get_coin_quotes_method_params,
+    _get_or_set_coin_quotes_cache,
+    _get_or_set_coin_quotes_pairs_cache,
+    _is_unsupported_error,
+    _load_cached_error,
+)
+from ..exeptions import DeadlineExceeded as DeadlineExceededException
+from ..exeptions import GetCoinQuotes as GetCoinQuotesException
+from ..exeptions import RateLimitExceeded as RateLimitExceededException
+from ..rate_limit import RateLimiter
 from ..response_models import CoinQuotes
+from ..retry import RetryPolicy, _parse_retry_after, _RetryBudget
+
+if TYPE_CHECKING:
+    from ..cache import Cache
+
+DEFAULT_HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+DEFAULT_HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# Errors caused by the caller (deadline) or by the client itself (rate-
+# limiter), not by the request
+_NOT_CACHED_ERRORS = (DeadlineExceededException, RateLimitExceededException)
+
+
+class _SendRequestError(GetCoinQuotesException):
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
 
 
 class BaseAPIService(APIService):
-    """Base class for api services."""
+    """
+    Base class for api services.
+
+    Each service owns a long-lived ``httpx.AsyncClient`` (one per event-
+    loop) so that connections are kept alive and reused between calls.
+    Close it with ``await service.aclose()`` or use the service as an-
+    async context manager:
+
+    >>> async with CoinGeckoService(api_key='<api-key>') as service:
+    ...     await service.get_coin_quotes(...)
+    """
+
+    _base_url: str = ''
+    _ping_url: str | None = None
+    _max_coins_per_request: int = 100
+
+    def __init__(  # noqa: PLR0913
+        self,
+        cache: 'Cache | None' = None,
+        cache_ttl: int = 300,
+        *,
+        cache_codec: CoinQuotesCodec | None = None,
+        local_cache: LocalCache | None = None,
+        cache_per_pair: bool = False,
+        cache_stale_ttl: int | None = None,
+        cache_lease_ttl: int | None = None,
+        cache_unsupported_ttl: int | None = None,
+        cache_error_ttl: int | None = None,
+        batch_window: float | None = None,
+        batch_max_size: int = 100,
+        max_coins_per_request: int | None = None,
+        max_concurrent_requests: int = 4,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        http2: bool = False,
+        http_limits: httpx.Limits | None = None,
+        http_timeout: httpx.Timeout | float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        keep_raw_data: bool | None = None,
+    ) -> None:
+        """
+        :param cache: Cache the quotes for ``cache_ttl`` seconds.
+        :param cache_codec: Format of the cached quotes (JSON by default,-
+            see ``anycoin.cache.BinaryCodec``).
+        :param local_cache: In-process cache of the decoded quotes in-
+            front of ``cache`` (see ``anycoin.cache.LocalCache``). Like-
+            with ``cache_stale_ttl``, the entries of ``cache`` then carry-
+            their expiry time, which the versions of anycoin without-
+            these options do not read.
+        :param cache_per_pair: Cache each (coin, quote) pair on its own-
+            and fetch only the missing pairs, so that cached pairs are-
+            reused whatever the coins requested with them. The results-
+            have no ``raw_data``, so it can not be combined with-
+            ``keep_raw_data``, ``cache_codec``, ``cache_stale_ttl`` or-
+            ``cache_lease_ttl``.
+        :param cache_stale_ttl: Keep serving the cached quotes up to this-
+            many seconds after ``cache_ttl`` while a single background-
+            task refreshes them (stale-while-revalidate), so that only-
+            the entries expired for longer block the callers.
+        :param cache_lease_ttl: Deduplicate the upstream calls of the-
+            processes sharing ``cache``: one takes a lease in the cache-
+            (for at most this many seconds) and fetches, the others wait-
+            for its result. Requires a shared cache (Redis, Memcached).
+        :param cache_unsupported_ttl: Cache the requests failed because-
+            of an unsupported coin or quote for this many seconds.
+        :param cache_error_ttl: Cache the requests failed because of an-
+            API error (after the retries) for this many seconds, so that-
+            a failing request is not sent again and again.
+        :param batch_window: Merge the upstream calls made within this-
+            many seconds (e.g. 0.005) into a single call with up to-
+            ``batch_max_size`` coins (disabled by default).
+        :param max_coins_per_request: Split larger requests into chunks-
+            (defaults to a limit suited to the API).
+        :param max_concurrent_requests: Chunks fetched concurrently.
+        :param retry_policy: Retry transient upstream errors (disabled by-
+            default).
+        :param rate_limiter: Queue requests locally to respect the API-
+            plan limits (disabled by default).
+        :param http2: Enable HTTP/2 multiplexing (requires the ``h2``-
+            package, see the ``anycoin[http2]`` extra).
+        :param http_limits: Connection pool limits and keep-alive expiry.
+        :param http_timeout: Timeout used for every upstream request.
+        :param transport: Custom transport, e.g. ``httpx.MockTransport``-
+            to point the pool at a local stand-in.
+        :param keep_raw_data: Keep the raw API response in the results-
+            (``CoinQuotes.raw_data``). Disable it to shrink the cached-
+            entries and the memory held per result when only the quotes-
+            are used. Can be overridden per call. Enabled by default,-
+            unless ``cache_per_pair`` is.
+        """
+        if cache_per_pair:
+            incompatible: list[str] = [
+                name
+                for name, value in (
+                    ('cache_codec', cache_codec),
+                    ('cache_stale_ttl', cache_stale_ttl),
+                    ('cache_lease_ttl', cache_lease_ttl),
+                )
+                if value is not None
+            ]
+            if keep_raw_data:
+                incompatible.append('keep_raw_data')
+            if incompatible:
+                raise ValueError(
+                    f'cache_per_pair can not be combined with '
+                    f'{", ".join(incompatible)}'
+                )
+
+        self._cache = cache
+        self._cache_ttl = cache_ttl
+        self._cache_codec = cache_codec or JSONCodec()
+        if cache is not None:
+            _check_cache_codec(cache, self._cache_codec)
+        if local_cache is not None and cache is None:
+            raise ValueError('local_cache requires a cache')
+        self._local_cache = local_cache
+        self._cache_per_pair = cache_per_pair
+        self._cache_stale_ttl = cache_stale_ttl
+        self._cache_lease_ttl = cache_lease_ttl
+        self._cache_unsupported_ttl = cache_unsupported_ttl
+        self._cache_error_ttl = cache_error_ttl
+
+        self._batch_window = batch_window
+        self._batch_max_size = batch_max_size
+        self._batchers: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, _QuoteBatcher
+        ] = weakref.WeakKeyDictionary()
+
+        if max_coins_per_request is not None:
+            self._max_coins_per_request = max_coins_per_request
+        self._max_concurrent_requests = max_concurrent_requests
+
+        self._retry_policy = retry_policy
+        self._retry_budget: _RetryBudget | None = None
+        if retry_policy is not None:
+            self._retry_budget = _RetryBudget(
+                ratio=retry_policy.budget_ratio,
+                max_tokens=retry_policy.budget_max_tokens,
+            )
+
+        self._rate_limiter = rate_limiter
+        self._http2 = http2
+        self._http_limits = http_limits or DEFAULT_HTTP_LIMITS
+        self._http_timeout = (
+            DEFAULT_HTTP_TIMEOUT if http_timeout is None else http_timeout
+        )
+        self._transport = transport
+        self._keep_raw_data = (
+            not cache_per_pair if keep_raw_data is None else keep_raw_data
+        )
+        self._http_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
 
     async def get_coin_quotes(
         self,
         coins: list[CoinSymbols],
-        quotes_in: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+        *,
+        keep_raw_data: bool | None = None,
     ) -> CoinQuotes:
-        """..."""
+        """
+        :param keep_raw_data: Overrides the ``keep_raw_data`` option of-
+            the service for this call.
+        """
+        if keep_raw_data is None:
+            keep_raw_data = self._keep_raw_data
+        elif keep_raw_data and self._cache_per_pair:
+            raise ValueError('cache_per_pair results have no raw_data')
+
+        async def fetch_coin_quotes() -> CoinQuotes:
+            coin_quotes: CoinQuotes = await self._fetch_coin_quotes_or_error(
+                coins=coins, quotes_in=quotes_in
+            )
+            if not keep_raw_data:
+                coin_quotes = coin_quotes.model_copy(update={'raw_data': None})
+            return coin_quotes
+
+        if self._cache is None:
+            coin_quotes: CoinQuotes = await fetch_coin_quotes()
+        elif self._cache_per_pair:
+            coin_quotes: CoinQuotes = (
+                await _get_or_set_coin_quotes_pairs_cache(
+                    cache=self._cache,
+                    coins=coins,
+                    quotes_in=quotes_in,
+                    coro_func=lambda coins, quotes_in: (
+                        self._fetch_coin_quotes_or_error(
+                            coins=coins, quotes_in=quotes_in
+                        )
+                    ),
+                    ttl=self._cache_ttl,
+                    local_cache=self._local_cache,
+                    owner=self.__class__.__name__,
+                )
+            )
+        else:
+            cache_key: str = _get_cache_key_for_get_coin_quotes_method_params(
+                coins=coins, quotes_in=quotes_in, keep_raw_data=keep_raw_data
+            )
+            coin_quotes: CoinQuotes = await _get_or_set_coin_quotes_cache(
+                cache=self._cache,
+                key=cache_key,
+                coro_func=fetch_coin_quotes,
+                ttl=self._cache_ttl,
+                codec=self._cache_codec,
+                local_cache=self._local_cache,
+                stale_ttl=self._cache_stale_ttl,
+                lease_ttl=self._cache_lease_ttl,
+                owner=self.__class__.__name__,
+            )
+
+        return coin_quotes
 
     @staticmethod
     async def get_coin_id_by_symbol(coin_symbol: CoinSymbols) -> str:
@@ -33,6 +291,377 @@ class BaseAPIService(APIService):
     ) -> QuoteSymbols:
         """..."""
 
+    async def _fetch_coin_quotes_or_error(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        """
+        ``_fetch_coin_quotes`` with negative caching: its errors are cached-
+        and raised again, without calling the API, until they expire
+        """
+        if self._cache is None or (
+            self._cache_unsupported_ttl is None
+            and self._cache_error_ttl is None
+        ):
+            return await self._fetch_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+
+        error_key: str = _get_cache_key_for_error(
+            self.__class__.__name__,
+            _get_cache_key_for_get_coin_quotes_method_params(
+                coins=coins, quotes_in=quotes_in
+            ),
+        )
+        cached_error = await self._cache.get(error_key)
+        if cached_error is not None:
+            _cache_hits.record_cache_hit()
+            raise _load_cached_error(cached_error)
+
+        try:
+            return await self._fetch_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+        except _NOT_CACHED_ERRORS:
+            raise
+        except GetCoinQuotesException as expt:
+            if _deadline.is_expired():
+                # May be caused by the deadline of the caller (e.g. cut-
+                # requests), a caller without it could succeed
+                raise
+
+            ttl: int | None = (
+                self._cache_unsupported_ttl
+                if _is_unsupported_error(expt)
+                else self._cache_error_ttl
+            )
+            if ttl is not None:
+                await self._cache.set(
+                    error_key, _dump_cached_error(expt), ttl=ttl
+                )
+            raise
+
+    async def _fetch_coin_quotes(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        """Get the quotes from the API, batched if enabled"""
+        if self._batch_window is None:
+            return await self._get_coin_quotes(
+                coins=coins, quotes_in=quotes_in
+            )
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        batcher: _QuoteBatcher | None = self._batchers.get(loop)
+        if batcher is None:
+            batcher = _QuoteBatcher(
+                fetch=lambda coins, quotes_in: self._get_coin_quotes(
+                    coins=coins, quotes_in=quotes_in
+                ),
+                window=self._batch_window,
+                max_size=self._batch_max_size,
+                slice_raw_data=self._slice_raw_data,
+            )
+            self._batchers[loop] = batcher
+
+        return await batcher.get_coin_quotes(coins=coins, quotes_in=quotes_in)
+
+    async def _get_coin_quotes(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        """
+        Get the quotes from the API
+
+        Large coin lists are split into chunks of ``max_coins_per_request``-
+        fetched concurrently (at most ``max_concurrent_requests`` at a-
+        time) and merged into a single result.
+        """
+        chunk_size: int = self._max_coins_per_request
+        if len(coins) <= chunk_size:
+            return await self._get_coin_quotes_chunk(
+                coins=coins, quotes_in=quotes_in
+            )
+
+        semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+
+        async def get_chunk(chunk: list[CoinSymbols]) -> CoinQuotes:
+            async with semaphore:
+                return await self._get_coin_quotes_chunk(
+                    coins=chunk, quotes_in=quotes_in
+                )
+
+        results: list[CoinQuotes] = await asyncio.gather(
+            *(
+                get_chunk(coins[index : index + chunk_size])
+                for index in range(0, len(coins), chunk_size)
+            )
+        )
+
+        return CoinQuotes(
+            coins={
+                coin: coin_row
+                for result in results
+                for coin, coin_row in result.coins.items()
+            },
+            api_service=results[0].api_service,
+            raw_data=self._merge_raw_data([
+                result.raw_data for result in results
+            ]),
+        )
+
+    async def _get_coin_quotes_chunk(
+        self,
+        coins: list[CoinSymbols],
+        quotes_in: list[QuoteSymbols],
+    ) -> CoinQuotes:
+        """
+        Get the quotes with a single request, implemented by the services-
+        that do not override ``get_coin_quotes``
+        """
+        raise NotImplementedError(
+            f'{self.__class__.__name__} does not implement '
+            '_get_coin_quotes_chunk'
+        )
+
+    @staticmethod
+    def _merge_raw_data(raw_data_list: list[dict]) -> dict:
+        """Merge the raw responses of the chunks of a request"""
+        merged: dict = {}
+        for raw_data in raw_data_list:
+            merged.update(raw_data)
+        return merged
+
+    def _slice_raw_data(  # noqa: PLR6301
+        self, raw_data: dict, coins: list[CoinSymbols]
+    ) -> dict | None:
+        """
+        Part of the raw response of a batch about ``coins``, None when the-
+        service can not cut it
+        """
+        return None
+
+    async def _send_request(
+        self,
+        path: str,
+        method: str,
+        params: dict | None = None,
+        credits: int = 1,
+        base_url: str | None = None,
+    ) -> dict:
+        """
+        ``credits`` is the expected cost of the request in API credits,-
+        used by the rate limiter. ``base_url`` replaces the base url of-
+        the service (e.g. for endpoints of another API version).
+        """
+        if not path.startswith('/'):
+            path = '/' + path  # Add leading slash to path
+
+        if self._retry_budget is not None:
+            self._retry_budget.deposit()
+
+        attempt = 0
+        while True:
+            try:
+                return await self._send_request_attempt(
+                    path=path,
+                    method=method,
+                    params=params,
+                    credits=credits,
+                    base_url=base_url,
+                )
+            except _SendRequestError as expt:
+                delay: float | None = self._get_retry_delay(attempt, expt)
+                if delay is None:
+                    raise
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send_request_attempt(
+        self,
+        path: str,
+        method: str,
+        params: dict | None = None,
+        credits: int = 1,
+        base_url: str | None = None,
+    ) -> dict:
+        if _deadline.is_expired():
+            raise DeadlineExceededException('Deadline exceeded')
+
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire(
+                credits, max_wait=_deadline.get_remaining()
+            )
+
+        client: httpx.AsyncClient = self._get_http_client()
+        try:
+            response = await client.request(
+                method=method,
+                url=f'{base_url or self._base_url}{path}',
+                params=params,
+                headers=self._get_headers(),
+                timeout=self._get_request_timeout(),
+            )
+        except httpx.TimeoutException as expt:
+            if _deadline.is_expired():
+                # The timeout was cut to the deadline of the caller, the-
+                # service did not fail
+                raise DeadlineExceededException('Deadline exceeded') from expt
+            raise _SendRequestError('Error retrieving coin quotes') from expt
+        except httpx.RequestError as expt:
+            raise _SendRequestError('Error retrieving coin quotes') from expt
+
+        status_code: int = response.status_code
+        retry_after: float | None = _parse_retry_after(
+            response.headers.get('Retry-After')
+        )
+        try:
+            json_data = _json.loads(response.content)
+        except ValueError as expt:
+            if self._rate_limiter is not None:
+                self._record_rate_limit(response, None, credits, retry_after)
+            raise _SendRequestError(
+                'Error retrieving coin quotes',
+                status_code=status_code,
+                retry_after=retry_after,
+            ) from expt
+
+        if self._rate_limiter is not None:
+            self._record_rate_limit(response, json_data, credits, retry_after)
+
+        if self._is_success_response(response, json_data):
+            return json_data
+
+        raise _SendRequestError(
+            f'Error retrieving coin quotes. API response: {json_data}',
+            status_code=status_code,
+            retry_after=retry_after,
+        )
+
+    def _get_retry_delay(
+        self, attempt: int, error: _SendRequestError
+    ) -> float | None:
+        if self._retry_policy is None:
+            return None
+
+        if not self._retry_policy.is_retryable(error.status_code):
+            return None
+
+        delay: float | None = self._retry_policy.get_delay(
+            attempt, retry_after=error.retry_after
+        )
+        if delay is None:
+            return None
+
+        remaining: float | None = _deadline.get_remaining()
+        if remaining is not None and delay >= remaining:
+            return None  # The retry would not fit in the deadline
+
+        if not self._retry_budget.withdraw():
+            return None
+
+        return delay
+
+    def _get_request_timeout(self) -> httpx.Timeout:
+        """Request timeout bounded by the remaining deadline, if any"""
+        timeout = httpx.Timeout(self._http_timeout)
+
+        remaining: float | None = _deadline.get_remaining()
+        if remaining is None:
+            return timeout
+
+        def bound(value: float | None) -> float:
+            return remaining if value is None else min(value, remaining)
+
+        return httpx.Timeout(
+            connect=bound(timeout.connect),
+            read=bound(timeout.read),
+            write=bound(timeout.write),
+            pool=bound(timeout.pool),
+        )
+
+    async def ping(self) -> None:
+        if self._ping_url is None:
+            return await super().ping()
+
+        client: httpx.AsyncClient = self._get_http_client()
+        try:
+            response = await client.get(
+                self._ping_url, headers=self._get_headers()
+            )
+        except httpx.RequestError as expt:
+            raise GetCoinQuotesException('Service is unreachable') from expt
+
+        if response.status_code != HTTPStatus.OK:
+            raise GetCoinQuotesException(
+                f'Service is unavailable. API response status: '
+                f'{response.status_code}'
+            )
+
+    def _record_rate_limit(
+        self,
+        response: httpx.Response,
+        json_data,
+        credits: int,
+        retry_after: float | None,
+    ) -> None:
+        """Feed the rate limiter with the outcome of a request"""
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            self._rate_limiter.record_rate_limited(retry_after)
+        elif response.status_code == HTTPStatus.OK:
+            self._rate_limiter.record_success()
+
+    def _get_headers(self) -> dict[str, str]:  # noqa: PLR6301
+        return {}
+
+    @staticmethod
+    def _is_success_response(response: httpx.Response, json_data) -> bool:
+        return response.status_code == HTTPStatus.OK
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Returns the pooled client of the running event loop
+
+        Connections can not be shared between event loops, so a client is-
+        created lazily for each loop that uses the service.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        client: httpx.AsyncClient | None = self._http_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self._http2,
+                limits=self._http_limits,
+                timeout=self._http_timeout,
+                transport=self._transport,
+            )
+            self._http_clients[loop] = client
+
+        return client
+
+    async def aclose(self) -> None:
+        """
+        Close the connection pool of the running event loop
+
+        Clients of other loops can not be closed from here, they are kept-
+        for an ``aclose`` in their own loop (or released with the loop).
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        client: httpx.AsyncClient | None = self._http_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
     def __str__(self):
         return repr(self)
 
@@ -1,16 +1,10 @@
-import json
-from http import HTTPStatus
+from typing import TYPE_CHECKING
 
 import httpx
 
 from .._enums import CoinSymbols, QuoteSymbols
-from .._mapped_ids import get_cgk_coin_ids as _get_cgk_coin_ids
-from .._mapped_ids import get_cgk_quotes_ids as _get_cgk_quotes_ids
-from ..cache import (
-    Cache,
-    _get_cache_key_for_get_coin_quotes_method_params,
-    _get_or_set_coin_quotes_cache,
-)
+from .._mapped_ids import CGK_COIN_IDS, CGK_QUOTE_IDS, IdMap
+from ..cache import CoinQuotesCodec, LocalCache
 from ..exeptions import (
     CoinNotSupportedCGK as CoinNotSupportedCGKException,
 )
@@ -18,110 +12,103 @@ from ..exeptions import GetCoinQuotes as GetCoinQuotesException
 from ..exeptions import (
     QuoteCoinNotSupportedCGK as QuoteCoinNotSupportedCGKException,
 )
+from ..rate_limit import RateLimiter
 from ..response_models import CoinQuotes
+from ..retry import RetryPolicy
 from .base import BaseAPIService
 
+if TYPE_CHECKING:
+    from ..cache import Cache
+
 
 class CoinGeckoService(BaseAPIService):
-    def __init__(
+    _base_url = 'https://pro-api.coingecko.com/api/v3'
+    _ping_url = 'https://pro-api.coingecko.com/api/v3/ping'
+    # Keeps the query string of /simple/price well below URL length limits
+    _max_coins_per_request = 200
+    # Symbol <-> id maps, synchronous lookups (e.g. coin_ids.ids_for)
+    coin_ids: IdMap = CGK_COIN_IDS
+    quote_ids: IdMap = CGK_QUOTE_IDS
+
+    def __init__(  # noqa: PLR0913
         self,
         api_key: str,
-        cache: Cache | None = None,
+        cache: 'Cache | None' = None,
         cache_ttl: int = 300,
+        *,
+        cache_codec: CoinQuotesCodec | None = None,
+        local_cache: LocalCache | None = None,
+        cache_per_pair: bool = False,
+        cache_stale_ttl: int | None = None,
+        cache_lease_ttl: int | None = None,
+        cache_unsupported_ttl: int | None = None,
+        cache_error_ttl: int | None = None,
+        batch_window: float | None = None,
+        batch_max_size: int = 100,
+        max_coins_per_request: int | None = None,
+        max_concurrent_requests: int = 4,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        http2: bool = False,
+        http_limits: httpx.Limits | None = None,
+        http_timeout: httpx.Timeout | float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        keep_raw_data: bool | None = None,
     ) -> None:
+        super().__init__(
+            cache=cache,
+            cache_ttl=cache_ttl,
+            cache_codec=cache_codec,
+            local_cache=local_cache,
+            cache_per_pair=cache_per_pair,
+            cache_stale_ttl=cache_stale_ttl,
+            cache_lease_ttl=cache_lease_ttl,
+            cache_unsupported_ttl=cache_unsupported_ttl,
+            cache_error_ttl=cache_error_ttl,
+            batch_window=batch_window,
+            batch_max_size=batch_max_size,
+            max_coins_per_request=max_coins_per_request,
+            max_concurrent_requests=max_concurrent_requests,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            http2=http2,
+            http_limits=http_limits,
+            http_timeout=http_timeout,
+            transport=transport,
+            keep_raw_data=keep_raw_data,
+        )
         self._api_key = api_key
-        self._cache = cache
-        self._cache_ttl = cache_ttl
 
-    async def get_coin_quotes(
-        self,
-        coins: list[CoinSymbols],
-        quotes_in: list[QuoteSymbols],
-    ) -> CoinQuotes:
-        if self._cache is None:
-            coin_quotes: CoinQuotes = await self._get_coin_quotes(
-                coins=coins, quotes_in=quotes_in
-            )
-        else:
-            cache_key: str = _get_cache_key_for_get_coin_quotes_method_params(
-                coins=coins, quotes_in=quotes_in
-            )
-            coin_quotes: CoinQuotes = await _get_or_set_coin_quotes_cache(
-                cache=self._cache,
-                key=cache_key,
-                coro_func=lambda: self._get_coin_quotes(
-                    coins=coins, quotes_in=quotes_in
-                ),
-                ttl=self._cache_ttl,
-            )
-
-        return coin_quotes
-
-    @staticmethod
-    async def get_coin_id_by_symbol(coin_symbol: CoinSymbols) -> str:
-        coin_ids = await _get_cgk_coin_ids()
-        try:
-            return coin_ids[coin_symbol.value]
-        except KeyError:
-            raise CoinNotSupportedCGKException(
-                f'Coin {coin_symbol} not supported'
-            ) from None
-
-    @staticmethod
-    async def get_coin_symbol_by_id(coin_id: str) -> CoinSymbols:
-        coin_ids = await _get_cgk_coin_ids()
-        coins = list(filter(lambda item: item[1] == coin_id, coin_ids.items()))
-        if not coins:
-            raise CoinNotSupportedCGKException(
-                f'Coin with id {coin_id} not supported'
-            )
-
-        coin_symbol_str = coins[0][0]
-        return CoinSymbols(coin_symbol_str)
-
-    @staticmethod
+    @classmethod
+    async def get_coin_id_by_symbol(cls, coin_symbol: CoinSymbols) -> str:
+        return cls.coin_ids.id_for(coin_symbol)
+
+    @classmethod
+    async def get_coin_symbol_by_id(cls, coin_id: str) -> CoinSymbols:
+        return cls.coin_ids.symbol_for(coin_id)
+
+    @classmethod
     async def get_quote_id_by_symbol(
+        cls,
         quote_symbol: QuoteSymbols,
     ) -> str:
-        quote_ids = await _get_cgk_quotes_ids()
-        try:
-            return quote_ids[quote_symbol.value]
-        except KeyError:
-            raise QuoteCoinNotSupportedCGKException(
-                f'Quote {quote_symbol} not supported'
-            ) from None
+        return cls.quote_ids.id_for(quote_symbol)
 
-    @staticmethod
+    @classmethod
     async def get_quote_symbol_by_id(
+        cls,
         quote_id: str,
     ) -> QuoteSymbols:
-        quote_ids = await _get_cgk_quotes_ids()
-        coins = list(
-            filter(
-                lambda item: item[1] == quote_id,
-                quote_ids.items(),
-            )
-        )
-        if not coins:
-            raise QuoteCoinNotSupportedCGKException(
-                f'Quote with id {quote_id} not supported'
-            )
+        return cls.quote_ids.symbol_for(quote_id)
 
-        coin_symbol_str = coins[0][0]
-        return QuoteSymbols(coin_symbol_str)
-
-    async def _get_coin_quotes(
+    async def _get_coin_quotes_chunk(
         self,
         coins: list[CoinSymbols],
         quotes_in: list[QuoteSymbols],
     ) -> CoinQuotes:
         try:
-            coin_ids: list[str] = [
-                await self.get_coin_id_by_symbol(coin) for coin in coins
-            ]
-            convert_ids: list[str] = [
-                await self.get_quote_id_by_symbol(quote) for quote in quotes_in
-            ]
+            coin_ids: list[str] = self.coin_ids.ids_for(coins)
+            convert_ids: list[str] = self.quote_ids.ids_for(quotes_in)
         except CoinNotSupportedCGKException as expt:
             raise GetCoinQuotesException(str(expt)) from expt
 
@@ -139,44 +126,42 @@ class CoinGeckoService(BaseAPIService):
         )
         return await CoinQuotes.from_cgk_raw_data(raw_data=raw_data)
 
-    async def _send_request(
-        self,
-        path: str,
-        method: str,
-        params: dict | None = None,
-    ) -> dict:
-        if not path.startswith('/'):
-            path = '/' + path  # Add leading slash to path
-
-        headers = {
+    async def get_coins_map(self) -> list[dict]:
+        """Every coin listed by CoinGecko, see ``AssetRegistry``"""
+        json_data: list[dict] = await self._send_request(
+            path='/coins/list', method='get'
+        )
+        return [
+            {
+                'id': coin['id'],
+                'symbol': coin['symbol'].lower(),
+                'name': coin['name'],
+                'slug': coin['id'],
+                'rank': None,
+            }
+            for coin in json_data
+        ]
+
+    def _slice_raw_data(
+        self, raw_data: dict, coins: list[CoinSymbols]
+    ) -> dict | None:
+        ids_by_symbol: dict[str, str] = self.coin_ids.ids_by_symbol
+        coin_ids: list[str] = [
+            ids_by_symbol[coin.value]
+            for coin in coins
+            if coin.value in ids_by_symbol
+        ]
+        return {
+            coin_id: raw_data[coin_id]
+            for coin_id in coin_ids
+            if coin_id in raw_data
+        }
+
+    def _get_headers(self) -> dict[str, str]:
+        return {
             'accept': 'application/json',
             'x-cg-pro-api-key': self._api_key,
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=(f'https://pro-api.coingecko.com/api/v3{path}'),
-                    params=params,
-                    headers=headers,
-                )
-                json_data = response.json()
-
-                if response.status_code == HTTPStatus.OK:  # Success
-                    return json_data
-
-                raise GetCoinQuotesException(
-                    f'Error retrieving coin quotes. API response: {json_data}'
-                )
-            except httpx.RequestError as expt:
-                raise GetCoinQuotesException(
-                    'Error retrieving coin quotes'
-                ) from expt
-            except json.JSONDecodeError as expt:
-                raise GetCoinQuotesException(
-                    'Error retrieving coin quotes'
-                ) from expt
-
     def __repr__(self):
         return f"{self.__class__.__name__}(api_key='***')"
@@ -1,16 +1,13 @@
-import json
+import math
+from datetime import datetime, timedelta, timezone
 from http import HTTPStatus
+from typing import TYPE_CHECKING
 
 import httpx
 
 from .._enums import CoinSymbols, QuoteSymbols
-from .._mapped_ids import get_cmc_coins_ids as _get_cmc_coins_ids
-from .._mapped_ids import get_cmc_quotes_ids as _get_cmc_quotes_ids
-from ..cache import (
-    Cache,
-    _get_cache_key_for_get_coin_quotes_method_params,
-    _get_or_set_coin_quotes_cache,
-)
+from .._mapped_ids import CMC_COIN_IDS, CMC_QUOTE_IDS, IdMap
+from ..cache import CoinQuotesCodec, LocalCache
 from ..exeptions import (
     CoinNotSupportedCMC as CoinNotSupportedCMCException,
 )
@@ -18,110 +15,116 @@ from ..exeptions import GetCoinQuotes as GetCoinQuotesException
 from ..exeptions import (
     QuoteCoinNotSupportedCMC as QuoteCoinNotSupportedCMCException,
 )
+from ..rate_limit import RateLimiter
 from ..response_models import CoinQuotes
+from ..retry import RetryPolicy
 from .base import BaseAPIService
 
+if TYPE_CHECKING:
+    from ..cache import Cache
+
+# https://coinmarketcap.com/api/documentation/v1/#section/Errors-and-Rate-Limits
+CMC_MINUTE_RATE_LIMIT_ERROR_CODE = 1008
+CMC_DAILY_RATE_LIMIT_ERROR_CODE = 1009
+CMC_MONTHLY_RATE_LIMIT_ERROR_CODE = 1010
+CMC_IP_RATE_LIMIT_ERROR_CODE = 1011
+CMC_RATE_LIMIT_ERROR_CODES = {
+    CMC_MINUTE_RATE_LIMIT_ERROR_CODE,
+    CMC_DAILY_RATE_LIMIT_ERROR_CODE,
+    CMC_MONTHLY_RATE_LIMIT_ERROR_CODE,
+    CMC_IP_RATE_LIMIT_ERROR_CODE,
+}
+
 
 class CoinMarketCapService(BaseAPIService):
-    def __init__(
+    _base_url = 'https://pro-api.coinmarketcap.com/v2'
+    _ping_url = 'https://pro-api.coinmarketcap.com/v1/key/info'
+    _map_base_url = 'https://pro-api.coinmarketcap.com/v1'
+    # Chunks on the credit boundary, 1 credit per 100 coins
+    _max_coins_per_request = 100
+    # Symbol <-> id maps, synchronous lookups (e.g. coin_ids.ids_for)
+    coin_ids: IdMap = CMC_COIN_IDS
+    quote_ids: IdMap = CMC_QUOTE_IDS
+
+    def __init__(  # noqa: PLR0913
         self,
         api_key: str,
-        cache: Cache | None = None,
+        cache: 'Cache | None' = None,
         cache_ttl: int = 300,
+        *,
+        cache_codec: CoinQuotesCodec | None = None,
+        local_cache: LocalCache | None = None,
+        cache_per_pair: bool = False,
+        cache_stale_ttl: int | None = None,
+        cache_lease_ttl: int | None = None,
+        cache_unsupported_ttl: int | None = None,
+        cache_error_ttl: int | None = None,
+        batch_window: float | None = None,
+        batch_max_size: int = 100,
+        max_coins_per_request: int | None = None,
+        max_concurrent_requests: int = 4,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        http2: bool = False,
+        http_limits: httpx.Limits | None = None,
+        http_timeout: httpx.Timeout | float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        keep_raw_data: bool | None = None,
     ) -> None:
+        super().__init__(
+            cache=cache,
+            cache_ttl=cache_ttl,
+            cache_codec=cache_codec,
+            local_cache=local_cache,
+            cache_per_pair=cache_per_pair,
+            cache_stale_ttl=cache_stale_ttl,
+            cache_lease_ttl=cache_lease_ttl,
+            cache_unsupported_ttl=cache_unsupported_ttl,
+            cache_error_ttl=cache_error_ttl,
+            batch_window=batch_window,
+            batch_max_size=batch_max_size,
+            max_coins_per_request=max_coins_per_request,
+            max_concurrent_requests=max_concurrent_requests,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            http2=http2,
+            http_limits=http_limits,
+            http_timeout=http_timeout,
+            transport=transport,
+            keep_raw_data=keep_raw_data,
+        )
         self._api_key = api_key
-        self._cache = cache
-        self._cache_ttl = cache_ttl
 
-    async def get_coin_quotes(
-        self,
-        coins: list[CoinSymbols],
-        quotes_in: list[QuoteSymbols],
-    ) -> CoinQuotes:
-        if self._cache is None:
-            coin_quotes: CoinQuotes = await self._get_coin_quotes(
-                coins=coins, quotes_in=quotes_in
-            )
-        else:
-            cache_key: str = _get_cache_key_for_get_coin_quotes_method_params(
-                coins=coins, quotes_in=quotes_in
-            )
-            coin_quotes: CoinQuotes = await _get_or_set_coin_quotes_cache(
-                cache=self._cache,
-                key=cache_key,
-                coro_func=lambda: self._get_coin_quotes(
-                    coins=coins, quotes_in=quotes_in
-                ),
-                ttl=self._cache_ttl,
-            )
+    @classmethod
+    async def get_coin_id_by_symbol(cls, coin_symbol: CoinSymbols) -> str:
+        return cls.coin_ids.id_for(coin_symbol)
 
-        return coin_quotes
+    @classmethod
+    async def get_coin_symbol_by_id(cls, coin_id: str) -> CoinSymbols:
+        return cls.coin_ids.symbol_for(coin_id)
 
-    @staticmethod
-    async def get_coin_id_by_symbol(coin_symbol: CoinSymbols) -> str:
-        coin_ids = await _get_cmc_coins_ids()
-        try:
-            return coin_ids[coin_symbol.value]
-        except KeyError:
-            raise CoinNotSupportedCMCException(
-                f'Coin {coin_symbol} not supported'
-            ) from None
-
-    @staticmethod
-    async def get_coin_symbol_by_id(coin_id: str) -> CoinSymbols:
-        coin_ids = await _get_cmc_coins_ids()
-        coins = list(filter(lambda item: item[1] == coin_id, coin_ids.items()))
-        if not coins:
-            raise CoinNotSupportedCMCException(
-                f'Coin with id {coin_id} not supported'
-            )
-
-        coin_symbol_str = coins[0][0]
-        return CoinSymbols(coin_symbol_str)
-
-    @staticmethod
+    @classmethod
     async def get_quote_id_by_symbol(
+        cls,
         quote_symbol: QuoteSymbols,
     ) -> str:
-        quote_ids = await _get_cmc_quotes_ids()
-        try:
-            return quote_ids[quote_symbol.value]
-        except KeyError:
-            raise QuoteCoinNotSupportedCMCException(
-                f'Quote {quote_symbol} not supported'
-            ) from None
+        return cls.quote_ids.id_for(quote_symbol)
 
-    @staticmethod
+    @classmethod
     async def get_quote_symbol_by_id(
+        cls,
         quote_id: str,
     ) -> QuoteSymbols:
-        quote_ids = await _get_cmc_quotes_ids()
-        coins = list(
-            filter(
-                lambda item: item[1] == quote_id,
-                quote_ids.items(),
-            )
-        )
-        if not coins:
-            raise QuoteCoinNotSupportedCMCException(
-                f'Quote with id {quote_id} not supported'
-            )
+        return cls.quote_ids.symbol_for(quote_id)
 
-        coin_symbol_str = coins[0][0]
-        return QuoteSymbols(coin_symbol_str)
-
-    async def _get_coin_quotes(
+    async def _get_coin_quotes_chunk(
         self,
         coins: list[CoinSymbols],
         quotes_in: list[QuoteSymbols],
     ) -> CoinQuotes:
         try:
-            coin_ids: list[str] = [
-                await self.get_coin_id_by_symbol(coin) for coin in coins
-            ]
-            convert_ids: list[str] = [
-                await self.get_quote_id_by_symbol(quote) for quote in quotes_in
-            ]
+            coin_ids: list[str] = self.coin_ids.ids_for(coins)
+            convert_ids: list[str] = self.quote_ids.ids_for(quotes_in)
         except CoinNotSupportedCMCException as expt:
             raise GetCoinQuotesException(str(expt)) from expt
 
@@ -134,52 +137,142 @@ class CoinMarketCapService(BaseAPIService):
         }
 
         raw_data = await self._send_request(
-            path='/cryptocurrency/quotes/latest', method='get', params=params
+            path='/cryptocurrency/quotes/latest',
+            method='get',
+            params=params,
+            credits=_get_quotes_latest_credits(
+                coins_count=len(coin_ids), converts_count=len(convert_ids)
+            ),
         )
         return await CoinQuotes.from_cmc_raw_data(raw_data=raw_data)
 
-    async def _send_request(
-        self,
-        path: str,
-        method: str,
-        params: dict | None = None,
-    ) -> dict:
-        if not path.startswith('/'):
-            path = '/' + path  # Add leading slash to path
-
-        headers = {
+    async def get_coins_map(self) -> list[dict]:
+        """Every coin listed by CoinMarketCap, see ``AssetRegistry``"""
+        json_data: dict = await self._send_request(
+            path='/cryptocurrency/map',
+            method='get',
+            params={'listing_status': 'active'},
+            base_url=self._map_base_url,
+        )
+        return [
+            {
+                'id': str(coin['id']),
+                'symbol': coin['symbol'].lower(),
+                'name': coin['name'],
+                'slug': coin['slug'],
+                'rank': coin.get('rank'),
+            }
+            for coin in json_data['data']
+        ]
+
+    def _get_headers(self) -> dict[str, str]:
+        return {
             'Accepts': 'application/json',
             'X-CMC_PRO_API_KEY': self._api_key,
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=(f'https://pro-api.coinmarketcap.com/v2{path}'),
-                    params=params,
-                    headers=headers,
-                )
-                json_data = response.json()
-
-                CMC_NO_ERROR_CODE = 0
-                if (
-                    response.status_code == HTTPStatus.OK
-                    and json_data['status']['error_code'] == CMC_NO_ERROR_CODE
-                ):  # Success
-                    return json_data
-
-                raise GetCoinQuotesException(
-                    f'Error retrieving coin quotes. API response: {json_data}'
-                )
-            except httpx.RequestError as expt:
-                raise GetCoinQuotesException(
-                    'Error retrieving coin quotes'
-                ) from expt
-            except json.JSONDecodeError as expt:
-                raise GetCoinQuotesException(
-                    'Error retrieving coin quotes'
-                ) from expt
+    @staticmethod
+    def _merge_raw_data(raw_data_list: list[dict]) -> dict:
+        status: dict = dict(raw_data_list[-1]['status'])
+        status['credit_count'] = sum(
+            raw_data['status'].get('credit_count', 0)
+            for raw_data in raw_data_list
+        )
+        return {
+            'data': {
+                coin_id: coin_data
+                for raw_data in raw_data_list
+                for coin_id, coin_data in raw_data['data'].items()
+            },
+            'status': status,
+        }
+
+    def _slice_raw_data(
+        self, raw_data: dict, coins: list[CoinSymbols]
+    ) -> dict | None:
+        ids_by_symbol: dict[str, str] = self.coin_ids.ids_by_symbol
+        coin_ids: list[str] = [
+            ids_by_symbol[coin.value]
+            for coin in coins
+            if coin.value in ids_by_symbol
+        ]
+        return {
+            'data': {
+                coin_id: raw_data['data'][coin_id]
+                for coin_id in coin_ids
+                if coin_id in raw_data['data']
+            },
+            'status': raw_data['status'],
+        }
+
+    @staticmethod
+    def _is_success_response(response: httpx.Response, json_data) -> bool:
+        CMC_NO_ERROR_CODE = 0
+        return (
+            response.status_code == HTTPStatus.OK
+            and json_data['status']['error_code'] == CMC_NO_ERROR_CODE
+        )
+
+    def _record_rate_limit(
+        self,
+        response: httpx.Response,
+        json_data,
+        credits: int,
+        retry_after: float | None,
+    ) -> None:
+        status = (
+            json_data.get('status') if isinstance(json_data, dict) else None
+        )
+        if not isinstance(status, dict):
+            return super()._record_rate_limit(
+                response, json_data, credits, retry_after
+            )
+
+        if status.get('error_code') in CMC_RATE_LIMIT_ERROR_CODES:
+            self._rate_limiter.record_rate_limited(
+                retry_after
+                if retry_after is not None
+                else _get_cmc_rate_limit_reset(status['error_code'])
+            )
+        else:
+            super()._record_rate_limit(
+                response, json_data, credits, retry_after
+            )
+
+        credit_count = status.get('credit_count')
+        if isinstance(credit_count, int):
+            self._rate_limiter.record_credits(
+                reserved=credits, used=credit_count
+            )
 
     def __repr__(self):
         return f"{self.__class__.__name__}(api_key='***')"
+
+
+def _get_quotes_latest_credits(coins_count: int, converts_count: int) -> int:
+    """
+    1 call credit per 100 cryptocurrencies returned (rounded up) and 1 call-
+    credit per convert option beyond the first.
+    """
+    return math.ceil(coins_count / 100) + max(0, converts_count - 1)
+
+
+def _get_cmc_rate_limit_reset(error_code: int) -> float | None:
+    """
+    Seconds until the limit behind a CMC rate limit error code resets,-
+    None for the per minute limits.
+    """
+    now: datetime = datetime.now(timezone.utc)
+
+    if error_code == CMC_DAILY_RATE_LIMIT_ERROR_CODE:
+        reset_at = (now + timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+    elif error_code == CMC_MONTHLY_RATE_LIMIT_ERROR_CODE:
+        reset_at = (now.replace(day=1) + timedelta(days=32)).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+    else:
+        return None
+
+    return (reset_at - now).total_seconds()
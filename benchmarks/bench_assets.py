@@ -0,0 +1,67 @@
+"""
+Benchmark of ``AssetId`` handles against the ``CoinSymbols`` enumeration
+
+Compares the lookup of a symbol by value and the indexing of a result,-
+and the memory of a universe of handles.
+
+    python benchmarks/bench_assets.py
+"""
+
+# ruff: noqa: T201
+
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.assets import AssetId
+from anycoin.response_models import CoinQuotes
+
+ROUNDS = 1_000_000
+UNIVERSE_SIZE = 50_000
+
+
+def bench(name: str, func) -> None:
+    started_at: float = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+
+    elapsed: float = (time.perf_counter() - started_at) / ROUNDS
+    print(f'{name:<32} {elapsed * 1e9:>8.1f} ns')
+
+
+def main() -> None:
+    result = CoinQuotes.model_validate({
+        'coins': {
+            coin: {'quotes': {QuoteSymbols.usd: {'quote': Decimal('1')}}}
+            for coin in CoinSymbols
+        },
+        'api_service': 'coingecko',
+    })
+    trx = AssetId('trx')
+
+    bench("CoinSymbols('trx')", lambda: CoinSymbols('trx'))
+    bench("AssetId('trx')", lambda: AssetId('trx'))
+    bench(
+        'result.coins[CoinSymbols.trx]',
+        lambda: result.coins[CoinSymbols.trx],
+    )
+    bench('result.coins[AssetId]', lambda: result.coins[trx])
+
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    handles: list[AssetId] = [
+        AssetId(f'asset{index}') for index in range(UNIVERSE_SIZE)
+    ]
+    used: int = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(
+        f'\n{UNIVERSE_SIZE} handles: {used / UNIVERSE_SIZE:.0f} bytes each '
+        f'(the handle itself: {sys.getsizeof(handles[0])} bytes)'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of the codecs of the cached quotes
+
+Measures the size of the entries and the time to encode and decode them-
+with ``JSONCodec`` and ``BinaryCodec``, for a result with every supported-
+coin and quote, with and without ``raw_data``.
+
+    python benchmarks/bench_cache_codecs.py
+"""
+
+# ruff: noqa: T201
+
+import timeit
+from decimal import Decimal
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.cache import BinaryCodec, CoinQuotesCodec, JSONCodec
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+
+ROUNDS = 2000
+
+
+def get_coin_quotes(with_raw_data: bool) -> CoinQuotes:
+    coins: dict = {
+        coin: CoinRow(
+            quotes={
+                quote: QuoteRow(quote=Decimal('1234.567890123456'))
+                for quote in QuoteSymbols
+            }
+        )
+        for coin in CoinSymbols
+    }
+    raw_data: dict | None = None
+    if with_raw_data:
+        raw_data = {
+            'data': {
+                coin.value: {
+                    'quote': {
+                        quote.value: {
+                            'price': Decimal('1234.567890123456'),
+                            'volume_24h': Decimal('7155680000.12'),
+                            'percent_change_24h': Decimal('4.37185'),
+                            'last_updated': '2025-01-19T10:00:27.010Z',
+                        }
+                        for quote in QuoteSymbols
+                    }
+                }
+                for coin in CoinSymbols
+            }
+        }
+
+    return CoinQuotes(
+        coins=coins, api_service='coinmarketcap', raw_data=raw_data
+    )
+
+
+def bench(name: str, codec: CoinQuotesCodec, value: CoinQuotes) -> None:
+    data = codec.encode(value)
+    assert codec.decode(data) == value
+
+    encode: float = timeit.timeit(lambda: codec.encode(value), number=ROUNDS)
+    decode: float = timeit.timeit(lambda: codec.decode(data), number=ROUNDS)
+    print(
+        f'{name:<28} {len(data):>8} bytes'
+        f' {encode / ROUNDS * 1e6:>9.1f} us encode'
+        f' {decode / ROUNDS * 1e6:>9.1f} us decode'
+    )
+
+
+def main() -> None:
+    for with_raw_data in (False, True):
+        value: CoinQuotes = get_coin_quotes(with_raw_data)
+        label: str = 'raw_data' if with_raw_data else 'no raw_data'
+        bench(f'json ({label})', JSONCodec(), value)
+        bench(f'binary ({label})', BinaryCodec(), value)
+        bench(
+            f'binary, no zlib ({label})',
+            BinaryCodec(compress_threshold=None),
+            value,
+        )
+
+
+if __name__ == '__main__':
+    main()
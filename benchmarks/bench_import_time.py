@@ -0,0 +1,62 @@
+"""
+Benchmark of the import time of anycoin, based on ``python -X importtime``
+
+Every module is imported in fresh interpreters; the median cumulative-
+import time is reported with the heavy dependencies the import loaded.
+
+    python benchmarks/bench_import_time.py
+"""
+
+# ruff: noqa: T201
+
+import statistics
+import subprocess
+import sys
+
+MODULES = ('anycoin', 'anycoin.services.coinmarketcap', 'anycoin.cache')
+HEAVY_DEPENDENCIES = ('aiocache', 'anyio', 'httpx', 'msgspec', 'pydantic')
+ROUNDS = 10
+
+
+def get_import_time(module: str) -> tuple[int, list[str]]:
+    """Cumulative import time of ``module`` in us and its heavy deps"""
+    process = subprocess.run(
+        [
+            sys.executable,
+            '-X',
+            'importtime',
+            '-c',
+            f'import sys, {module}; '
+            f'print(*[name for name in {HEAVY_DEPENDENCIES!r} '
+            f'if name in sys.modules])',
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    cumulative: int = 0
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative_us, name = line.split('|')
+        if name.strip() == module:
+            cumulative = int(cumulative_us)
+
+    return cumulative, process.stdout.split()
+
+
+def main() -> None:
+    for module in MODULES:
+        results: list[tuple[int, list[str]]] = [
+            get_import_time(module) for _ in range(ROUNDS)
+        ]
+        median: float = statistics.median(result[0] for result in results)
+        dependencies: str = ', '.join(results[0][1]) or '-'
+        print(
+            f'{module:<32} {median / 1000:>8.1f} ms   '
+            f'heavy dependencies: {dependencies}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark of the construction of ``CoinQuotes`` from API responses
+
+Compares ``CoinQuotes.from_cmc_raw_data`` / ``from_cgk_raw_data`` with-
+the previous construction, which resolved every coin and quote symbol-
+with its own await (a lookup in the aiocache memory cache of the id maps-
+and a linear scan of the map) and validated every row with pydantic. The-
+previous lookups are copied here, the ones of the services are now plain-
+dictionary accesses.
+
+The payloads contain every supported coin quoted in every supported-
+currency (the largest response the services can return: the results are-
+keyed by the symbol enumerations, so 19 coins in 5 currencies).
+
+    python benchmarks/bench_response_models.py
+"""
+
+# ruff: noqa: PLC2701, T201
+
+import asyncio
+import time
+from decimal import Decimal
+from enum import Enum
+
+import aiocache
+
+from anycoin._enums import CoinSymbols, QuoteSymbols
+from anycoin._mapped_ids import (
+    _load_json_data,
+    get_cgk_coin_ids,
+    get_cgk_quotes_ids,
+    get_cmc_coins_ids,
+    get_cmc_quotes_ids,
+)
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+
+ROUNDS = 2000
+
+
+@aiocache.cached(ttl=None, cache=aiocache.Cache.MEMORY)
+async def _get_json_data(file_name: str) -> dict:
+    return _load_json_data(file_name)
+
+
+async def _get_symbol_by_id(
+    file_name: str, symbols_enum: type[Enum], symbol_id: str
+) -> Enum:
+    """Lookup of the previous ``get_*_symbol_by_id`` methods"""
+    mapped_ids: dict = await _get_json_data(file_name)
+    items = list(filter(lambda item: item[1] == symbol_id, mapped_ids.items()))
+    if not items:
+        raise ValueError(f'Id {symbol_id} not supported')
+
+    return symbols_enum(items[0][0])
+
+
+async def validated_from_cmc_raw_data(raw_data: dict) -> CoinQuotes:
+    coins_data: dict = {}
+    for coin_id, coin_data in raw_data['data'].items():
+        quotes: dict = {}
+        for quote_id, quote_data in coin_data['quote'].items():
+            quote_symbol = await _get_symbol_by_id(
+                'mapped_cmc_quote_ids.json', QuoteSymbols, str(quote_id)
+            )
+            quotes[quote_symbol] = QuoteRow(
+                quote=Decimal(str(quote_data['price']))
+            )
+
+        coin_symbol = await _get_symbol_by_id(
+            'mapped_cmc_coin_ids.json', CoinSymbols, str(coin_id)
+        )
+        coins_data[coin_symbol] = CoinRow(quotes=quotes)
+
+    return CoinQuotes(
+        coins=coins_data, api_service='coinmarketcap', raw_data=raw_data
+    )
+
+
+async def validated_from_cgk_raw_data(raw_data: dict) -> CoinQuotes:
+    coins_data: dict = {}
+    for coin_id, coin_data in raw_data.items():
+        quotes: dict = {}
+        for quote_id, quote_value in coin_data.items():
+            quote_symbol = await _get_symbol_by_id(
+                'mapped_cgk_quote_ids.json', QuoteSymbols, str(quote_id)
+            )
+            quotes[quote_symbol] = QuoteRow(quote=Decimal(str(quote_value)))
+
+        coin_symbol = await _get_symbol_by_id(
+            'mapped_cgk_coin_ids.json', CoinSymbols, str(coin_id)
+        )
+        coins_data[coin_symbol] = CoinRow(quotes=quotes)
+
+    return CoinQuotes(
+        coins=coins_data, api_service='coingecko', raw_data=raw_data
+    )
+
+
+async def get_cmc_raw_data() -> dict:
+    quotes_ids = await get_cmc_quotes_ids()
+    return {
+        'data': {
+            coin_id: {
+                'id': int(coin_id),
+                'quote': {
+                    quote_id: {'price': 1234.56789012345}
+                    for quote_id in quotes_ids.values()
+                },
+            }
+            for coin_id in (await get_cmc_coins_ids()).values()
+        },
+        'status': {'error_code': 0, 'credit_count': 1},
+    }
+
+
+async def get_cgk_raw_data() -> dict:
+    quotes_ids = await get_cgk_quotes_ids()
+    return {
+        coin_id: {quote_id: 0.000123456789 for quote_id in quotes_ids.values()}
+        for coin_id in (await get_cgk_coin_ids()).values()
+    }
+
+
+async def bench(name: str, from_raw_data, raw_data: dict) -> float:
+    await from_raw_data(raw_data)  # Warm up the id maps
+
+    started_at: float = time.perf_counter()
+    for _ in range(ROUNDS):
+        await from_raw_data(raw_data)
+
+    elapsed: float = (time.perf_counter() - started_at) / ROUNDS
+    print(f'{name:<32} {elapsed * 1e6:>10.1f} us/response')
+    return elapsed
+
+
+async def main() -> None:
+    for service, raw_data, validated, fast in (
+        (
+            'coinmarketcap',
+            await get_cmc_raw_data(),
+            validated_from_cmc_raw_data,
+            CoinQuotes.from_cmc_raw_data,
+        ),
+        (
+            'coingecko',
+            await get_cgk_raw_data(),
+            validated_from_cgk_raw_data,
+            CoinQuotes.from_cgk_raw_data,
+        ),
+    ):
+        assert await validated(raw_data) == await fast(raw_data)
+
+        validated_time: float = await bench(
+            f'{service} validated', validated, raw_data
+        )
+        fast_time: float = await bench(f'{service} fast path', fast, raw_data)
+        print(f'{service} speedup: {validated_time / fast_time:.1f}x\n')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,4 +1,7 @@
+import asyncio
+import time
 from decimal import Decimal
+from enum import Enum
 from http import HTTPStatus
 
 import httpx
@@ -6,10 +9,22 @@ import pytest
 import respx
 
 from anycoin import AsyncAnyCoin, CoinSymbols, QuoteSymbols
+from anycoin.assets import AssetId
+from anycoin.cache import Cache
+from anycoin.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerPolicy,
+    CircuitState,
+)
 from anycoin.exeptions import ConvertCoin as ConvertCoinException
+from anycoin.exeptions import DeadlineExceeded as DeadlineExceededException
 from anycoin.exeptions import GetCoinQuotes as GetCoinQuotesException
-from anycoin.response_models import CoinQuotes
+from anycoin.rate_limit import RateLimiter
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+from anycoin.routing import LatencyRouter
+from anycoin.services.base import BaseAPIService
 from anycoin.services.coingecko import CoinGeckoService
+from anycoin.services.coinmarketcap import CoinMarketCapService
 
 pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
 
@@ -198,3 +213,542 @@ async def test_convert_coin_conversion_error():
             from_coin='invalid-type',
             to_coin=QuoteSymbols.brl,
         )
+
+
+async def test_async_context_manager_closes_services():
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            status_code=200, json={'bitcoin': {'usd': 100811}}
+        )
+    )
+    cgk_service = CoinGeckoService(api_key='<api-key>', transport=transport)
+
+    async with AsyncAnyCoin(api_services=[cgk_service]) as anyc:
+        result: CoinQuotes = await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+        )
+        client: httpx.AsyncClient = cgk_service._get_http_client()
+
+    assert result.coins[CoinSymbols.btc]
+    assert client.is_closed
+
+
+class _FakeService(BaseAPIService):
+    def __init__(self, name: str, delay: float, fail: bool = False) -> None:
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    async def get_coin_quotes(self, coins, quotes_in) -> CoinQuotes:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+        if self.fail:
+            raise GetCoinQuotesException(f'{self.name} failed')
+
+        return CoinQuotes(
+            coins={
+                coin: CoinRow(
+                    quotes={
+                        quote: QuoteRow(quote=Decimal('1'))
+                        for quote in quotes_in
+                    }
+                )
+                for coin in coins
+            },
+            api_service=self.name,
+            raw_data={},
+        )
+
+
+async def test_get_coin_quotes_from_poller():
+    service = _FakeService('coingecko', delay=0)
+
+    async with AsyncAnyCoin(api_services=[service]) as anyc:
+        await anyc.start_polling(
+            coins=[CoinSymbols.btc, CoinSymbols.eth],
+            quotes_in=[QuoteSymbols.usd],
+            interval=60,
+        )
+        assert service.calls == 1
+
+        result: Decimal = await anyc.convert_coin(
+            amount=2, from_coin=CoinSymbols.btc, to_coin=CoinSymbols.eth
+        )
+        assert result == Decimal('2')
+        assert service.calls == 1  # Answered from the snapshot
+
+        # Pairs not covered by the snapshot call the services
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.eur]
+        )
+        assert service.calls == 2  # noqa: PLR2004
+
+    assert anyc._poller is None
+
+
+async def test_subscribe_shares_poller():
+    service = _FakeService('coingecko', delay=0)
+
+    async with AsyncAnyCoin(api_services=[service]) as anyc:
+        async with (
+            anyc.subscribe(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            ) as btc_updates,
+            anyc.subscribe(
+                coins=[CoinSymbols.btc, CoinSymbols.eth],
+                quotes_in=[QuoteSymbols.usd],
+            ) as all_updates,
+        ):
+            btc_update: CoinQuotes = await anext(btc_updates)
+            all_update: CoinQuotes = await anext(all_updates)
+
+            poller = anyc._poller
+
+    assert list(btc_update.coins) == [CoinSymbols.btc]
+    assert list(all_update.coins) == [CoinSymbols.btc, CoinSymbols.eth]
+    assert poller.watchlist == ([], [])
+
+
+async def test_get_coin_quotes_with_asset_ids():
+    service = _FakeService('coingecko', delay=0)
+    anyc = AsyncAnyCoin(api_services=[service])
+
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[AssetId('btc')], quotes_in=[AssetId('usd')]
+    )
+    assert result.coins[CoinSymbols.btc].quotes[AssetId('usd')].quote == 1
+
+    assert await anyc.convert_coin(
+        amount=2, from_coin=AssetId('btc'), to_coin=AssetId('eth')
+    ) == Decimal('2')
+
+
+async def test_get_coin_quotes_hedged_slow_primary():
+    primary = _FakeService('coinmarketcap', delay=1.0)
+    secondary = _FakeService('coingecko', delay=0.01)
+
+    anyc = AsyncAnyCoin(api_services=[primary, secondary], hedge_delay=0.05)
+
+    start_time: float = time.perf_counter()
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    end_time: float = time.perf_counter()
+
+    assert result.api_service == 'coingecko'
+    assert (end_time - start_time) < primary.delay
+    assert primary.cancelled
+
+
+async def test_get_coin_quotes_hedged_fast_primary():
+    primary = _FakeService('coinmarketcap', delay=0.01)
+    secondary = _FakeService('coingecko', delay=0.01)
+
+    anyc = AsyncAnyCoin(api_services=[primary, secondary], hedge_delay=0.5)
+
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert result.api_service == 'coinmarketcap'
+    # The secondary service is not called when the primary is fast
+    assert secondary.calls == 0
+
+
+async def test_get_coin_quotes_hedged_primary_fails():
+    primary = _FakeService('coinmarketcap', delay=0.01, fail=True)
+    secondary = _FakeService('coingecko', delay=0.01)
+
+    anyc = AsyncAnyCoin(api_services=[primary, secondary], hedge_delay=0.5)
+
+    start_time: float = time.perf_counter()
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    end_time: float = time.perf_counter()
+
+    assert result.api_service == 'coingecko'
+    # The failure starts the next service without waiting the hedge delay
+    assert (end_time - start_time) < anyc._hedge_delay
+
+
+async def test_get_coin_quotes_hedged_all_services_fail():
+    primary = _FakeService('coinmarketcap', delay=0.01, fail=True)
+    secondary = _FakeService('coingecko', delay=0.01, fail=True)
+
+    anyc = AsyncAnyCoin(api_services=[primary, secondary], hedge_delay=0.5)
+
+    with pytest.raises(
+        GetCoinQuotesException, match='Unable to get quote through services'
+    ):
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+
+async def test_get_coin_quotes_hedged_services_share_cache():
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1.0)
+        return httpx.Response(
+            status_code=200,
+            json={
+                'status': {'error_code': 0},
+                'data': {'1': {'quote': {'2781': {'price': 100811}}}},
+            },
+        )
+
+    cache = Cache(Cache.MEMORY)
+    primary = CoinMarketCapService(
+        api_key='<api-key>',
+        cache=cache,
+        transport=httpx.MockTransport(slow_handler),
+    )
+    secondary = CoinGeckoService(
+        api_key='<api-key>',
+        cache=cache,
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                status_code=200, json={'bitcoin': {'usd': 100811}}
+            )
+        ),
+    )
+
+    anyc = AsyncAnyCoin(api_services=[primary, secondary], hedge_delay=0.05)
+
+    start_time: float = time.perf_counter()
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    end_time: float = time.perf_counter()
+
+    # The hedged call does not wait for the fetch of the primary service
+    assert result.api_service == 'coingecko'
+    assert (end_time - start_time) < 1.0
+
+
+@respx.mock
+async def test_get_coin_quotes_daily_rate_limit_fails_over():
+    cmc_route = respx.get(
+        'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
+    ).mock(
+        httpx.Response(
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            json={
+                'status': {
+                    'error_code': 1009,
+                    'error_message': (
+                        "You've exceeded your API Key's daily rate limit."
+                    ),
+                    'credit_count': 0,
+                }
+            },
+        )
+    )
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}})
+    )
+    cmc_service = CoinMarketCapService(
+        api_key='<api-key>',
+        rate_limiter=RateLimiter(requests_per_minute=30),
+    )
+    cgk_service = CoinGeckoService(api_key='<api-key>')
+
+    anyc = AsyncAnyCoin(api_services=[cmc_service, cgk_service])
+
+    for _ in range(2):
+        # Not held by the limiter until the daily limit resets
+        result: CoinQuotes = await asyncio.wait_for(
+            anyc.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            ),
+            timeout=1,
+        )
+        assert result.api_service == 'coingecko'
+
+    assert cmc_route.call_count == 1
+
+
+async def test_get_hedge_delay_quantile():
+    primary = _FakeService('coinmarketcap', delay=0.01)
+
+    anyc = AsyncAnyCoin(
+        api_services=[primary], hedge_delay=1.0, hedge_quantile=0.95
+    )
+
+    # Not enough samples
+    assert anyc._get_hedge_delay(primary) == 1.0
+
+    for latency in range(1, 101):
+        anyc._latencies[primary].add(latency / 1000)
+
+    assert anyc._get_hedge_delay(primary) == 0.095  # noqa: PLR2004
+
+
+async def test_get_coin_quotes_circuit_breaker_skips_open_service():
+    primary = _FakeService('coinmarketcap', delay=0.05, fail=True)
+    secondary = _FakeService('coingecko', delay=0)
+
+    anyc = AsyncAnyCoin(
+        api_services=[primary, secondary],
+        circuit_breaker=CircuitBreakerPolicy(
+            failure_threshold=2, recovery_timeout=60
+        ),
+    )
+
+    for _ in range(2):
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    # The circuit of the primary service is open now
+    start_time: float = time.perf_counter()
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    end_time: float = time.perf_counter()
+
+    assert result.api_service == 'coingecko'
+    assert primary.calls == 2  # noqa: PLR2004
+    assert (end_time - start_time) < primary.delay
+
+    await anyc.aclose()
+
+
+async def test_get_coin_quotes_circuit_breaker_probe_closes_circuit():
+    primary = _FakeService('coinmarketcap', delay=0, fail=True)
+    secondary = _FakeService('coingecko', delay=0)
+
+    anyc = AsyncAnyCoin(
+        api_services=[primary, secondary],
+        circuit_breaker=CircuitBreakerPolicy(
+            failure_threshold=1, recovery_timeout=0.01
+        ),
+    )
+
+    await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    circuit_breaker: CircuitBreaker = anyc._circuit_breakers[primary]
+    assert circuit_breaker.state is CircuitState.open
+
+    # The service recovers, the next probe closes the circuit
+    primary.fail = False
+    await asyncio.wait_for(anyc._probe_tasks[primary], timeout=1)
+    assert circuit_breaker.state is CircuitState.closed
+
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert result.api_service == 'coinmarketcap'
+
+
+async def test_get_coin_quotes_circuit_breaker_probe_ignores_deadline():
+    class NoPingService(CoinGeckoService):
+        _ping_url = None  # Probed with get_coin_quotes
+
+    responses: list[httpx.Response] = [
+        httpx.Response(status_code=HTTPStatus.SERVICE_UNAVAILABLE),
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}}),
+    ]
+    service = NoPingService(
+        api_key='<api-key>',
+        transport=httpx.MockTransport(
+            lambda request: (
+                responses.pop(0) if len(responses) > 1 else responses[0]
+            )
+        ),
+    )
+
+    anyc = AsyncAnyCoin(
+        api_services=[service],
+        circuit_breaker=CircuitBreakerPolicy(
+            failure_threshold=1, recovery_timeout=0.2
+        ),
+    )
+
+    with pytest.raises(GetCoinQuotesException):
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd], timeout=0.1
+        )
+
+    # Probed after the deadline of the call that opened the circuit
+    await asyncio.wait_for(anyc._probe_tasks[service], timeout=1)
+    assert anyc._circuit_breakers[service].state is CircuitState.closed
+
+
+async def test_get_coin_quotes_circuit_breaker_ignores_not_supported():
+    cgk_service = CoinGeckoService(api_key='<api-key>')
+
+    anyc = AsyncAnyCoin(
+        api_services=[cgk_service],
+        circuit_breaker=CircuitBreakerPolicy(failure_threshold=1),
+    )
+
+    class FakeCoinSymbols(str, Enum):
+        invalid_member: str = 'invalid_member'
+
+    with pytest.raises(GetCoinQuotesException):
+        await anyc.get_coin_quotes(
+            coins=[FakeCoinSymbols.invalid_member],
+            quotes_in=[QuoteSymbols.usd],
+        )
+
+    assert anyc._circuit_breakers[cgk_service].state is CircuitState.closed
+
+
+async def test_get_coin_quotes_router_prefers_faster_service():
+    slow = _FakeService('coinmarketcap', delay=0.05)
+    fast = _FakeService('coingecko', delay=0)
+
+    router = LatencyRouter(shadow_rate=0)
+    anyc = AsyncAnyCoin(api_services=[slow, fast], router=router)
+
+    # Services without samples are measured first
+    for _ in range(2):
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert result.api_service == 'coingecko'
+    assert router.stats()[slow].latency > router.stats()[fast].latency
+
+
+@respx.mock
+async def test_get_coin_quotes_cache_hits_not_measured():
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}})
+    )
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=Cache(Cache.MEMORY)
+    )
+
+    router = LatencyRouter(shadow_rate=0)
+    anyc = AsyncAnyCoin(api_services=[cgk_service], router=router)
+
+    for _ in range(3):
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    # Only the call that reached the API is measured
+    assert router.stats()[cgk_service].calls == 1
+    assert len(anyc._latencies[cgk_service]._samples) == 1
+
+
+async def test_get_coin_quotes_router_shadow_request():
+    primary = _FakeService('coinmarketcap', delay=0)
+    fallback = _FakeService('coingecko', delay=0)
+
+    router = LatencyRouter(shadow_rate=1)
+    anyc = AsyncAnyCoin(api_services=[primary, fallback], router=router)
+
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await asyncio.gather(*anyc._background_tasks)
+
+    assert result.api_service == 'coinmarketcap'
+    assert fallback.calls == 1
+    assert router.stats()[fallback].calls == 1
+
+
+@respx.mock
+async def test_get_coin_quotes_router_shadow_request_shared_cache():
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}})
+    )
+    respx.get(
+        'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
+    ).mock(
+        httpx.Response(
+            status_code=200,
+            json={
+                'status': {'error_code': 0},
+                'data': {'1': {'quote': {'2781': {'price': 100811}}}},
+            },
+        )
+    )
+    cache = Cache(Cache.MEMORY)
+    primary = CoinMarketCapService(api_key='<api-key>', cache=cache)
+    fallback = CoinGeckoService(api_key='<api-key>', cache=cache)
+
+    router = LatencyRouter(shadow_rate=1)
+    anyc = AsyncAnyCoin(api_services=[primary, fallback], router=router)
+
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await asyncio.gather(*anyc._background_tasks)
+
+    # Each service fetched on its own, neither joined the other's fetch
+    assert result.api_service == 'coinmarketcap'
+    assert router.stats()[primary].calls == 1
+    assert router.stats()[fallback].calls == 1
+
+
+async def test_get_coin_quotes_timeout():
+    primary = _FakeService('coinmarketcap', delay=1.0)
+
+    anyc = AsyncAnyCoin(api_services=[primary])
+
+    start_time: float = time.perf_counter()
+    with pytest.raises(
+        DeadlineExceededException, match='Unable to get quote within'
+    ):
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd], timeout=0.05
+        )
+    end_time: float = time.perf_counter()
+
+    assert (end_time - start_time) < primary.delay
+    assert primary.cancelled
+
+
+async def test_get_coin_quotes_timeout_shared_by_services():
+    primary = _FakeService('coinmarketcap', delay=0.03, fail=True)
+    secondary = _FakeService('coingecko', delay=0.03, fail=True)
+    tertiary = _FakeService('coingecko', delay=0.03)
+
+    anyc = AsyncAnyCoin(api_services=[primary, secondary, tertiary])
+
+    with pytest.raises(DeadlineExceededException):
+        await anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd], timeout=0.07
+        )
+
+
+async def test_get_coin_quotes_timeout_not_exceeded():
+    primary = _FakeService('coinmarketcap', delay=0.01)
+
+    anyc = AsyncAnyCoin(api_services=[primary])
+
+    result: CoinQuotes = await anyc.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd], timeout=1
+    )
+    assert result.api_service == 'coinmarketcap'
+
+
+async def test_convert_coin_timeout():
+    primary = _FakeService('coinmarketcap', delay=1.0)
+
+    anyc = AsyncAnyCoin(api_services=[primary])
+
+    with pytest.raises(DeadlineExceededException):
+        await anyc.convert_coin(
+            amount=Decimal('1'),
+            from_coin=CoinSymbols.btc,
+            to_coin=QuoteSymbols.usd,
+            timeout=0.05,
+        )
@@ -7,6 +7,7 @@ import respx
 
 from anycoin import AnyCoin, CoinSymbols, QuoteSymbols
 from anycoin.exeptions import ConvertCoin as ConvertCoinException
+from anycoin.exeptions import DeadlineExceeded as DeadlineExceededException
 from anycoin.exeptions import GetCoinQuotes as GetCoinQuotesException
 from anycoin.response_models import CoinQuotes
 from anycoin.services.coingecko import CoinGeckoService
@@ -196,3 +197,65 @@ def test_convert_coin_conversion_error():
             from_coin='invalid-type',
             to_coin=QuoteSymbols.brl,
         )
+
+
+def test_context_manager_closes_portal():
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            status_code=200, json={'bitcoin': {'usd': 100811}}
+        )
+    )
+    cgk_service = CoinGeckoService(api_key='<api-key>', transport=transport)
+
+    with AnyCoin(api_services=[cgk_service]) as anyc:
+        result: CoinQuotes = anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+        )
+
+    assert result.coins[CoinSymbols.btc]
+    assert anyc._portal is None
+
+
+def test_get_coin_quotes_timeout():
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            status_code=200, json={'bitcoin': {'usd': 100811}}
+        )
+    )
+    cgk_service = CoinGeckoService(api_key='<api-key>', transport=transport)
+
+    with AnyCoin(api_services=[cgk_service]) as anyc:
+        with pytest.raises(DeadlineExceededException):
+            anyc.get_coin_quotes(
+                coins=[CoinSymbols.btc],
+                quotes_in=[QuoteSymbols.usd],
+                timeout=0,
+            )
+
+
+def test_get_coin_quotes_from_poller():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            status_code=200, json={'bitcoin': {'usd': 100811}}
+        )
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', transport=httpx.MockTransport(handler)
+    )
+
+    with AnyCoin(api_services=[cgk_service]) as anyc:
+        anyc.start_polling(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd], interval=60
+        )
+        result: CoinQuotes = anyc.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    assert len(requests) == 1
+    assert result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd].quote == (
+        Decimal('100811')
+    )
@@ -1,5 +1,13 @@
+import asyncio
+
+import httpx
+import pytest
+
+from anycoin.cache import BinaryCodec, Cache
 from anycoin.services.base import BaseAPIService
 
+pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
+
 
 def test__repr__():
     service = BaseAPIService()
@@ -9,3 +17,91 @@ def test__repr__():
 def test__str__():
     service = BaseAPIService()
     assert str(service) == ('BaseAPIService(***)')
+
+
+@pytest.mark.parametrize(
+    'options',
+    [
+        {'cache_codec': BinaryCodec()},
+        {'cache_stale_ttl': 60},
+        {'cache_lease_ttl': 10},
+        {'keep_raw_data': True},
+    ],
+)
+def test_cache_per_pair_incompatible_options(options):
+    with pytest.raises(ValueError, match='cache_per_pair'):
+        BaseAPIService(
+            cache=Cache(Cache.MEMORY), cache_per_pair=True, **options
+        )
+
+
+async def test_cache_per_pair_without_raw_data():
+    service = BaseAPIService(cache=Cache(Cache.MEMORY), cache_per_pair=True)
+
+    with pytest.raises(ValueError, match='cache_per_pair'):
+        await service.get_coin_quotes(
+            coins=[], quotes_in=[], keep_raw_data=True
+        )
+
+
+async def test_http_client_is_reused():
+    service = BaseAPIService()
+
+    client: httpx.AsyncClient = service._get_http_client()
+    assert service._get_http_client() is client
+
+    await service.aclose()
+    assert client.is_closed
+
+
+async def test_http_client_recreated_after_aclose():
+    service = BaseAPIService()
+
+    client: httpx.AsyncClient = service._get_http_client()
+    await service.aclose()
+
+    assert service._get_http_client() is not client
+    await service.aclose()
+
+
+async def test_aclose_keeps_clients_of_other_loops():
+    service = BaseAPIService()
+    other_loop = asyncio.new_event_loop()
+
+    async def get_client() -> httpx.AsyncClient:
+        return service._get_http_client()
+
+    try:
+        other_client = await asyncio.to_thread(
+            other_loop.run_until_complete, get_client()
+        )
+        service._get_http_client()
+        await service.aclose()
+
+        # Still open, and closed by the aclose of its own loop
+        assert not other_client.is_closed
+        assert (
+            await asyncio.to_thread(
+                other_loop.run_until_complete, get_client()
+            )
+            is other_client
+        )
+        await asyncio.to_thread(
+            other_loop.run_until_complete, service.aclose()
+        )
+        assert other_client.is_closed
+    finally:
+        other_loop.close()
+
+
+async def test_http_client_with_custom_transport():
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={'ok': True})
+    )
+
+    async with BaseAPIService(transport=transport) as service:
+        client: httpx.AsyncClient = service._get_http_client()
+        response = await client.get('https://example.com')
+
+    assert response.json() == {'ok': True}
+    assert client.is_closed
@@ -5,23 +5,30 @@ from decimal import Decimal
 from enum import Enum
 from http import HTTPStatus
 from types import CoroutineType
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 
 import httpx
 import pytest
 import respx
+from aiocache.serializers import NullSerializer
 
 from anycoin import CoinSymbols, QuoteSymbols
+from anycoin._deadline import deadline_scope  # noqa: PLC2701
+from anycoin.cache import BinaryCodec, Cache, JSONCodec, LocalCache
 from anycoin.exeptions import (
     CoinNotSupportedCGK as CoinNotSupportedCGKException,
 )
+from anycoin.exeptions import (
+    DeadlineExceeded as DeadlineExceededException,
+)
 from anycoin.exeptions import (
     GetCoinQuotes as GetCoinQuotesException,
 )
 from anycoin.exeptions import (
     QuoteCoinNotSupportedCGK as QuoteCoinNotSupportedCGKException,
 )
-from anycoin.response_models import CoinQuotes
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+from anycoin.retry import RetryPolicy
 from anycoin.services.coingecko import CoinGeckoService
 
 pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
@@ -155,7 +162,7 @@ async def test_send_request_request_error():
 async def test_send_request_json_decode_error():
     # Mock api request
     respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
-        side_effect=json.JSONDecodeError('abc', '123', 0)
+        httpx.Response(status_code=200, content=b'<html>')
     )
 
     cgk_service = CoinGeckoService(api_key='<api-key>')
@@ -167,6 +174,228 @@ async def test_send_request_json_decode_error():
         await cgk_service._send_request(path='/simple/price', method='get')
 
 
+@respx.mock
+async def test_send_request_retry_on_server_error():
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
+
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.side_effect = [
+        httpx.Response(status_code=HTTPStatus.SERVICE_UNAVAILABLE),
+        httpx.Response(status_code=200, json=EXAMPLE_RESPONSE),
+    ]
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        retry_policy=RetryPolicy(base_delay=0.001),
+    )
+
+    result = await cgk_service._send_request(
+        path='/simple/price', method='get'
+    )
+    assert result == EXAMPLE_RESPONSE
+    assert route.call_count == 2  # noqa: PLR2004
+
+
+@respx.mock
+async def test_send_request_retry_on_request_error():
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
+
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.side_effect = [
+        httpx.ConnectError('connection reset'),
+        httpx.Response(status_code=200, json=EXAMPLE_RESPONSE),
+    ]
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        retry_policy=RetryPolicy(base_delay=0.001),
+    )
+
+    result = await cgk_service._send_request(
+        path='/simple/price', method='get'
+    )
+    assert result == EXAMPLE_RESPONSE
+
+
+@respx.mock
+async def test_send_request_retry_after_header(monkeypatch):
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
+    sleep_calls = []
+
+    async def fake_sleep(delay):
+        sleep_calls.append(delay)
+
+    monkeypatch.setattr('anycoin.services.base.asyncio.sleep', fake_sleep)
+
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.side_effect = [
+        httpx.Response(
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            headers={'Retry-After': '2'},
+            json={'error': 'rate limited'},
+        ),
+        httpx.Response(status_code=200, json=EXAMPLE_RESPONSE),
+    ]
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        retry_policy=RetryPolicy(),
+    )
+
+    result = await cgk_service._send_request(
+        path='/simple/price', method='get'
+    )
+    assert result == EXAMPLE_RESPONSE
+    assert sleep_calls == [2.0]
+
+
+@respx.mock
+async def test_send_request_retry_after_header_too_long():
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            headers={'Retry-After': '60'},
+            json={'error': 'rate limited'},
+        )
+    )
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        retry_policy=RetryPolicy(max_retry_after=5),
+    )
+
+    with pytest.raises(
+        GetCoinQuotesException,
+        match=('Error retrieving coin quotes. API response:'),
+    ):
+        await cgk_service._send_request(path='/simple/price', method='get')
+
+    assert route.call_count == 1
+
+
+@respx.mock
+async def test_send_request_no_retry_on_client_error():
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(
+            status_code=HTTPStatus.UNAUTHORIZED, json={'error': 'error'}
+        )
+    )
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        retry_policy=RetryPolicy(base_delay=0.001),
+    )
+
+    with pytest.raises(GetCoinQuotesException):
+        await cgk_service._send_request(path='/simple/price', method='get')
+
+    assert route.call_count == 1
+
+
+@respx.mock
+async def test_send_request_retry_attempts_exhausted():
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(httpx.Response(status_code=HTTPStatus.BAD_GATEWAY))
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0.001),
+    )
+
+    with pytest.raises(
+        GetCoinQuotesException, match=('Error retrieving coin quotes')
+    ):
+        await cgk_service._send_request(path='/simple/price', method='get')
+
+    assert route.call_count == 3  # noqa: PLR2004
+
+
+@respx.mock
+async def test_send_request_deadline_exceeded():
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+
+    cgk_service = CoinGeckoService(api_key='<api-key>')
+
+    with deadline_scope(0):
+        with pytest.raises(DeadlineExceededException):
+            await cgk_service._send_request(path='/simple/price', method='get')
+
+    assert route.call_count == 0
+
+
+@respx.mock
+async def test_send_request_retry_does_not_exceed_deadline():
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            headers={'Retry-After': '1'},
+        )
+    )
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        retry_policy=RetryPolicy(),
+    )
+
+    with deadline_scope(0.5):
+        with pytest.raises(GetCoinQuotesException):
+            await cgk_service._send_request(path='/simple/price', method='get')
+
+    assert route.call_count == 1
+
+
+def test_get_request_timeout_bounded_by_deadline():
+    cgk_service = CoinGeckoService(api_key='<api-key>', http_timeout=10)
+
+    assert cgk_service._get_request_timeout() == httpx.Timeout(10)
+
+    with deadline_scope(0.3):
+        timeout: httpx.Timeout = cgk_service._get_request_timeout()
+
+    assert timeout.read <= 0.3  # noqa: PLR2004
+    assert timeout.connect <= 0.3  # noqa: PLR2004
+
+
+async def test_send_request_timeout_cut_by_deadline():
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        # A server answering in 0.5 seconds, behind the read timeout
+        read_timeout: float = request.extensions['timeout']['read']
+        await asyncio.sleep(min(read_timeout, 0.5))
+        if read_timeout < 0.5:  # noqa: PLR2004
+            raise httpx.ReadTimeout('Timed out', request=request)
+        return httpx.Response(status_code=200, json={})
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', transport=httpx.MockTransport(slow_handler)
+    )
+
+    # The deadline of the caller, not the service, timed out
+    with deadline_scope(0.1), pytest.raises(DeadlineExceededException):
+        await cgk_service._send_request(path='/simple/price', method='get')
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        http_timeout=0.1,
+        transport=httpx.MockTransport(slow_handler),
+    )
+
+    with pytest.raises(GetCoinQuotesException) as exc_info:
+        await cgk_service._send_request(path='/simple/price', method='get')
+
+    assert not isinstance(exc_info.value, DeadlineExceededException)
+
+
 async def test_get_coin_quotes_coin_not_supported():
     class FakeCoinSymbols(str, Enum):
         invalid_member: str = 'invalid_member'
@@ -332,6 +561,99 @@ async def test_get_coin_quotes_multi_coins_and_quotes():
     }
 
 
+@respx.mock
+async def test_get_coin_quotes_with_batching():
+    EXAMPLE_RESPONSE = {
+        'bitcoin': {'usd': 100811, 'eur': 95000},
+        'ethereum': {'usd': 3500, 'eur': 3300},
+    }
+
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    cgk_service = CoinGeckoService(api_key='<api-key>', batch_window=0.01)
+
+    btc, eth = await asyncio.gather(
+        cgk_service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        ),
+        cgk_service.get_coin_quotes(
+            coins=[CoinSymbols.eth], quotes_in=[QuoteSymbols.eur]
+        ),
+    )
+
+    assert route.call_count == 1
+    assert route.calls.last.request.url.params['ids'] == 'bitcoin,ethereum'
+    assert route.calls.last.request.url.params['vs_currencies'] == 'usd,eur'
+
+    assert btc.model_dump()['coins'] == {
+        CoinSymbols.btc: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('100811')}}
+        }
+    }
+    assert eth.model_dump()['coins'] == {
+        CoinSymbols.eth: {
+            'quotes': {QuoteSymbols.eur: {'quote': Decimal('3300')}}
+        }
+    }
+    assert btc.raw_data == {'bitcoin': EXAMPLE_RESPONSE['bitcoin']}
+    assert eth.raw_data == {'ethereum': EXAMPLE_RESPONSE['ethereum']}
+
+
+@respx.mock
+async def test_get_coin_quotes_in_chunks():
+    EXAMPLE_RESPONSES = {
+        'bitcoin,ethereum': {
+            'bitcoin': {'usd': 100811},
+            'ethereum': {'usd': 3500},
+        },
+        'litecoin': {'litecoin': {'usd': 127}},
+    }
+
+    # Mock api request
+    def response(request):
+        return httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSES[request.url.params['ids']],
+        )
+
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.side_effect = response
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', max_coins_per_request=2
+    )
+
+    result: CoinQuotes = await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth, CoinSymbols.ltc],
+        quotes_in=[QuoteSymbols.usd],
+    )
+
+    assert route.call_count == 2  # noqa: PLR2004
+    assert result.raw_data == {
+        'bitcoin': {'usd': 100811},
+        'ethereum': {'usd': 3500},
+        'litecoin': {'usd': 127},
+    }
+    assert result.model_dump()['coins'] == {
+        CoinSymbols.btc: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('100811')}}
+        },
+        CoinSymbols.eth: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('3500')}}
+        },
+        CoinSymbols.ltc: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('127')}}
+        },
+    }
+
+
 async def test_get_coin_quotes_with_cache_and_value_in_cache(any_aiocache):
     EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
 
@@ -412,6 +734,480 @@ async def test_get_coin_quotes_with_cache_and_value_not_in_cache(any_aiocache):
     }
 
 
+@respx.mock
+async def test_get_coin_quotes_without_raw_data(any_aiocache):
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}})
+    )
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        cache=any_aiocache,
+        keep_raw_data=False,
+    )
+
+    result: CoinQuotes = await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert result.raw_data is None
+    assert result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd].quote == (
+        Decimal('100811')
+    )
+    assert await any_aiocache.get('coins:btc;quotes_in:usd') is None
+    assert (
+        json.loads(
+            await any_aiocache.get('coins:btc;quotes_in:usd;raw_data:no')
+        )['raw_data']
+        is None
+    )
+
+
+@respx.mock
+async def test_get_coin_quotes_with_binary_cache_codec():
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}})
+    )
+
+    cache = Cache(Cache.MEMORY, serializer=NullSerializer(encoding=None))
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=cache, cache_codec=BinaryCodec()
+    )
+
+    for _ in range(2):
+        result: CoinQuotes = await cgk_service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        assert result.raw_data == {'bitcoin': {'usd': 100811}}
+
+    assert route.call_count == 1
+    assert (await cache.get('coins:btc;quotes_in:usd')).startswith(b'AQ')
+
+
+def test_binary_cache_codec_requires_bytes_serializer():
+    with pytest.raises(ValueError, match='requires a cache serializer'):
+        CoinGeckoService(
+            api_key='<api-key>',
+            cache=Cache(Cache.MEMORY),
+            cache_codec=BinaryCodec(),
+        )
+
+
+@respx.mock
+async def test_get_coin_quotes_with_local_cache():
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}})
+    )
+
+    cache = Cache(Cache.MEMORY)
+    cache.get = AsyncMock(wraps=cache.get)
+    local_cache = LocalCache(ttl=60)
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=cache, local_cache=local_cache
+    )
+
+    results: list[CoinQuotes] = [
+        await cgk_service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        for _ in range(3)
+    ]
+
+    assert route.call_count == 1
+    # The L2 cache is only read until the value is fetched
+    assert cache.get.await_count == 2  # noqa: PLR2004
+    assert results[1] is results[0]
+    assert results[2] is results[0]
+
+    # Values read from the L2 cache are kept in the local cache
+    local_cache.clear()
+    result: CoinQuotes = await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert result == results[0]
+    assert local_cache.get('coins:btc;quotes_in:usd') is result
+
+
+@respx.mock
+async def test_get_coin_quotes_local_cache_ttl_from_shared_cache(
+    monkeypatch,
+):
+    now: list[float] = [time.time()]
+    monkeypatch.setattr('anycoin.cache.time.time', lambda: now[0])
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}})
+    )
+
+    cache = Cache(Cache.MEMORY)
+    await CoinGeckoService(
+        api_key='<api-key>',
+        cache=cache,
+        cache_ttl=10,
+        local_cache=LocalCache(),
+    ).get_coin_quotes(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+
+    # Another process reads the entry 8 seconds later
+    now[0] += 8
+    local_cache = LocalCache(ttl=60)
+    local_cache.set = Mock(wraps=local_cache.set)
+    await CoinGeckoService(
+        api_key='<api-key>', cache=cache, cache_ttl=10, local_cache=local_cache
+    ).get_coin_quotes(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+
+    # Kept only for the rest of the lifetime of the shared entry
+    assert local_cache.set.call_args.kwargs['ttl'] == pytest.approx(
+        2, abs=0.01
+    )
+
+
+@respx.mock
+async def test_get_coin_quotes_cache_entries_readable_by_older_versions():
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}})
+    )
+
+    cache = Cache(Cache.MEMORY)
+    await CoinGeckoService(
+        api_key='<api-key>', cache=cache, cache_ttl=10
+    ).get_coin_quotes(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+
+    # Without local cache nor stale-while-revalidate the entries are plain-
+    # JSON, as read by the versions sharing the cache during a rollout
+    entry: str = await cache.get('coins:btc;quotes_in:usd')
+    assert CoinQuotes.model_validate_json(entry).api_service == 'coingecko'
+
+
+@respx.mock
+async def test_get_coin_quotes_with_cache_per_pair(any_aiocache):
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.side_effect = [
+        httpx.Response(
+            status_code=200,
+            json={'bitcoin': {'usd': 100811}, 'ethereum': {'usd': 3300.5}},
+        ),
+        httpx.Response(status_code=200, json={'bitcoin': {'eur': 97000}}),
+    ]
+
+    any_aiocache.multi_get = AsyncMock(wraps=any_aiocache.multi_get)
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=any_aiocache, cache_per_pair=True
+    )
+
+    await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+    )
+    # Cached pairs are reused whatever the grouping of the coins
+    result: CoinQuotes = await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.eth, CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert route.call_count == 1
+    assert list(result.coins) == [CoinSymbols.eth, CoinSymbols.btc]
+    assert result.coins[CoinSymbols.eth].quotes[QuoteSymbols.usd].quote == (
+        Decimal('3300.5')
+    )
+    assert result.raw_data is None
+
+    # Only the missing pairs are fetched
+    result = await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur]
+    )
+    assert route.call_count == 2  # noqa: PLR2004
+    assert route.calls.last.request.url.params['ids'] == 'bitcoin'
+    assert route.calls.last.request.url.params['vs_currencies'] == 'eur'
+    assert result.model_dump()['coins'] == {
+        CoinSymbols.btc: {
+            'quotes': {
+                QuoteSymbols.usd: {'quote': Decimal('100811')},
+                QuoteSymbols.eur: {'quote': Decimal('97000')},
+            }
+        }
+    }
+
+    # A single round trip to the cache per call
+    assert any_aiocache.multi_get.await_count == 3  # noqa: PLR2004
+
+
+@respx.mock
+async def test_get_coin_quotes_with_cache_stale_ttl(monkeypatch):
+    now: list[float] = [time.time()]
+    monkeypatch.setattr('anycoin.cache.time.time', lambda: now[0])
+
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.side_effect = [
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}}),
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 101000}}),
+    ]
+
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        cache=Cache(Cache.MEMORY),
+        cache_ttl=10,
+        cache_stale_ttl=60,
+    )
+
+    async def get_quote() -> Decimal:
+        result: CoinQuotes = await cgk_service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        return result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd].quote
+
+    assert await get_quote() == Decimal('100811')
+
+    # Stale values are served while a single refresh runs in background
+    now[0] += 11
+    assert await asyncio.gather(get_quote(), get_quote()) == [
+        Decimal('100811'),
+        Decimal('100811'),
+    ]
+    await asyncio.sleep(0.01)
+    assert route.call_count == 2  # noqa: PLR2004
+
+    assert await get_quote() == Decimal('101000')
+    assert route.call_count == 2  # noqa: PLR2004
+
+
+@respx.mock
+async def test_get_coin_quotes_waits_for_lease_holder(monkeypatch):
+    monkeypatch.setattr('anycoin.cache._LEASE_POLL_INTERVAL', 0.01)
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}})
+    )
+
+    cache = Cache(Cache.MEMORY)
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=cache, cache_lease_ttl=10
+    )
+
+    # Another process holds the lease and fetches the quotes
+    await cache.add(
+        'CoinGeckoService;coins:btc;quotes_in:usd;lease', '1', ttl=10
+    )
+
+    async def other_process() -> None:
+        await asyncio.sleep(0.05)
+        await cache.set(
+            'coins:btc;quotes_in:usd',
+            JSONCodec().encode(
+                CoinQuotes(
+                    coins={
+                        CoinSymbols.btc: CoinRow(
+                            quotes={
+                                QuoteSymbols.usd: QuoteRow(
+                                    quote=Decimal('99000')
+                                )
+                            }
+                        )
+                    },
+                    api_service='coingecko',
+                    raw_data={'bitcoin': {'usd': 99000}},
+                )
+            ),
+        )
+
+    result, _ = await asyncio.gather(
+        cgk_service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        ),
+        other_process(),
+    )
+
+    assert route.call_count == 0
+    assert result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd].quote == (
+        Decimal('99000')
+    )
+
+
+@respx.mock
+async def test_get_coin_quotes_lease_expired(monkeypatch):
+    monkeypatch.setattr('anycoin.cache._LEASE_POLL_INTERVAL', 0.05)
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(status_code=200, json={'bitcoin': {'usd': 100811}})
+    )
+
+    cache = Cache(Cache.MEMORY)
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=cache, cache_lease_ttl=1
+    )
+
+    # The holder of the lease died without writing the value
+    await cache.add(
+        'CoinGeckoService;coins:btc;quotes_in:usd;lease', '1', ttl=1
+    )
+
+    result: CoinQuotes = await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    assert route.call_count == 1
+    assert result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd].quote == (
+        Decimal('100811')
+    )
+    # The lease is released once the value is cached
+    assert not await cache.exists(
+        'CoinGeckoService;coins:btc;quotes_in:usd;lease'
+    )
+
+
+@respx.mock
+async def test_get_coin_quotes_with_cache_error_ttl():
+    route = respx.get('https://pro-api.coingecko.com/api/v3/simple/price')
+    route.mock(
+        httpx.Response(
+            status_code=HTTPStatus.BAD_REQUEST, json={'error': 'error'}
+        )
+    )
+
+    cache = Cache(Cache.MEMORY)
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=cache, cache_error_ttl=30
+    )
+
+    for _ in range(2):
+        with pytest.raises(
+            GetCoinQuotesException, match='Error retrieving coin quotes'
+        ):
+            await cgk_service.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+            )
+
+    # The failure is cached, the API is not called again
+    assert route.call_count == 1
+    assert await cache.exists('error:CoinGeckoService;coins:btc;quotes_in:usd')
+
+
+async def test_get_coin_quotes_with_cache_unsupported_ttl():
+    class FakeQuoteSymbols(str, Enum):
+        invalid_member: str = 'invalid_member'
+
+    quote_symbol = FakeQuoteSymbols.invalid_member
+
+    cache = Cache(Cache.MEMORY)
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=cache, cache_unsupported_ttl=60
+    )
+
+    for _ in range(2):
+        with pytest.raises(
+            GetCoinQuotesException,
+            match=f'Quote {quote_symbol} not supported',
+        ) as exc_info:
+            await cgk_service.get_coin_quotes(
+                coins=[CoinSymbols.btc], quotes_in=[quote_symbol]
+            )
+
+        assert isinstance(
+            exc_info.value.__cause__, QuoteCoinNotSupportedCGKException
+        )
+
+    assert await cache.get(
+        'error:CoinGeckoService;coins:btc;quotes_in:invalid_member'
+    ) == (f'QuoteCoinNotSupportedCGK:Quote {quote_symbol} not supported')
+
+
+@respx.mock
+async def test_get_coin_quotes_deadline_exceeded_not_cached():
+    cache = Cache(Cache.MEMORY)
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=cache, cache_error_ttl=30
+    )
+
+    with deadline_scope(0), pytest.raises(DeadlineExceededException):
+        await cgk_service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    assert not await cache.exists(
+        'error:CoinGeckoService;coins:btc;quotes_in:usd'
+    )
+
+
+async def test_get_coin_quotes_timeout_cut_by_deadline_not_cached():
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        # A server answering in 0.5 seconds, behind the read timeout
+        read_timeout: float = request.extensions['timeout']['read']
+        await asyncio.sleep(min(read_timeout, 0.5))
+        if read_timeout < 0.5:  # noqa: PLR2004
+            raise httpx.ReadTimeout('Timed out', request=request)
+        return httpx.Response(
+            status_code=200, json={'bitcoin': {'usd': 100811}}
+        )
+
+    cache = Cache(Cache.MEMORY)
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>',
+        cache=cache,
+        cache_error_ttl=30,
+        transport=httpx.MockTransport(slow_handler),
+    )
+
+    with deadline_scope(0.2), pytest.raises(DeadlineExceededException):
+        await cgk_service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    assert not await cache.exists(
+        'error:CoinGeckoService;coins:btc;quotes_in:usd'
+    )
+
+    # A caller without deadline gets the quotes
+    result: CoinQuotes = await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd].quote == (
+        Decimal('100811')
+    )
+
+
+async def test_get_coin_quotes_error_after_deadline_not_cached():
+    cache = Cache(Cache.MEMORY)
+    cgk_service = CoinGeckoService(
+        api_key='<api-key>', cache=cache, cache_error_ttl=30
+    )
+
+    async def fetch_coin_quotes(coins, quotes_in):
+        await asyncio.sleep(0.05)
+        raise GetCoinQuotesException('Error retrieving coin quotes')
+
+    cgk_service._fetch_coin_quotes = fetch_coin_quotes
+
+    with deadline_scope(0.01), pytest.raises(GetCoinQuotesException):
+        await cgk_service.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+
+    assert not await cache.exists(
+        'error:CoinGeckoService;coins:btc;quotes_in:usd'
+    )
+
+
+def test_local_cache_requires_cache():
+    with pytest.raises(ValueError, match='local_cache requires a cache'):
+        CoinGeckoService(api_key='<api-key>', local_cache=LocalCache())
+
+
+@respx.mock
+async def test_get_coin_quotes_keep_raw_data_per_call():
+    EXAMPLE_RESPONSE = {'bitcoin': {'usd': 100811}}
+
+    respx.get('https://pro-api.coingecko.com/api/v3/simple/price').mock(
+        httpx.Response(status_code=200, json=EXAMPLE_RESPONSE)
+    )
+
+    cgk_service = CoinGeckoService(api_key='<api-key>', keep_raw_data=False)
+
+    result: CoinQuotes = await cgk_service.get_coin_quotes(
+        coins=[CoinSymbols.btc],
+        quotes_in=[QuoteSymbols.usd],
+        keep_raw_data=True,
+    )
+
+    assert result.raw_data == EXAMPLE_RESPONSE
+
+
 @respx.mock
 async def test_get_coin_quotes_with_cache_and_asyncio_concurrency(
     any_aiocache, monkeypatch
@@ -486,6 +1282,35 @@ async def test_get_coin_quotes_with_cache_and_asyncio_concurrency(
         }
 
 
+@respx.mock
+async def test_ping():
+    # Mock api request
+    route = respx.get('https://pro-api.coingecko.com/api/v3/ping').mock(
+        httpx.Response(
+            status_code=200,
+            json={'gecko_says': '(V3) To the Moon!'},
+        )
+    )
+
+    cgk_service = CoinGeckoService(api_key='<api-key>')
+
+    await cgk_service.ping()
+    assert route.call_count == 1
+
+
+@respx.mock
+async def test_ping_service_unavailable():
+    # Mock api request
+    respx.get('https://pro-api.coingecko.com/api/v3/ping').mock(
+        httpx.Response(status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+    )
+
+    cgk_service = CoinGeckoService(api_key='<api-key>')
+
+    with pytest.raises(GetCoinQuotesException, match='Service is unavailable'):
+        await cgk_service.ping()
+
+
 def test_repr():
     service = CoinGeckoService(api_key='<api-key>')
     assert repr(service) == ("CoinGeckoService(api_key='***')")
@@ -3,6 +3,7 @@ import json
 import time
 from decimal import Decimal
 from enum import Enum
+from http import HTTPStatus
 from types import CoroutineType
 from unittest.mock import AsyncMock, call
 
@@ -20,12 +21,24 @@ from anycoin.exeptions import (
 from anycoin.exeptions import (
     QuoteCoinNotSupportedCMC as QuoteCoinNotSupportedCMCException,
 )
+from anycoin.exeptions import (
+    RateLimitExceeded as RateLimitExceededException,
+)
+from anycoin.rate_limit import RateLimiter
 from anycoin.response_models import CoinQuotes
-from anycoin.services.coinmarketcap import CoinMarketCapService
+from anycoin.services.coinmarketcap import (
+    CoinMarketCapService,
+    _get_quotes_latest_credits,  # noqa: PLC2701
+)
 
 pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
 
 
+def _parse_decimals(data: dict) -> dict:
+    """``data`` as decoded from an API response (floats as Decimal)"""
+    return json.loads(json.dumps(data), parse_float=Decimal)
+
+
 async def test_get_coin_id_by_symbol_coin_not_supported():
     class FakeCoinSymbols(str, Enum):
         invalid_member: str = 'invalid_member'
@@ -137,7 +150,7 @@ async def test_send_request_path_not_startwith_bar():
         path='cryptocurrency/quotes/latest',  # path not start with /
         method='get',
     )
-    assert result == EXAMPLE_RESPONSE
+    assert result == _parse_decimals(EXAMPLE_RESPONSE)
 
 
 @respx.mock
@@ -204,7 +217,7 @@ async def test_send_request():
     result = await cmc_service._send_request(
         path='/cryptocurrency/quotes/latest', method='get'
     )
-    assert result == EXAMPLE_RESPONSE
+    assert result == _parse_decimals(EXAMPLE_RESPONSE)
 
 
 @respx.mock
@@ -300,7 +313,7 @@ async def test_send_request_json_decode_error():
     # Mock api request
     respx.get(
         'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
-    ).mock(side_effect=json.JSONDecodeError('abc', '123', 0))
+    ).mock(httpx.Response(status_code=200, content=b'<html>'))
 
     cmc_service = CoinMarketCapService(api_key='<api-key>')
 
@@ -313,6 +326,114 @@ async def test_send_request_json_decode_error():
         )
 
 
+@respx.mock
+async def test_send_request_rate_limit_error_code_tightens_rate_limiter():
+    EXAMPLE_RESPONSE = {
+        'status': {
+            'timestamp': '2025-01-19T10:00:27.010Z',
+            'error_code': 1008,
+            'error_message': (
+                "You've exceeded your API Key's HTTP request rate limit."
+            ),
+            'elapsed': 10,
+            'credit_count': 0,
+            'notice': '',
+        },
+    }
+
+    # Mock api request
+    route = respx.get(
+        'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
+    ).mock(
+        httpx.Response(
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    rate_limiter = RateLimiter(requests_per_minute=30, max_wait=0)
+    cmc_service = CoinMarketCapService(
+        api_key='<api-key>', rate_limiter=rate_limiter
+    )
+
+    with pytest.raises(
+        GetCoinQuotesException,
+        match=('Error retrieving coin quotes. API response:'),
+    ):
+        await cmc_service._send_request(
+            path='/cryptocurrency/quotes/latest', method='get'
+        )
+
+    assert rate_limiter.rate_ratio == 0.5  # noqa: PLR2004
+
+    # The next request is rejected locally
+    with pytest.raises(RateLimitExceededException):
+        await cmc_service._send_request(
+            path='/cryptocurrency/quotes/latest', method='get'
+        )
+    assert route.call_count == 1
+
+
+@respx.mock
+async def test_send_request_credit_count_is_recorded():
+    EXAMPLE_RESPONSE = {
+        'data': {},
+        'status': {
+            'timestamp': '2025-01-19T10:00:27.010Z',
+            'error_code': 0,
+            'error_message': '',
+            'elapsed': 10,
+            'credit_count': 10,
+            'notice': '',
+        },
+    }
+
+    # Mock api request
+    respx.get(
+        'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
+    ).mock(
+        httpx.Response(
+            status_code=200,
+            json=EXAMPLE_RESPONSE,
+        )
+    )
+
+    rate_limiter = RateLimiter(
+        requests_per_minute=30, credits_per_minute=10, max_wait=0
+    )
+    cmc_service = CoinMarketCapService(
+        api_key='<api-key>', rate_limiter=rate_limiter
+    )
+
+    await cmc_service._send_request(
+        path='/cryptocurrency/quotes/latest', method='get', credits=1
+    )
+
+    # All the credits of the minute were used
+    with pytest.raises(RateLimitExceededException):
+        await rate_limiter.acquire(credits=1)
+
+
+def test_get_quotes_latest_credits():
+    assert _get_quotes_latest_credits(coins_count=1, converts_count=1) == 1
+    assert _get_quotes_latest_credits(coins_count=100, converts_count=1) == 1
+    assert _get_quotes_latest_credits(coins_count=101, converts_count=1) == 2  # noqa: PLR2004
+    assert _get_quotes_latest_credits(coins_count=1, converts_count=3) == 3  # noqa: PLR2004
+
+
+def test_slice_raw_data():
+    raw_data: dict = {
+        'data': {'1': {'id': 1}, '1027': {'id': 1027}},
+        'status': {'error_code': 0, 'credit_count': 1},
+    }
+    cmc_service = CoinMarketCapService(api_key='<api-key>')
+
+    assert cmc_service._slice_raw_data(raw_data, [CoinSymbols.eth]) == {
+        'data': {'1027': {'id': 1027}},
+        'status': {'error_code': 0, 'credit_count': 1},
+    }
+
+
 async def test_get_coin_quotes_crypto_coin_not_supported():
     class FakeCoinSymbols(str, Enum):
         invalid_member: str = 'invalid_member'
@@ -413,7 +534,7 @@ async def test_get_coin_quotes():
     )
     assert isinstance(result, CoinQuotes)
     assert result.api_service == 'coinmarketcap'
-    assert result.raw_data == EXAMPLE_RESPONSE
+    assert result.raw_data == _parse_decimals(EXAMPLE_RESPONSE)
 
     assert result.model_dump()['coins'] == {
         CoinSymbols.btc: {
@@ -522,7 +643,7 @@ async def test_get_coin_quotes_multi_coins():
     )
     assert isinstance(result, CoinQuotes)
     assert result.api_service == 'coinmarketcap'
-    assert result.raw_data == EXAMPLE_RESPONSE
+    assert result.raw_data == _parse_decimals(EXAMPLE_RESPONSE)
 
     assert result.model_dump()['coins'] == {
         CoinSymbols.btc: {
@@ -613,7 +734,7 @@ async def test_get_coin_quotes_multi_quotes():
     )
     assert isinstance(result, CoinQuotes)
     assert result.api_service == 'coinmarketcap'
-    assert result.raw_data == EXAMPLE_RESPONSE
+    assert result.raw_data == _parse_decimals(EXAMPLE_RESPONSE)
 
     assert result.model_dump()['coins'] == {
         CoinSymbols.btc: {
@@ -752,7 +873,7 @@ async def test_get_coin_quotes_multi_coins_and_quotes():
     )
     assert isinstance(result, CoinQuotes)
     assert result.api_service == 'coinmarketcap'
-    assert result.raw_data == EXAMPLE_RESPONSE
+    assert result.raw_data == _parse_decimals(EXAMPLE_RESPONSE)
 
     assert result.model_dump()['coins'] == {
         CoinSymbols.btc: {
@@ -770,6 +891,64 @@ async def test_get_coin_quotes_multi_coins_and_quotes():
     }
 
 
+@respx.mock
+async def test_get_coin_quotes_in_chunks():
+    def example_response(coin_ids: list[str]) -> dict:
+        return {
+            'data': {
+                coin_id: {
+                    'id': int(coin_id),
+                    'quote': {'2781': {'price': int(coin_id) * 10}},
+                }
+                for coin_id in coin_ids
+            },
+            'status': {
+                'timestamp': '2025-01-19T10:00:27.010Z',
+                'error_code': 0,
+                'error_message': '',
+                'elapsed': 10,
+                'credit_count': 1,
+                'notice': '',
+            },
+        }
+
+    # Mock api request
+    def response(request):
+        return httpx.Response(
+            status_code=200,
+            json=example_response(request.url.params['id'].split(',')),
+        )
+
+    route = respx.get(
+        'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
+    )
+    route.side_effect = response
+
+    cmc_service = CoinMarketCapService(
+        api_key='<api-key>', max_coins_per_request=2
+    )
+
+    result: CoinQuotes = await cmc_service.get_coin_quotes(
+        coins=[CoinSymbols.btc, CoinSymbols.ltc, CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.usd],
+    )
+
+    assert route.call_count == 2  # noqa: PLR2004
+    assert list(result.raw_data['data']) == ['1', '2', '1027']
+    assert result.raw_data['status']['credit_count'] == 2  # noqa: PLR2004
+    assert result.model_dump()['coins'] == {
+        CoinSymbols.btc: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('10')}}
+        },
+        CoinSymbols.ltc: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('20')}}
+        },
+        CoinSymbols.eth: {
+            'quotes': {QuoteSymbols.usd: {'quote': Decimal('10270')}}
+        },
+    }
+
+
 async def test_get_coin_quotes_with_cache_and_value_in_cache(any_aiocache):
     EXAMPLE_RESPONSE = {
         'data': {
@@ -841,7 +1020,7 @@ async def test_get_coin_quotes_with_cache_and_value_in_cache(any_aiocache):
 
     assert isinstance(result, CoinQuotes)
     assert result.api_service == 'coinmarketcap'
-    assert result.raw_data == EXAMPLE_RESPONSE
+    assert result.raw_data == _parse_decimals(EXAMPLE_RESPONSE)
 
     assert result.model_dump()['coins'] == {
         CoinSymbols.btc: {
@@ -933,7 +1112,7 @@ async def test_get_coin_quotes_with_cache_and_value_not_in_cache(any_aiocache):
 
     assert isinstance(result, CoinQuotes)
     assert result.api_service == 'coinmarketcap'
-    assert result.raw_data == EXAMPLE_RESPONSE
+    assert result.raw_data == _parse_decimals(EXAMPLE_RESPONSE)
 
     assert result.model_dump()['coins'] == {
         CoinSymbols.btc: {
@@ -1037,7 +1216,7 @@ async def test_get_coin_quotes_with_cache_and_asyncio_concurrency(
     for result in results:
         assert isinstance(result, CoinQuotes)
         assert result.api_service == 'coinmarketcap'
-        assert result.raw_data == EXAMPLE_RESPONSE
+        assert result.raw_data == _parse_decimals(EXAMPLE_RESPONSE)
 
         assert result.model_dump()['coins'] == {
             CoinSymbols.btc: {
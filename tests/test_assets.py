@@ -0,0 +1,76 @@
+import pickle
+import threading
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.assets import AssetId, get_asset_ids, to_asset_id, to_symbol
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+
+
+def test_asset_id_interned():
+    trx = AssetId('trx')
+
+    assert trx is AssetId('TRX')
+    assert AssetId.from_id(int(trx)) is trx
+    assert pickle.loads(pickle.dumps(trx)) is trx
+    assert trx.symbol == trx.value == 'trx'
+    assert trx.name == 'Tron'
+    assert repr(trx) == "AssetId('trx')"
+
+
+def test_asset_id_new_symbol():
+    asset_id = AssetId('some-new-asset', 'Some New Asset')
+
+    assert asset_id is AssetId('some-new-asset')
+    assert asset_id.name == 'Some New Asset'
+    assert int(asset_id) >= len(CoinSymbols) + len(QuoteSymbols)
+    assert to_symbol(asset_id) is asset_id
+
+
+def test_asset_id_interned_across_threads():
+    results: list[AssetId] = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(AssetId('thread-asset'))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result is results[0] for result in results)
+
+
+def test_asset_id_aliases():
+    assert AssetId('not') == CoinSymbols.not_
+    assert CoinSymbols.not_ == AssetId('not')
+    assert AssetId('usd') == QuoteSymbols.usd
+    assert AssetId('usd') != CoinSymbols.usdt
+    assert AssetId('btc') == 'btc'
+    assert hash(AssetId('btc')) == hash(CoinSymbols.btc)
+
+    assert CoinSymbols.trx.asset_id is AssetId('trx')
+    assert to_asset_id(QuoteSymbols.eur) is AssetId('eur')
+    assert to_symbol(AssetId('eur')) is QuoteSymbols.eur
+    assert to_symbol(AssetId('eth')) is CoinSymbols.eth
+    assert get_asset_ids(['btc', 'eth']) == [CoinSymbols.btc, CoinSymbols.eth]
+
+
+def test_coin_quotes_indexable_by_asset_id():
+    result = CoinQuotes.model_validate({
+        'coins': {
+            AssetId('btc'): {'quotes': {AssetId('usd'): {'quote': 1}}},
+        },
+        'api_service': 'coingecko',
+    })
+
+    assert result == CoinQuotes(
+        coins={
+            CoinSymbols.btc: CoinRow(
+                quotes={QuoteSymbols.usd: QuoteRow(quote=1)}
+            )
+        },
+        api_service='coingecko',
+    )
+    assert result.coins[AssetId('btc')].quotes[AssetId('usd')].quote == 1
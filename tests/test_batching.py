@@ -0,0 +1,195 @@
+# ruff: noqa: PLC2701
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from anycoin import CoinSymbols, QuoteSymbols, _deadline
+from anycoin._batching import _QuoteBatcher, _slice_coin_quotes
+from anycoin.exeptions import CoinNotSupportedCGK
+from anycoin.exeptions import GetCoinQuotes as GetCoinQuotesException
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+
+pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
+
+
+def _make_coin_quotes(coins, quotes_in) -> CoinQuotes:
+    return CoinQuotes(
+        coins={
+            coin: CoinRow(
+                quotes={
+                    quote: QuoteRow(quote=Decimal(index))
+                    for quote in quotes_in
+                }
+            )
+            for index, coin in enumerate(coins, start=1)
+        },
+        api_service='coingecko',
+        raw_data={},
+    )
+
+
+class _FakeFetch:
+    def __init__(
+        self, unsupported: set | None = None, error: bool = False
+    ) -> None:
+        self.calls = []
+        self.deadlines = []
+        self.unsupported = unsupported or set()
+        self.error = error
+
+    async def __call__(self, coins, quotes_in) -> CoinQuotes:
+        self.calls.append((coins, quotes_in))
+        self.deadlines.append(_deadline.get_remaining())
+        if self.error:
+            raise GetCoinQuotesException('Error retrieving coin quotes')
+
+        if self.unsupported.intersection(coins):
+            raise GetCoinQuotesException('Coin not supported') from (
+                CoinNotSupportedCGK('Coin not supported')
+            )
+
+        return _make_coin_quotes(coins, quotes_in)
+
+
+async def test_batcher_merges_concurrent_requests():
+    fetch = _FakeFetch()
+    batcher = _QuoteBatcher(fetch=fetch, window=0.01, max_size=100)
+
+    btc, eth = await asyncio.gather(
+        batcher.get_coin_quotes([CoinSymbols.btc], [QuoteSymbols.usd]),
+        batcher.get_coin_quotes([CoinSymbols.eth], [QuoteSymbols.eur]),
+    )
+
+    assert fetch.calls == [
+        (
+            [CoinSymbols.btc, CoinSymbols.eth],
+            [QuoteSymbols.usd, QuoteSymbols.eur],
+        )
+    ]
+    assert list(btc.coins) == [CoinSymbols.btc]
+    assert list(btc.coins[CoinSymbols.btc].quotes) == [QuoteSymbols.usd]
+    assert list(eth.coins) == [CoinSymbols.eth]
+    assert list(eth.coins[CoinSymbols.eth].quotes) == [QuoteSymbols.eur]
+
+
+async def test_batcher_flushes_at_max_size():
+    fetch = _FakeFetch()
+    batcher = _QuoteBatcher(fetch=fetch, window=10, max_size=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            batcher.get_coin_quotes([CoinSymbols.btc], [QuoteSymbols.usd]),
+            batcher.get_coin_quotes([CoinSymbols.eth], [QuoteSymbols.usd]),
+        ),
+        timeout=1,
+    )
+
+    assert len(fetch.calls) == 1
+    assert len(results) == 2  # noqa: PLR2004
+
+
+async def test_batcher_failed_batch_falls_back_to_single_requests():
+    fetch = _FakeFetch(unsupported={CoinSymbols.pol})
+    batcher = _QuoteBatcher(fetch=fetch, window=0.01, max_size=100)
+
+    btc, pol = await asyncio.gather(
+        batcher.get_coin_quotes([CoinSymbols.btc], [QuoteSymbols.usd]),
+        batcher.get_coin_quotes([CoinSymbols.pol], [QuoteSymbols.usd]),
+        return_exceptions=True,
+    )
+
+    assert isinstance(btc, CoinQuotes)
+    assert isinstance(pol, GetCoinQuotesException)
+    assert len(fetch.calls) == 3  # noqa: PLR2004
+
+
+async def test_batcher_failed_batch_shares_the_error():
+    fetch = _FakeFetch(error=True)
+    batcher = _QuoteBatcher(fetch=fetch, window=0.01, max_size=100)
+
+    results = await asyncio.gather(
+        *(
+            batcher.get_coin_quotes([coin], [QuoteSymbols.usd])
+            for coin in (CoinSymbols.btc, CoinSymbols.eth, CoinSymbols.ltc)
+        ),
+        return_exceptions=True,
+    )
+
+    assert all(
+        isinstance(result, GetCoinQuotesException) for result in results
+    )
+    assert len(fetch.calls) == 1
+
+
+async def test_batcher_ignores_the_deadline_of_the_callers():
+    fetch = _FakeFetch()
+    batcher = _QuoteBatcher(fetch=fetch, window=0.01, max_size=100)
+
+    async def get_with_deadline():
+        with _deadline.deadline_scope(0.005):
+            return await batcher.get_coin_quotes(
+                [CoinSymbols.btc], [QuoteSymbols.usd]
+            )
+
+    async def get_without_deadline():
+        await asyncio.sleep(0.001)
+        return await batcher.get_coin_quotes(
+            [CoinSymbols.eth], [QuoteSymbols.usd]
+        )
+
+    btc, eth = await asyncio.gather(
+        get_with_deadline(), get_without_deadline()
+    )
+
+    assert len(fetch.calls) == 1
+    assert fetch.deadlines == [None]
+    assert list(btc.coins) == [CoinSymbols.btc]
+    assert list(eth.coins) == [CoinSymbols.eth]
+
+
+async def test_batcher_single_request_error():
+    fetch = _FakeFetch(unsupported={CoinSymbols.pol})
+    batcher = _QuoteBatcher(fetch=fetch, window=0.01, max_size=100)
+
+    with pytest.raises(GetCoinQuotesException):
+        await batcher.get_coin_quotes([CoinSymbols.pol], [QuoteSymbols.usd])
+
+    assert len(fetch.calls) == 1
+
+
+def test_slice_coin_quotes():
+    coin_quotes: CoinQuotes = _make_coin_quotes(
+        [CoinSymbols.btc, CoinSymbols.eth],
+        [QuoteSymbols.usd, QuoteSymbols.eur],
+    )
+
+    result: CoinQuotes = _slice_coin_quotes(
+        coin_quotes,
+        coins=[CoinSymbols.eth, CoinSymbols.ltc],
+        quotes_in=[QuoteSymbols.eur],
+    )
+
+    assert result.coins == {
+        CoinSymbols.eth: CoinRow(
+            quotes={QuoteSymbols.eur: QuoteRow(quote=Decimal('2'))}
+        )
+    }
+    assert result.api_service == 'coingecko'
+    assert result.raw_data is None
+
+
+def test_slice_coin_quotes_raw_data():
+    coin_quotes: CoinQuotes = _make_coin_quotes(
+        [CoinSymbols.btc, CoinSymbols.eth], [QuoteSymbols.usd]
+    )
+
+    result: CoinQuotes = _slice_coin_quotes(
+        coin_quotes,
+        coins=[CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.usd],
+        slice_raw_data=lambda raw_data, coins: {'coins': coins},
+    )
+
+    assert result.raw_data == {'coins': [CoinSymbols.eth]}
@@ -1,7 +1,37 @@
+# ruff: noqa: PLC2701
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+from aiocache.serializers import NullSerializer
+
 from anycoin import CoinSymbols, QuoteSymbols
 from anycoin.cache import (
-    _get_cache_key_for_get_coin_quotes_method_params,  # noqa: PLC2701
+    BinaryCodec,
+    Cache,
+    JSONCodec,
+    LocalCache,
+    _acquire_lease,
+    _check_cache_codec,
+    _dump_cached_error,
+    _fetch_with_lease,
+    _get_cache_key_for_error,
+    _get_cache_key_for_get_coin_quotes_method_params,
+    _get_cache_key_for_pair,
+    _get_or_set_coin_quotes_cache,
+    _get_or_set_coin_quotes_pairs_cache,
+    _get_single_flight_registry,
+    _load_cached_error,
+    _release_lease,
+    _unwrap_stale_entry,
+    _wrap_stale_entry,
+)
+from anycoin.exeptions import (
+    CoinNotSupportedCMC,
+    GetCoinQuotes,
 )
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
 
 
 def test_get_cache_key_for_get_coin_quotes_method_params_one_coin_and_one_quote():  # noqa: E501
@@ -38,3 +68,366 @@ def test_get_cache_key_for_get_coin_quotes_method_params_one_coin_and_multi_quot
         quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
     )
     assert result == 'coins:btc;quotes_in:usd,eur'
+
+
+def test_get_cache_key_for_get_coin_quotes_method_params_without_raw_data():
+    result = _get_cache_key_for_get_coin_quotes_method_params(
+        coins=[CoinSymbols.btc],
+        quotes_in=[QuoteSymbols.usd],
+        keep_raw_data=False,
+    )
+    assert result == 'coins:btc;quotes_in:usd;raw_data:no'
+
+
+def test_get_cache_key_for_pair():
+    result = _get_cache_key_for_pair(CoinSymbols.btc, QuoteSymbols.usd)
+    assert result == 'coin:btc;quote_in:usd'
+
+
+def test_dump_and_load_coin_quotes_keep_decimals():
+    value = CoinQuotes(
+        coins={
+            CoinSymbols.btc: CoinRow(
+                quotes={
+                    QuoteSymbols.usd: QuoteRow(
+                        quote=Decimal('0.000012345678901234567890')
+                    )
+                }
+            )
+        },
+        api_service='coingecko',
+        raw_data={'bitcoin': {'usd': Decimal('0.0000123456789')}},
+    )
+
+    result = JSONCodec().decode(JSONCodec().encode(value))
+
+    assert result == value
+    assert isinstance(result.raw_data['bitcoin']['usd'], Decimal)
+
+
+def test_load_coin_quotes_with_raw_data_dumped_by_pydantic():
+    result = JSONCodec().decode(
+        '{"coins": {"btc": {"quotes": {"usd": {"quote": "6602.60701122"}}}},'
+        '"api_service": "coingecko", "raw_data": {"bitcoin": {"usd": 6602.6}}}'
+    )
+
+    assert result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd].quote == (
+        Decimal('6602.60701122')
+    )
+    assert result.raw_data == {'bitcoin': {'usd': Decimal('6602.6')}}
+
+
+def test_json_codec_ignores_invalid_entries():
+    assert JSONCodec().decode('{"coins": {"xyz": {}}}') is None
+    assert JSONCodec().decode(b'\x00\x01') is None
+
+
+def _get_coin_quotes(raw_data: dict | None) -> CoinQuotes:
+    return CoinQuotes(
+        coins={
+            CoinSymbols.btc: CoinRow(
+                quotes={
+                    QuoteSymbols.usd: QuoteRow(quote=Decimal('100811.123')),
+                    QuoteSymbols.eur: QuoteRow(
+                        quote=Decimal('0.000012345678901234567890')
+                    ),
+                }
+            ),
+            CoinSymbols.eth: CoinRow(
+                quotes={QuoteSymbols.usd: QuoteRow(quote=Decimal('3300'))}
+            ),
+        },
+        api_service='coinmarketcap',
+        raw_data=raw_data,
+    )
+
+
+@pytest.mark.parametrize(
+    'raw_data',
+    [None, {'data': {'1': {'quote': {'2781': {'price': Decimal('1.5')}}}}}],
+)
+@pytest.mark.parametrize('compress_threshold', [None, 0])
+def test_binary_codec_roundtrip(raw_data, compress_threshold):
+    codec = BinaryCodec(compress_threshold=compress_threshold)
+    value: CoinQuotes = _get_coin_quotes(raw_data)
+
+    data: bytes = codec.encode(value)
+
+    assert data.startswith(b'AQ\x01')
+    assert codec.decode(data) == value
+
+
+def test_binary_codec_is_smaller_than_json():
+    value: CoinQuotes = _get_coin_quotes(None)
+
+    assert len(BinaryCodec().encode(value)) < len(JSONCodec().encode(value))
+
+
+def test_binary_codec_compresses_large_entries():
+    raw_data: dict = {'data': {str(i): {'price': i} for i in range(500)}}
+    value: CoinQuotes = _get_coin_quotes(raw_data)
+
+    compressed: bytes = BinaryCodec(compress_threshold=1024).encode(value)
+    uncompressed: bytes = BinaryCodec(compress_threshold=None).encode(value)
+
+    assert compressed[3] == 1  # Compressed flag
+    assert len(compressed) < len(uncompressed)
+    assert BinaryCodec().decode(compressed) == value
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        b'AQ\x02\x00',  # Other version
+        b'XX\x01\x00',
+        b'AQ\x01\x00\x00',  # Truncated
+        b'AQ\x01\x01not-zlib',
+        '{"coins": {}}',  # Written by JSONCodec
+    ],
+)
+def test_binary_codec_ignores_unreadable_entries(data):
+    assert BinaryCodec().decode(data) is None
+
+
+def test_check_cache_codec():
+    _check_cache_codec(Cache(Cache.MEMORY), JSONCodec())
+    _check_cache_codec(
+        Cache(Cache.MEMORY, serializer=NullSerializer(encoding=None)),
+        BinaryCodec(),
+    )
+
+    with pytest.raises(ValueError, match='requires a cache serializer'):
+        _check_cache_codec(Cache(Cache.MEMORY), BinaryCodec())
+
+
+def test_local_cache_get_and_set():
+    local_cache = LocalCache()
+    value: CoinQuotes = _get_coin_quotes(None)
+
+    assert local_cache.get('key') is None
+    local_cache.set('key', value)
+    assert local_cache.get('key') is value
+
+    local_cache.invalidate('key')
+    assert local_cache.get('key') is None
+
+
+def test_local_cache_expiration(monkeypatch):
+    now: list[float] = [1000.0]
+    monkeypatch.setattr('anycoin.cache.time.monotonic', lambda: now[0])
+
+    local_cache = LocalCache(ttl=2.0)
+    value: CoinQuotes = _get_coin_quotes(None)
+    local_cache.set('key', value)
+    local_cache.set('capped', value, ttl=1)  # Capped by the L2 TTL
+    local_cache.set('not-cached', value, ttl=0)
+
+    now[0] += 1.5
+    assert local_cache.get('key') is value
+    assert local_cache.get('capped') is None
+    assert local_cache.get('not-cached') is None
+
+    now[0] += 1.0
+    assert local_cache.get('key') is None
+    assert len(local_cache) == 0
+
+
+def test_local_cache_evicts_least_recently_used():
+    local_cache = LocalCache(max_size=2)
+    value: CoinQuotes = _get_coin_quotes(None)
+
+    local_cache.set('a', value)
+    local_cache.set('b', value)
+    local_cache.get('a')
+    local_cache.set('c', value)
+
+    assert len(local_cache) == 2  # noqa: PLR2004
+    assert local_cache.get('a') is value
+    assert local_cache.get('b') is None
+    assert local_cache.get('c') is value
+
+
+@pytest.mark.parametrize('data', ['{"coins": {}}', b'AQ\x01\x00;data'])
+def test_wrap_and_unwrap_stale_entry(data):
+    entry = _wrap_stale_entry(data, fresh_until=1737280827.01)
+
+    assert type(entry) is type(data)
+    assert _unwrap_stale_entry(entry) == (1737280827.01, data)
+
+
+@pytest.mark.parametrize('data', ['{"coins": {}}', b'AQ\x01\x00', 'swr:x;'])
+def test_unwrap_stale_entry_without_fresh_time(data):
+    fresh_until, _ = _unwrap_stale_entry(data)
+
+    assert fresh_until is None
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_single_flight_registry_per_cache_and_loop():
+    cache = Cache(Cache.MEMORY)
+    other_cache = Cache(Cache.MEMORY)
+
+    async def get_registry(cache: Cache):
+        return _get_single_flight_registry(cache)
+
+    registry = _get_single_flight_registry(cache)
+
+    assert _get_single_flight_registry(cache) is registry
+    assert _get_single_flight_registry(other_cache) is not registry
+    assert (
+        await asyncio.to_thread(asyncio.run, get_registry(cache))
+        is not registry
+    )
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_or_set_coin_quotes_cache_from_several_loops():
+    cache = Cache(Cache.MEMORY)
+    value: CoinQuotes = _get_coin_quotes(None)
+    fetching = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_fetch() -> CoinQuotes:
+        fetching.set()
+        await release.wait()
+        return value
+
+    async def fetch() -> CoinQuotes:
+        return value
+
+    task = asyncio.ensure_future(
+        _get_or_set_coin_quotes_cache(cache, 'key', slow_fetch)
+    )
+    await fetching.wait()
+
+    # A fetch in flight in this loop must not be awaited by another loop
+    result = await asyncio.to_thread(
+        asyncio.run, _get_or_set_coin_quotes_cache(cache, 'key', fetch)
+    )
+    assert result == value
+
+    release.set()
+    assert await task == value
+
+    registry = _get_single_flight_registry(cache)
+    assert not registry.futures
+    assert not registry.locks
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_get_or_set_coin_quotes_pairs_cache_leader_cancelled():
+    cache = Cache(Cache.MEMORY)
+    value: CoinQuotes = _get_coin_quotes(None)
+    calls: list[int] = []
+
+    async def fetch(coins, quotes_in) -> CoinQuotes:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await asyncio.sleep(10)  # The leader, cancelled by its timeout
+        return value
+
+    async def get_coin_quotes() -> CoinQuotes:
+        return await _get_or_set_coin_quotes_pairs_cache(
+            cache,
+            coins=[CoinSymbols.btc],
+            quotes_in=[QuoteSymbols.usd],
+            coro_func=fetch,
+        )
+
+    leader = asyncio.ensure_future(
+        asyncio.wait_for(get_coin_quotes(), timeout=0.05)
+    )
+    await asyncio.sleep(0.01)
+
+    # The waiter takes over the fetch instead of waiting forever
+    result = await asyncio.wait_for(get_coin_quotes(), timeout=3)
+
+    assert result.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd].quote == (
+        Decimal('100811.123')
+    )
+    assert len(calls) == 2  # noqa: PLR2004
+    with pytest.raises(asyncio.TimeoutError):
+        await leader
+    assert not _get_single_flight_registry(cache).futures
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_release_lease_of_another_holder():
+    cache = Cache(Cache.MEMORY)
+
+    assert await _acquire_lease(cache, 'key;lease', 'token', ttl=10)
+    assert not await _acquire_lease(cache, 'key;lease', 'other', ttl=10)
+
+    # A holder that outlived its lease keeps the lease of the next one
+    await _release_lease(cache, 'key;lease', 'other')
+    assert await cache.exists('key;lease')
+
+    await _release_lease(cache, 'key;lease', 'token')
+    assert not await cache.exists('key;lease')
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_fetch_with_lease_reads_value_set_by_previous_holder():
+    cache = Cache(Cache.MEMORY)
+    value: CoinQuotes = _get_coin_quotes(None)
+    calls: list[None] = []
+
+    async def get_value_cached() -> CoinQuotes:
+        return value  # Set right before the lease was released
+
+    async def fetch() -> CoinQuotes:
+        calls.append(None)
+        return value
+
+    result: CoinQuotes = await _fetch_with_lease(
+        cache,
+        lease_key='key;lease',
+        lease_ttl=10,
+        get_value_cached=get_value_cached,
+        coro_func=fetch,
+    )
+
+    assert result == value
+    assert not calls
+    assert not await cache.exists('key;lease')
+
+
+def test_get_cache_key_for_error():
+    result = _get_cache_key_for_error(
+        'CoinGeckoService', 'coins:btc;quotes_in:usd'
+    )
+    assert result == 'error:CoinGeckoService;coins:btc;quotes_in:usd'
+
+
+def test_dump_and_load_cached_error():
+    expt = GetCoinQuotes('Error retrieving coin quotes')
+    data = _dump_cached_error(expt)
+    assert data == 'GetCoinQuotes:Error retrieving coin quotes'
+
+    loaded = _load_cached_error(data)
+    assert type(loaded) is GetCoinQuotes
+    assert str(loaded) == 'Error retrieving coin quotes'
+    assert loaded.__cause__ is None
+
+
+def test_dump_and_load_cached_unsupported_error():
+    try:
+        try:
+            raise CoinNotSupportedCMC('Coin with id 1 not supported')
+        except CoinNotSupportedCMC as cause:
+            raise GetCoinQuotes(str(cause)) from cause
+    except GetCoinQuotes as expt:
+        data = _dump_cached_error(expt)
+
+    assert data == 'CoinNotSupportedCMC:Coin with id 1 not supported'
+
+    loaded = _load_cached_error(data.encode())
+    assert type(loaded) is GetCoinQuotes
+    assert str(loaded) == 'Coin with id 1 not supported'
+    assert isinstance(loaded.__cause__, CoinNotSupportedCMC)
+
+
+def test_load_cached_error_unknown_class():
+    loaded = _load_cached_error('SomeError:message: with colon')
+    assert type(loaded) is GetCoinQuotes
+    assert str(loaded) == 'message: with colon'
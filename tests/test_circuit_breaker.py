@@ -0,0 +1,79 @@
+from anycoin.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerPolicy,
+    CircuitState,
+)
+
+
+def test_circuit_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(CircuitBreakerPolicy(failure_threshold=3))
+
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.allow_request()
+
+    assert breaker.record_failure()
+    assert breaker.state is CircuitState.open
+    assert not breaker.allow_request()
+
+
+def test_circuit_breaker_success_resets_consecutive_failures():
+    breaker = CircuitBreaker(CircuitBreakerPolicy(failure_threshold=2))
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.closed
+
+
+def test_circuit_breaker_opens_on_failure_rate():
+    breaker = CircuitBreaker(
+        CircuitBreakerPolicy(
+            failure_threshold=100,
+            failure_rate_threshold=0.5,
+            min_calls=4,
+        )
+    )
+
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state is CircuitState.closed
+
+    assert breaker.record_failure()
+    assert breaker.state is CircuitState.open
+
+
+def test_circuit_breaker_failure_rate_window():
+    breaker = CircuitBreaker(
+        CircuitBreakerPolicy(
+            failure_threshold=100,
+            min_calls=2,
+            window=0,
+        )
+    )
+
+    # Calls outside the window are discarded
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.closed
+
+
+def test_circuit_breaker_half_open_and_close():
+    breaker = CircuitBreaker(CircuitBreakerPolicy(failure_threshold=1))
+
+    breaker.record_failure()
+    breaker.half_open()
+    assert breaker.state is CircuitState.half_open
+    assert not breaker.allow_request()
+
+    breaker.close()
+    assert breaker.state is CircuitState.closed
+    assert breaker.allow_request()
+
+
+def test_circuit_breaker_repr():
+    breaker = CircuitBreaker(CircuitBreakerPolicy())
+    assert repr(breaker) == 'CircuitBreaker(state=closed)'
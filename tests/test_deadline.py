@@ -0,0 +1,37 @@
+# ruff: noqa: PLC2701
+
+import time
+
+from anycoin._deadline import deadline_scope, get_remaining, is_expired
+
+
+def test_no_deadline():
+    assert get_remaining() is None
+    assert not is_expired()
+
+    with deadline_scope(None):
+        assert get_remaining() is None
+
+
+def test_deadline_scope():
+    with deadline_scope(10):
+        assert 9 < get_remaining() <= 10  # noqa: PLR2004
+        assert not is_expired()
+
+    assert get_remaining() is None
+
+
+def test_deadline_scope_expired():
+    with deadline_scope(0.01):
+        time.sleep(0.02)
+        assert get_remaining() == 0
+        assert is_expired()
+
+
+def test_deadline_scope_nested_never_extends():
+    with deadline_scope(1):
+        with deadline_scope(10):
+            assert get_remaining() <= 1
+
+        with deadline_scope(0.5):
+            assert get_remaining() <= 0.5  # noqa: PLR2004
@@ -0,0 +1,52 @@
+# ruff: noqa: PLC2701
+
+from decimal import Decimal
+
+import pytest
+
+from anycoin import _json
+
+
+@pytest.fixture(params=['msgspec', 'stdlib'])
+def json_backend(request, monkeypatch):
+    if request.param == 'msgspec':
+        pytest.importorskip('msgspec')
+    else:
+        monkeypatch.setattr(_json, 'msgspec', None)
+
+    return request.param
+
+
+def test_loads_decodes_floats_as_decimal(json_backend):
+    result = _json.loads(
+        b'{"usd": 0.000012345678901234567890, "count": 2, "name": "btc"}'
+    )
+
+    assert result == {
+        'usd': Decimal('0.000012345678901234567890'),
+        'count': 2,
+        'name': 'btc',
+    }
+    assert isinstance(result['usd'], Decimal)
+    assert isinstance(result['count'], int)
+
+
+def test_loads_invalid_json(json_backend):
+    with pytest.raises(ValueError):  # noqa: PT011
+        _json.loads(b'<html>Bad Gateway</html>')
+
+
+def test_dumps_writes_decimal_as_number(json_backend):
+    result = _json.dumps({'usd': Decimal('6602.60701122'), 'count': 2})
+
+    assert result == '{"usd":6602.60701122,"count":2}'
+    assert _json.loads(result) == {'usd': Decimal('6602.60701122'), 'count': 2}
+
+
+def test_dumps_keeps_every_digit_with_msgspec(json_backend):
+    if json_backend != 'msgspec':
+        pytest.skip('The stdlib backend writes Decimal through float')
+
+    value = Decimal('0.000012345678901234567890')
+
+    assert _json.loads(_json.dumps({'usd': value})) == {'usd': value}
@@ -0,0 +1,61 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _get_imported_modules(code: str) -> set[str]:
+    process = subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            f'import sys; {code}; print(*sys.modules)',
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(process.stdout.split())
+
+
+def test_import_anycoin_defers_heavy_dependencies():
+    modules: set[str] = _get_imported_modules('import anycoin')
+
+    for name in (
+        'aiocache',
+        'anyio',
+        'httpx',
+        'pydantic',
+        'anycoin.cache',
+        'anycoin.response_models',
+        'anycoin.services.base',
+    ):
+        assert name not in modules
+
+
+def test_import_services_defers_aiocache():
+    modules: set[str] = _get_imported_modules(
+        'import anycoin.services.coinmarketcap'
+    )
+
+    assert 'httpx' in modules
+    assert 'aiocache' not in modules
+
+
+@pytest.mark.parametrize(
+    ('code', 'module'),
+    [
+        ('from anycoin import AsyncAnyCoin', 'anycoin._interfaces.async_'),
+        ('from anycoin import AnyCoin', 'anycoin._interfaces.sync'),
+        ('from anycoin.cache import Cache', 'aiocache'),
+    ],
+)
+def test_lazy_attributes_import_on_first_use(code, module):
+    assert module in _get_imported_modules(code)
+
+
+def test_unknown_attribute():
+    import anycoin  # noqa: PLC0415
+
+    with pytest.raises(AttributeError, match='has no attribute'):
+        _ = anycoin.Unknown
@@ -4,11 +4,17 @@ import pytest
 
 from anycoin import CoinSymbols, QuoteSymbols
 from anycoin._mapped_ids import (
+    CGK_QUOTE_IDS,
+    CMC_COIN_IDS,
+    IdMap,
     get_cgk_coin_ids,
     get_cgk_quotes_ids,
     get_cmc_coins_ids,
     get_cmc_quotes_ids,
 )
+from anycoin.exeptions import CoinNotSupportedCMC, QuoteCoinNotSupportedCGK
+from anycoin.services.coingecko import CoinGeckoService
+from anycoin.services.coinmarketcap import CoinMarketCapService
 
 pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
 
@@ -47,3 +53,50 @@ async def test_mapped_cgk_quote_ids_keys_is_valid():
         # The QuoteSymbols enumeration will-
         # raise an error if the key is not a valid member
         QuoteSymbols(coin_symbol)
+
+
+def test_id_map_forward_and_reverse():
+    assert CMC_COIN_IDS.id_for(CoinSymbols.btc) == '1'
+    assert CMC_COIN_IDS.symbol_for('1') is CoinSymbols.btc
+    assert CMC_COIN_IDS.ids_for([CoinSymbols.btc, CoinSymbols.ltc]) == [
+        '1',
+        '2',
+    ]
+    assert CMC_COIN_IDS.symbols_for(['1', '2']) == [
+        CoinSymbols.btc,
+        CoinSymbols.ltc,
+    ]
+    assert CGK_QUOTE_IDS.symbols_by_id['usd'] is QuoteSymbols.usd
+
+
+def test_id_map_not_supported():
+    with pytest.raises(
+        CoinNotSupportedCMC, match='Coin with id 0 not supported'
+    ):
+        CMC_COIN_IDS.symbols_for(['1', '0'])
+
+    id_map = IdMap(
+        {'usd': 'usd'}, QuoteSymbols, 'Quote', QuoteCoinNotSupportedCGK
+    )
+    with pytest.raises(
+        QuoteCoinNotSupportedCGK, match=f'Quote {QuoteSymbols.eur} not'
+    ):
+        id_map.id_for(QuoteSymbols.eur)
+
+
+def test_id_map_update():
+    id_map = IdMap(
+        {'usd': 'usd'}, QuoteSymbols, 'Quote', QuoteCoinNotSupportedCGK
+    )
+    ids_by_symbol: dict[str, str] = id_map.ids_by_symbol
+
+    id_map.update({'eur': 'eur'})
+
+    assert id_map.ids_by_symbol == {'eur': 'eur'}
+    assert id_map.symbols_by_id == {'eur': QuoteSymbols.eur}
+    assert ids_by_symbol == {'usd': 'usd'}  # The old map is not mutated
+
+
+def test_services_id_maps():
+    assert CoinMarketCapService.coin_ids is CMC_COIN_IDS
+    assert CoinGeckoService.quote_ids is CGK_QUOTE_IDS
@@ -0,0 +1,327 @@
+import asyncio
+import time
+from decimal import Decimal
+
+import pytest
+
+from anycoin import CoinSymbols, QuoteSymbols
+from anycoin.exeptions import GetCoinQuotes as GetCoinQuotesException
+from anycoin.polling import QuotePoller
+from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
+
+pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
+
+
+class _FakeFetch:
+    def __init__(self) -> None:
+        self.calls: list[tuple[list, list]] = []
+        self.price = Decimal('1')
+        self.fail = False
+        self.error: Exception | None = None
+
+    async def __call__(self, coins, quotes_in) -> CoinQuotes:
+        self.calls.append((coins, quotes_in))
+        await asyncio.sleep(0)  # Yield, like a request
+        if self.fail:
+            raise GetCoinQuotesException('failed')
+        if self.error is not None:
+            raise self.error
+
+        return CoinQuotes(
+            coins={
+                coin: CoinRow(
+                    quotes={
+                        quote: QuoteRow(quote=self.price)
+                        for quote in quotes_in
+                    }
+                )
+                for coin in coins
+            },
+            api_service='coingecko',
+        )
+
+
+def test_watchlist_reference_count():
+    poller = QuotePoller(_FakeFetch())
+
+    poller.watch(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+    poller.watch(
+        coins=[CoinSymbols.btc, CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+    )
+    poller.unwatch(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+
+    assert poller.watchlist == (
+        [CoinSymbols.btc, CoinSymbols.eth],
+        [QuoteSymbols.usd],
+    )
+
+    poller.unwatch(
+        coins=[CoinSymbols.btc, CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+    )
+    assert poller.watchlist == ([], [])
+
+
+async def test_refresh_one_call_for_the_watchlist():
+    fetch = _FakeFetch()
+    poller = QuotePoller(fetch)
+    poller.watch(
+        coins=[CoinSymbols.btc, CoinSymbols.eth],
+        quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur],
+    )
+
+    await poller.refresh()
+
+    assert len(fetch.calls) == 1
+    result: CoinQuotes | None = poller.get_coin_quotes(
+        coins=[CoinSymbols.eth], quotes_in=[QuoteSymbols.eur]
+    )
+    assert result == CoinQuotes(
+        coins={
+            CoinSymbols.eth: CoinRow(
+                quotes={QuoteSymbols.eur: QuoteRow(quote=Decimal('1'))}
+            )
+        },
+        api_service='coingecko',
+    )
+
+
+async def test_get_coin_quotes_not_covered_or_too_old(monkeypatch):
+    now: list[float] = [time.monotonic()]
+    monkeypatch.setattr('anycoin.polling.time.monotonic', lambda: now[0])
+
+    poller = QuotePoller(_FakeFetch(), interval=5)
+    assert (
+        poller.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        is None
+    )
+
+    poller.watch(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+    await poller.refresh()
+
+    assert poller.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    assert (
+        poller.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.eur]
+        )
+        is None
+    )
+    assert (
+        poller.get_coin_quotes(
+            coins=[CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+        )
+        is None
+    )
+
+    now[0] += 11  # Default max_age: twice the interval
+    assert (
+        poller.get_coin_quotes(
+            coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+        )
+        is None
+    )
+
+
+async def test_refresh_failure_keeps_snapshot():
+    fetch = _FakeFetch()
+    poller = QuotePoller(fetch)
+    poller.watch(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+    await poller.refresh()
+
+    fetch.fail = True
+    await poller.refresh()
+
+    assert poller.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+
+async def test_adaptive_interval():
+    fetch = _FakeFetch()
+    poller = QuotePoller(fetch, interval=1, max_interval=4)
+    poller.watch(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+
+    await poller.refresh()
+    assert poller._current_interval == 1
+
+    # Unchanged quotes slow the polling down, up to max_interval
+    for expected_interval in (2, 4, 4):
+        await poller.refresh()
+        assert poller._current_interval == expected_interval
+
+    fetch.price = Decimal('2')
+    await poller.refresh()
+    assert poller._current_interval == 1
+
+
+async def test_start_polls_in_background():
+    fetch = _FakeFetch()
+    poller = QuotePoller(fetch, interval=0.01)
+    poller.watch(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+
+    await poller.start()
+    assert len(fetch.calls) == 1
+
+    await asyncio.sleep(0.05)
+    await poller.aclose()
+
+    assert len(fetch.calls) > 1
+
+
+async def test_concurrent_starts_share_the_poller():
+    fetch = _FakeFetch()
+    poller = QuotePoller(fetch, interval=60)
+    poller.watch(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+
+    await asyncio.gather(poller.start(), poller.start())
+    task = poller._task
+    await poller.aclose()
+
+    assert len(fetch.calls) == 1
+    assert task.cancelled()
+
+
+async def test_unexpected_error_does_not_stop_polling(caplog):
+    fetch = _FakeFetch()
+    fetch.error = KeyError('price')
+    poller = QuotePoller(fetch, interval=0.01)
+    poller.watch(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+
+    await poller.start()
+    fetch.error = None
+    await asyncio.sleep(0.05)
+    await poller.aclose()
+
+    assert 'Error refreshing the quotes' in caplog.text
+    assert poller.get_coin_quotes(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+
+async def test_watch_new_symbol_wakes_up_poller():
+    fetch = _FakeFetch()
+    poller = QuotePoller(fetch, interval=60)
+    poller.watch(coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd])
+    await poller.start()
+
+    poller.watch(coins=[CoinSymbols.eth], quotes_in=[QuoteSymbols.usd])
+    await asyncio.sleep(0.01)
+    await poller.aclose()
+
+    assert fetch.calls[-1] == (
+        [CoinSymbols.btc, CoinSymbols.eth],
+        [QuoteSymbols.usd],
+    )
+
+
+async def test_subscription_first_update_has_every_pair():
+    poller = QuotePoller(_FakeFetch(), interval=60)
+
+    async with poller.subscribe(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd, QuoteSymbols.eur]
+    ) as updates:
+        update: CoinQuotes = await anext(updates)
+
+    await poller.aclose()
+
+    assert update.coins == {
+        CoinSymbols.btc: CoinRow(
+            quotes={
+                QuoteSymbols.usd: QuoteRow(quote=Decimal('1')),
+                QuoteSymbols.eur: QuoteRow(quote=Decimal('1')),
+            }
+        )
+    }
+    assert poller.watchlist == ([], [])
+
+
+async def test_subscription_only_changes_beyond_threshold():
+    fetch = _FakeFetch()
+    poller = QuotePoller(fetch, interval=60)
+    fetch.price = Decimal('100')
+
+    updates = poller.subscribe(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd], threshold=0.01
+    )
+    await anext(updates)
+
+    fetch.price = Decimal('100.5')  # Below the threshold
+    await poller.refresh()
+    fetch.price = Decimal('102')
+    await poller.refresh()
+
+    update: CoinQuotes = await anext(updates)
+    assert update.coins[CoinSymbols.btc].quotes[QuoteSymbols.usd].quote == (
+        Decimal('102')
+    )
+
+    # Moved away and back, nothing to send
+    fetch.price = Decimal('105')
+    await poller.refresh()
+    fetch.price = Decimal('102')
+    await poller.refresh()
+    assert not updates._pending
+
+    await updates.aclose()
+    await poller.aclose()
+
+
+async def test_subscription_slow_consumer_gets_merged_updates():
+    fetch = _FakeFetch()
+    poller = QuotePoller(fetch, interval=60)
+
+    updates = poller.subscribe(
+        coins=[CoinSymbols.btc, CoinSymbols.eth], quotes_in=[QuoteSymbols.usd]
+    )
+    await anext(updates)
+
+    for price in range(2, 100):
+        fetch.price = Decimal(price)
+        await poller.refresh()
+
+    # A single pending update with the latest quotes
+    update: CoinQuotes = await anext(updates)
+    assert update.coins[CoinSymbols.eth].quotes[QuoteSymbols.usd].quote == (
+        Decimal('99')
+    )
+    assert not updates._pending
+
+    await updates.aclose()
+    await poller.aclose()
+
+
+async def test_subscription_ends_when_poller_is_closed():
+    poller = QuotePoller(_FakeFetch(), interval=60)
+    updates = poller.subscribe(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+    await anext(updates)
+
+    next_update = asyncio.ensure_future(anext(updates))
+    await asyncio.sleep(0)
+    await poller.aclose()
+
+    with pytest.raises(StopAsyncIteration):
+        await next_update
+
+
+async def test_subscription_ends_when_poller_is_closed_before_refresh():
+    async def slow_fetch(coins, quotes_in) -> CoinQuotes:
+        await asyncio.sleep(5)
+        raise AssertionError('Not refreshed')
+
+    poller = QuotePoller(slow_fetch, interval=60)
+    updates = poller.subscribe(
+        coins=[CoinSymbols.btc], quotes_in=[QuoteSymbols.usd]
+    )
+
+    # Waiting for the first refresh
+    next_update = asyncio.ensure_future(anext(updates))
+    await asyncio.sleep(0.01)
+    await poller.aclose()
+
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(next_update, timeout=1)
@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import pytest
+
+from anycoin.exeptions import RateLimitExceeded as RateLimitExceededException
+from anycoin.rate_limit import RateLimiter
+
+pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
+
+
+async def test_acquire_within_burst():
+    limiter = RateLimiter(requests_per_minute=60, burst=3, max_wait=0)
+
+    for _ in range(3):
+        await limiter.acquire()
+
+    with pytest.raises(
+        RateLimitExceededException, match='Rate limit exceeded'
+    ):
+        await limiter.acquire()
+
+
+async def test_acquire_waits_for_tokens():
+    limiter = RateLimiter(requests_per_minute=600, burst=1)
+
+    await limiter.acquire()
+
+    start_time: float = time.perf_counter()
+    await limiter.acquire()
+    end_time: float = time.perf_counter()
+
+    # 600 requests per minute -> one token every 0.1 seconds
+    assert (end_time - start_time) >= 0.09  # noqa: PLR2004
+
+
+async def test_acquire_credits():
+    limiter = RateLimiter(
+        requests_per_minute=60, credits_per_minute=5, max_wait=0
+    )
+
+    await limiter.acquire(credits=5)
+
+    with pytest.raises(RateLimitExceededException):
+        await limiter.acquire(credits=1)
+
+
+async def test_acquire_concurrency_is_queued():
+    limiter = RateLimiter(requests_per_minute=1200, burst=1)
+
+    start_time: float = time.perf_counter()
+    await asyncio.gather(*(limiter.acquire() for _ in range(4)))
+    end_time: float = time.perf_counter()
+
+    # 1200 requests per minute -> one token every 0.05 seconds
+    assert (end_time - start_time) >= 0.14  # noqa: PLR2004
+
+
+async def test_record_credits():
+    limiter = RateLimiter(
+        requests_per_minute=60, credits_per_minute=5, max_wait=0
+    )
+
+    await limiter.acquire(credits=1)
+    limiter.record_credits(reserved=1, used=5)
+
+    with pytest.raises(RateLimitExceededException):
+        await limiter.acquire(credits=1)
+
+
+async def test_record_rate_limited():
+    limiter = RateLimiter(requests_per_minute=60, max_wait=0)
+
+    limiter.record_rate_limited(retry_after=30)
+
+    assert limiter.rate_ratio == 0.5  # noqa: PLR2004
+    with pytest.raises(RateLimitExceededException):
+        await limiter.acquire()
+
+
+async def test_record_rate_limited_beyond_max_blocked_wait():
+    limiter = RateLimiter(requests_per_minute=60, max_blocked_wait=60)
+
+    # e.g. a daily limit, the request is not held until it resets
+    limiter.record_rate_limited(retry_after=3600)
+
+    with pytest.raises(
+        RateLimitExceededException, match='Rate limit exceeded'
+    ):
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+
+
+def test_record_success_restores_rate():
+    limiter = RateLimiter(requests_per_minute=60, recovery_step=0.25)
+
+    limiter.record_rate_limited(retry_after=0)
+    limiter.record_success()
+    assert limiter.rate_ratio == 0.75  # noqa: PLR2004
+
+    limiter.record_success()
+    limiter.record_success()
+    assert limiter.rate_ratio == 1.0
+
+
+def test_rate_ratio_lower_bound():
+    limiter = RateLimiter(requests_per_minute=60, min_rate_ratio=0.2)
+
+    for _ in range(10):
+        limiter.record_rate_limited(retry_after=0)
+
+    assert limiter.rate_ratio == 0.2  # noqa: PLR2004
+
+
+def test_repr():
+    limiter = RateLimiter(requests_per_minute=30, credits_per_minute=40)
+    assert repr(limiter) == (
+        'RateLimiter(requests_per_minute=30, credits_per_minute=40)'
+    )
@@ -0,0 +1,179 @@
+import json
+
+import httpx
+import pytest
+import respx
+
+from anycoin.exeptions import GetCoinQuotes as GetCoinQuotesException
+from anycoin.registry import Asset, AssetRegistry
+from anycoin.services.base import BaseAPIService
+from anycoin.services.coingecko import CoinGeckoService
+from anycoin.services.coinmarketcap import CoinMarketCapService
+
+pytestmark: pytest.MarkDecorator = pytest.mark.asyncio(loop_scope='session')
+
+CMC_MAP_RESPONSE = {
+    'data': [
+        {'id': 1, 'symbol': 'BTC', 'name': 'Bitcoin', 'slug': 'bitcoin',
+         'rank': 1},
+        {'id': 825, 'symbol': 'USDT', 'name': 'Tether USDt',
+         'slug': 'tether', 'rank': 3},
+        {'id': 9999, 'symbol': 'USDT', 'name': 'Fake Tether',
+         'slug': 'fake-tether', 'rank': 5000},
+        {'id': 11841, 'symbol': 'ARB', 'name': 'Arbitrum',
+         'slug': 'arbitrum', 'rank': 40},
+        {'id': 7000, 'symbol': 'ZET', 'name': 'Zeta', 'slug': 'zeta',
+         'rank': 900},
+    ],
+    'status': {'error_code': 0, 'credit_count': 1},
+}  # fmt: skip
+
+CGK_LIST_RESPONSE = [
+    {'id': 'bitcoin', 'symbol': 'btc', 'name': 'Bitcoin'},
+    {'id': 'tether', 'symbol': 'usdt', 'name': 'Tether'},
+    {'id': 'bridged-tether', 'symbol': 'usdt', 'name': 'Bridged Tether'},
+    {'id': 'arbitrum', 'symbol': 'arb', 'name': 'Arbitrum'},
+    {'id': 'arb-token', 'symbol': 'arb', 'name': 'ARB Token'},
+    {'id': 'foo-one', 'symbol': 'foo', 'name': 'Foo One'},
+    {'id': 'foo-two', 'symbol': 'foo', 'name': 'Foo Two'},
+    {'id': 'only-cgk', 'symbol': 'ocg', 'name': 'Only CoinGecko'},
+    {'id': 'zetachain', 'symbol': 'zet', 'name': 'ZetaChain'},
+]
+
+
+def _mock_map_endpoints() -> tuple[respx.Route, respx.Route]:
+    cmc_route = respx.get(
+        'https://pro-api.coinmarketcap.com/v1/cryptocurrency/map'
+    ).mock(httpx.Response(status_code=200, json=CMC_MAP_RESPONSE))
+    cgk_route = respx.get(
+        'https://pro-api.coingecko.com/api/v3/coins/list'
+    ).mock(httpx.Response(status_code=200, json=CGK_LIST_RESPONSE))
+    return cmc_route, cgk_route
+
+
+@respx.mock
+async def test_refresh_reconciles_providers(tmp_path):
+    _mock_map_endpoints()
+    registry = AssetRegistry(tmp_path / 'assets.json')
+
+    await registry.refresh(
+        cmc_service=CoinMarketCapService(api_key='<api-key>'),
+        cgk_service=CoinGeckoService(api_key='<api-key>'),
+    )
+
+    assert registry.get('BTC') == Asset('btc', 'Bitcoin', '1', 'bitcoin')
+    # Best ranked CoinMarketCap coin, CoinGecko coin with the same slug
+    assert registry.get('usdt') == Asset(
+        'usdt', 'Tether USDt', '825', 'tether'
+    )
+    assert registry.get('arb') == Asset('arb', 'Arbitrum', '11841', 'arbitrum')
+    assert registry.get('ocg') == Asset(
+        'ocg', 'Only CoinGecko', None, 'only-cgk'
+    )
+    # Ambiguous symbol, not mapped rather than mapped to the wrong coin
+    assert 'foo' not in registry
+    # Single CoinGecko coin with another slug and name, another coin
+    assert registry.get('zet') == Asset('zet', 'Zeta', '7000', None)
+
+    assert registry.get_by_cmc_id('825').symbol == 'usdt'
+    assert registry.get_by_cgk_id('arbitrum').symbol == 'arb'
+    assert registry.get_by_cgk_id('bridged-tether') is None
+    assert not registry.is_stale
+
+
+@respx.mock
+async def test_registry_loads_persisted_maps(tmp_path):
+    cmc_route, cgk_route = _mock_map_endpoints()
+    path = tmp_path / 'cache' / 'assets.json'
+
+    await AssetRegistry(path).refresh(
+        cgk_service=CoinGeckoService(api_key='<api-key>')
+    )
+    assert cgk_route.call_count == 1
+    assert cmc_route.call_count == 0
+
+    # A new registry starts from the file, without any request
+    registry = AssetRegistry(path)
+    assert registry.get('btc') == Asset('btc', 'Bitcoin', None, 'bitcoin')
+    assert not await registry.refresh_if_stale(
+        cgk_service=CoinGeckoService(api_key='<api-key>')
+    )
+    assert cgk_route.call_count == 1
+
+
+@respx.mock
+async def test_refresh_if_stale(tmp_path, monkeypatch):
+    _, cgk_route = _mock_map_endpoints()
+    registry = AssetRegistry(tmp_path / 'assets.json', refresh_interval=60)
+    cgk_service = CoinGeckoService(api_key='<api-key>')
+
+    assert registry.is_stale
+    assert await registry.refresh_if_stale(cgk_service=cgk_service)
+    assert not await registry.refresh_if_stale(cgk_service=cgk_service)
+
+    updated_at: float = registry.updated_at
+    monkeypatch.setattr('anycoin.registry.time.time', lambda: updated_at + 61)
+    assert await registry.refresh_if_stale(cgk_service=cgk_service)
+    assert cgk_route.call_count == 2  # noqa: PLR2004
+
+
+@respx.mock
+async def test_refresh_failure_keeps_maps(tmp_path):
+    _mock_map_endpoints()
+    path = tmp_path / 'assets.json'
+    registry = AssetRegistry(path)
+    cgk_service = CoinGeckoService(api_key='<api-key>')
+    await registry.refresh(cgk_service=cgk_service)
+
+    respx.get('https://pro-api.coingecko.com/api/v3/coins/list').mock(
+        httpx.Response(status_code=400, json={'error': 'error'})
+    )
+    with pytest.raises(GetCoinQuotesException):
+        await registry.refresh(cgk_service=cgk_service)
+
+    assert registry.get('btc')
+    assert AssetRegistry(path).get('btc')
+
+
+@respx.mock
+async def test_refresh_ignores_services_without_map(tmp_path):
+    _mock_map_endpoints()
+    registry = AssetRegistry(tmp_path / 'assets.json')
+
+    await registry.refresh(
+        cmc_service=BaseAPIService(),  # e.g. a custom service
+        cgk_service=CoinGeckoService(api_key='<api-key>'),
+    )
+
+    assert registry.get('btc') == Asset(
+        symbol='btc', name='Bitcoin', cgk_id='bitcoin'
+    )
+
+
+def test_registry_ignores_unreadable_file(tmp_path):
+    path = tmp_path / 'assets.json'
+    path.write_text('{not json', encoding='utf-8')
+    assert len(AssetRegistry(path)) == 0
+
+    path.write_text(json.dumps({'version': 0}), encoding='utf-8')
+    assert AssetRegistry(path).updated_at is None
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        [],
+        {'version': 1},
+        {'version': 1, 'updated_at': 1.0, 'assets': [['btc']]},
+        {'version': 1, 'updated_at': 1.0, 'assets': 1},
+        {'version': 1, 'updated_at': None, 'assets': []},
+    ],
+)
+def test_registry_ignores_malformed_file(tmp_path, data):
+    path = tmp_path / 'assets.json'
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+    registry = AssetRegistry(path)
+
+    assert len(registry) == 0
+    assert registry.updated_at is None
@@ -1,6 +1,22 @@
+# ruff: noqa: PLC2701
+
 from decimal import Decimal
 
+import pytest
+
 from anycoin import CoinSymbols, QuoteSymbols
+from anycoin._mapped_ids import (
+    get_cgk_coin_ids,
+    get_cgk_quotes_ids,
+    get_cmc_coins_ids,
+    get_cmc_quotes_ids,
+)
+from anycoin.exeptions import (
+    CoinNotSupportedCMC as CoinNotSupportedCMCException,
+)
+from anycoin.exeptions import (
+    QuoteCoinNotSupportedCGK as QuoteCoinNotSupportedCGKException,
+)
 from anycoin.response_models import CoinQuotes, CoinRow, QuoteRow
 
 
@@ -64,3 +80,77 @@ def test_coin_quotes_model_validate_json():
     model_json: str = model.model_dump_json()
 
     assert CoinQuotes.model_validate_json(model_json) == model
+
+
+async def _get_cmc_raw_data() -> dict:
+    quotes_ids: dict[str, str] = await get_cmc_quotes_ids()
+    return {
+        'data': {
+            coin_id: {
+                'id': int(coin_id),
+                'quote': {
+                    quote_id: {'price': 1234.56789012345}
+                    for quote_id in quotes_ids.values()
+                },
+            }
+            for coin_id in (await get_cmc_coins_ids()).values()
+        },
+        'status': {'error_code': 0, 'credit_count': 1},
+    }
+
+
+async def _get_cgk_raw_data() -> dict:
+    quotes_ids: dict[str, str] = await get_cgk_quotes_ids()
+    return {
+        coin_id: {quote_id: 0.000123456789 for quote_id in quotes_ids.values()}
+        for coin_id in (await get_cgk_coin_ids()).values()
+    }
+
+
+@pytest.mark.asyncio(loop_scope='session')
+@pytest.mark.parametrize(
+    ('get_raw_data', 'from_raw_data'),
+    [
+        (_get_cmc_raw_data, CoinQuotes.from_cmc_raw_data),
+        (_get_cgk_raw_data, CoinQuotes.from_cgk_raw_data),
+    ],
+)
+async def test_coin_quotes_from_raw_data_equals_validated(
+    get_raw_data, from_raw_data
+):
+    raw_data: dict = await get_raw_data()
+
+    model: CoinQuotes = await from_raw_data(raw_data)
+    validated: CoinQuotes = CoinQuotes.model_validate(model.model_dump())
+
+    assert model == validated
+    assert model.model_dump_json() == validated.model_dump_json()
+    assert len(model.coins) == len(CoinSymbols)
+    for coin_row in model.coins.values():
+        assert isinstance(coin_row, CoinRow)
+        for quote_row in coin_row.quotes.values():
+            assert isinstance(quote_row.quote, Decimal)
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_coin_quotes_from_cmc_raw_data_coin_not_supported():
+    raw_data: dict = {
+        'data': {'-1': {'quote': {'2781': {'price': 1}}}},
+        'status': {'error_code': 0},
+    }
+
+    with pytest.raises(
+        CoinNotSupportedCMCException, match='Coin with id -1 not supported'
+    ):
+        await CoinQuotes.from_cmc_raw_data(raw_data)
+
+
+@pytest.mark.asyncio(loop_scope='session')
+async def test_coin_quotes_from_cgk_raw_data_quote_not_supported():
+    raw_data: dict = {'bitcoin': {'xyz': 1}}
+
+    with pytest.raises(
+        QuoteCoinNotSupportedCGKException,
+        match='Quote with id xyz not supported',
+    ):
+        await CoinQuotes.from_cgk_raw_data(raw_data)
@@ -0,0 +1,67 @@
+# ruff: noqa: PLC2701
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http import HTTPStatus
+
+from anycoin.retry import RetryPolicy, _parse_retry_after, _RetryBudget
+
+
+def test_retry_policy_is_retryable():
+    policy = RetryPolicy()
+
+    assert policy.is_retryable(None)
+    assert policy.is_retryable(HTTPStatus.TOO_MANY_REQUESTS)
+    assert policy.is_retryable(HTTPStatus.SERVICE_UNAVAILABLE)
+    assert not policy.is_retryable(HTTPStatus.BAD_REQUEST)
+    assert not RetryPolicy(retry_on_request_error=False).is_retryable(None)
+
+
+def test_retry_policy_get_delay_exponential_backoff():
+    policy = RetryPolicy(
+        max_attempts=5, base_delay=0.1, max_delay=0.3, jitter=False
+    )
+
+    assert policy.get_delay(0) == 0.1  # noqa: PLR2004
+    assert policy.get_delay(1) == 0.2  # noqa: PLR2004
+    assert policy.get_delay(2) == 0.3  # noqa: PLR2004
+    assert policy.get_delay(4) is None
+
+
+def test_retry_policy_get_delay_with_jitter():
+    policy = RetryPolicy(base_delay=0.1)
+
+    for _ in range(100):
+        assert 0 <= policy.get_delay(0) <= 0.1  # noqa: PLR2004
+
+
+def test_retry_policy_get_delay_with_retry_after():
+    policy = RetryPolicy(max_retry_after=5)
+
+    assert policy.get_delay(0, retry_after=3) == 3  # noqa: PLR2004
+    assert policy.get_delay(0, retry_after=10) is None
+
+
+def test_retry_budget():
+    budget = _RetryBudget(ratio=0.5, max_tokens=2)
+
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_parse_retry_after():
+    assert _parse_retry_after(None) is None
+    assert _parse_retry_after('') is None
+    assert _parse_retry_after('invalid') is None
+    assert _parse_retry_after('2') == 2  # noqa: PLR2004
+    assert _parse_retry_after('-1') == 0
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    retry_after = _parse_retry_after(format_datetime(retry_at, usegmt=True))
+    assert 0 < retry_after <= 30  # noqa: PLR2004
@@ -0,0 +1,75 @@
+from anycoin.routing import LatencyRouter, ServiceStats
+from anycoin.services.base import BaseAPIService
+
+
+def test_order_by_latency():
+    fast, slow = BaseAPIService(), BaseAPIService()
+    router = LatencyRouter()
+
+    router.record_success(slow, latency=0.5)
+    router.record_success(fast, latency=0.1)
+
+    assert router.order([slow, fast]) == [fast, slow]
+
+
+def test_order_services_without_samples_first():
+    measured, new = BaseAPIService(), BaseAPIService()
+    router = LatencyRouter()
+
+    router.record_success(measured, latency=0.1)
+
+    assert router.order([measured, new]) == [new, measured]
+
+
+def test_order_ties_keep_configured_order():
+    first, second = BaseAPIService(), BaseAPIService()
+    router = LatencyRouter()
+
+    assert router.order([first, second]) == [first, second]
+    assert router.order([second, first]) == [second, first]
+
+
+def test_order_penalizes_errors():
+    fast_failing, slow = BaseAPIService(), BaseAPIService()
+    router = LatencyRouter(alpha=0.5)
+
+    router.record_success(fast_failing, latency=0.1)
+    router.record_failure(fast_failing)
+    router.record_success(slow, latency=1.0)
+
+    assert router.order([fast_failing, slow]) == [slow, fast_failing]
+
+
+def test_stats_ewma():
+    service = BaseAPIService()
+    router = LatencyRouter(alpha=0.5)
+
+    router.record_success(service, latency=1.0)
+    router.record_success(service, latency=0.5)
+    router.record_failure(service)
+
+    assert router.stats() == {
+        service: ServiceStats(latency=0.75, error_rate=0.5, calls=3)
+    }
+
+
+def test_pick_shadow_service():
+    primary, fallback = BaseAPIService(), BaseAPIService()
+
+    assert (
+        LatencyRouter(shadow_rate=1).pick_shadow_service([
+            primary,
+            fallback,
+        ])
+        is fallback
+    )
+    assert (
+        LatencyRouter(shadow_rate=0).pick_shadow_service([primary, fallback])
+        is None
+    )
+    assert LatencyRouter(shadow_rate=1).pick_shadow_service([primary]) is None
+
+
+def test_repr():
+    router = LatencyRouter(alpha=0.3, shadow_rate=0.05)
+    assert repr(router) == 'LatencyRouter(alpha=0.3, shadow_rate=0.05)'